@@ -0,0 +1,51 @@
+import numpy as np
+
+# group-by for bar and pie charts, raw transaction-style tables have the same
+# label on many rows. labels are hashed once into group codes (first
+# appearance order, like the rows), after that every aggregate is a single
+# vectorized pass over the column: bincount for sum/count/mean, a stable sort
+# by group plus reduceat for min/max.
+
+AGGREGATES = ("sum", "mean", "count", "min", "max")
+
+class Groups:
+    __slots__ = ("codes", "keys", "_order", "_starts")
+
+    def __init__(self, labels):
+        values = labels.tolist() if isinstance(labels, np.ndarray) else list(labels)
+        index = {k: i for i, k in enumerate(dict.fromkeys(values))}
+        self.codes = np.fromiter(map(index.__getitem__, values), dtype=np.int64, count=len(values))
+        self.keys = list(index)
+        self._order = None # rows sorted by group, only min/max need it
+        self._starts = None
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _sorted(self):
+        if self._order is None:
+            self._order = np.argsort(self.codes, kind="stable")
+            self._starts = np.searchsorted(self.codes[self._order], np.arange(len(self.keys)))
+        return self._order, self._starts
+
+    def aggregate(self, values, valid, how: str) -> np.ndarray:
+        """One value per group (float64), NaN for a group without valid cells."""
+        if how not in AGGREGATES:
+            raise ValueError(f"unknown aggregate '{how}'")
+        n = len(self.keys)
+        ok = np.ones(len(self.codes), dtype=bool) if valid is None else np.asarray(valid, dtype=bool)
+        counts = np.bincount(self.codes, weights=ok, minlength=n)
+        if how == "count":
+            return counts
+        values = np.asarray(values, dtype=np.float64)
+        if how in ("sum", "mean"):
+            sums = np.bincount(self.codes, weights=np.where(ok, values, 0.0), minlength=n)
+            if how == "sum": # an empty group has no sum either, not 0
+                return np.where(counts > 0, sums, np.nan)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return np.where(counts > 0, sums / counts, np.nan)
+        order, starts = self._sorted()
+        fill, reduce = (np.inf, np.minimum) if how == "min" else (-np.inf, np.maximum)
+        out = reduce.reduceat(np.where(ok, values, fill)[order], starts) if n else np.empty(0)
+        out[counts == 0] = np.nan
+        return out
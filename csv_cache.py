@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+import data_model
+
+# binary sidecar cache for imported csvs. every entry is a folder with a small
+# json header plus one raw .npy per column, so a re-import memory-maps the
+# columns instead of sniffing and parsing the text again. labels are nul
+# separated utf-8 like the workspace labels block, a fixed-width string array
+# would pad every row to the longest label.
+#
+# entries are keyed on path + size + mtime and hold the content hash, so a file
+# that did not change is never hashed again (known_digest). the oldest entries
+# (by last use) go once the folder is over MAX_BYTES.
+CACHE_DIR = ".graftui_cache"
+MAX_BYTES = 512 * 1024 * 1024
+HEADER = "header.json"
+FORMAT = 3
+
+def file_digest(path: str, block: int = 1 << 20) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(block), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _entry_dir(path: str) -> str:
+    st = os.stat(path)
+    ident = f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}"
+    return os.path.join(CACHE_DIR, hashlib.blake2b(ident.encode(), digest_size=16).hexdigest())
+
+def known_digest(path: str):
+    """Content hash of a cached file whose size and mtime still match, None otherwise."""
+    try:
+        with open(os.path.join(_entry_dir(path), HEADER), "r", encoding="utf-8") as f:
+            head = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return head.get("digest") if head.get("format") == FORMAT else None
+
+def quick_digest(path: str) -> str:
+    """known_digest, hashing the whole file only when the cache has not seen it."""
+    return known_digest(path) or file_digest(path)
+
+def load(path: str, digest: str):
+    """(ColumnarTable, transposed) from the cache, None on a miss or a broken entry."""
+    entry = _entry_dir(path)
+    try:
+        with open(os.path.join(entry, HEADER), "r", encoding="utf-8") as f:
+            head = json.load(f)
+        if head.get("format") != FORMAT or head.get("digest") != digest:
+            return None
+        # copy-on-write maps, editing a cell never touches the cache file
+        with open(os.path.join(entry, "labels.bin"), "rb") as f:
+            text = f.read().decode("utf-8")
+        labels = np.array(text.split("\0") if head["rows"] else [], dtype=object)
+        if len(labels) != head["rows"]:
+            return None
+        cols, valid = [], []
+        for i in range(len(head["names"]) - 1):
+            cols.append(np.load(os.path.join(entry, f"c{i}.npy"), mmap_mode="c"))
+            valid.append(np.load(os.path.join(entry, f"v{i}.npy"), mmap_mode="c"))
+        head["used"] = time.time()
+        _write_header(entry, head)
+    except (OSError, ValueError, KeyError, json.JSONDecodeError):
+        return None
+    table = data_model.ColumnarTable(head["names"], labels, cols, valid,
+                                     head["kinds"], head["categories"])
+    return table, head["transposed"]
+
+def _write_header(entry: str, head: dict):
+    tmp = os.path.join(entry, HEADER + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(head, f)
+    os.replace(tmp, os.path.join(entry, HEADER))
+
+def save(path: str, digest: str, table, transposed: bool) -> bool:
+    """Writes table as a cache entry, the folder only shows up once it is complete."""
+    entry = _entry_dir(path)
+    tmp = entry + ".tmp"
+    try:
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        with open(os.path.join(tmp, "labels.bin"), "wb") as f:
+            f.write("\0".join(map(str, table.labels.tolist())).encode("utf-8"))
+        for i, (col, ok) in enumerate(zip(table.columns, table.valid)):
+            np.save(os.path.join(tmp, f"c{i}.npy"), np.ascontiguousarray(col))
+            np.save(os.path.join(tmp, f"v{i}.npy"), np.ascontiguousarray(ok))
+        st = os.stat(path)
+        _write_header(tmp, {
+            "format": FORMAT, "path": os.path.abspath(path), "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns, "digest": digest, "transposed": bool(transposed),
+            "names": list(table.names), "rows": len(table), "used": time.time(),
+            "kinds": list(table.kinds), "categories": list(table.categories),
+        })
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp, entry)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+        return False
+    evict()
+    return True
+
+def _dir_size(entry: str) -> int:
+    return sum(e.stat().st_size for e in os.scandir(entry) if e.is_file())
+
+def evict(max_bytes: int = None):
+    """Drops least recently used entries until the cache fits in max_bytes."""
+    max_bytes = MAX_BYTES if max_bytes is None else max_bytes
+    if not os.path.isdir(CACHE_DIR):
+        return
+    entries = []
+    for e in os.scandir(CACHE_DIR):
+        if not e.is_dir() or e.name.endswith(".tmp"):
+            continue
+        try:
+            with open(os.path.join(e.path, HEADER), "r", encoding="utf-8") as f:
+                used = json.load(f).get("used", 0)
+        except (OSError, ValueError):
+            used = 0 # broken entry, first to go
+        entries.append((used, _dir_size(e.path), e.path))
+    total = sum(size for _, size, _ in entries)
+    for used, size, entry in sorted(entries):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= size
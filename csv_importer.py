@@ -0,0 +1,167 @@
+import concurrent.futures
+import csv
+import glob
+import itertools
+import os
+import threading
+
+import csv_parser
+import data_model
+
+# streaming csv import. the file is read in chunks of rows inside a worker and
+# appended column by column, the whole file never exists as a list of rows.
+CHUNK_ROWS = 20_000
+SNIFF_BYTES = 1024
+MAX_WORKERS = min(4, os.cpu_count() or 1) # files parsed at once by read_many, more threads than cores only take turns
+
+class ImportCancelled(Exception):
+    """Raised between chunks when should_stop() says so."""
+
+def sniff_dialect(sample: str):
+    """Same rules as the old importer: sniff, fall back to excel, only , ; tab."""
+    try:
+        dialect = csv.Sniffer().sniff(sample)
+    except (csv.Error, Exception):
+        dialect = csv.excel
+    if dialect.delimiter not in [',', ';', '\t']:
+        dialect.delimiter = ','
+    return dialect
+
+def looks_transposed(first_row: list) -> bool:
+    """
+    Numbers in the header line mean series are in rows, not columns. Checks the
+    cells after the first with the typed parser, so 1.234,5 in a ; file counts.
+    """
+    cells = [c for c in first_row[1:] if c.strip()]
+    if not cells:
+        return False
+    numbers = sum(csv_parser.is_number(c) for c in cells)
+    return numbers * 2 > len(cells)
+
+class ColumnStore:
+    """String columns filled chunk by chunk. Row 0 is the header line of the file."""
+
+    def __init__(self, delimiter: str = ","):
+        self.columns = []
+        self.rows = 0
+        self.delimiter = delimiter
+
+    def __len__(self):
+        return self.rows
+
+    @property
+    def width(self) -> int:
+        return len(self.columns)
+
+    def first_row(self) -> list:
+        return [c[0] for c in self.columns] if self.rows else []
+
+    def append_rows(self, chunk: list):
+        if not chunk:
+            return
+        widths = set(map(len, chunk))
+        while len(self.columns) < max(widths): # a longer row showed up, pad the new column
+            self.columns.append([""] * self.rows)
+        if widths == {len(self.columns)}:
+            for col, values in zip(self.columns, zip(*chunk)):
+                col.extend(values)
+        else: # ragged rows, short ones get empty cells
+            for j, col in enumerate(self.columns):
+                col.extend(r[j] if j < len(r) else "" for r in chunk)
+        self.rows += len(chunk)
+
+    def string_columns(self, transpose: bool = False):
+        """
+        (headers, columns) for the data model, columns still as strings.
+        Transposed: every file row becomes a column, the first cell of the row
+        is its name, the rows of the new table are numbered.
+        """
+        if not self.rows:
+            return ["Label"], []
+        if not transpose:
+            return self.first_row(), [c[1:] for c in self.columns]
+        headers = ["Index"] + self.columns[0]
+        rows = list(zip(*self.columns[1:])) # one tuple per file row
+        index = [str(i + 1) for i in range(self.width - 1)]
+        return headers, [index] + [list(r) for r in rows]
+
+    def to_table(self, transpose: bool = False):
+        headers, cols = self.string_columns(transpose)
+        return data_model.ColumnarTable.from_string_columns(headers, cols)
+
+def stream_csv(path: str, progress=None, should_stop=None,
+               chunk_rows: int = CHUNK_ROWS) -> ColumnStore:
+    """
+    Reads path into a ColumnStore, chunk_rows rows at a time.
+    progress(fraction) is called after every chunk, should_stop() is checked
+    between chunks and raises ImportCancelled.
+    """
+    size = max(1, os.path.getsize(path))
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        dialect = sniff_dialect(f.read(SNIFF_BYTES))
+        f.seek(0)
+        store = ColumnStore(dialect.delimiter)
+        reader = csv.reader(f, dialect)
+        while True:
+            chunk = list(itertools.islice(reader, chunk_rows))
+            if not chunk:
+                break
+            store.append_rows(chunk)
+            if progress: # position of the byte buffer, close enough for a bar
+                progress(min(1.0, f.buffer.tell() / size))
+            if should_stop and should_stop():
+                raise ImportCancelled()
+    if progress:
+        progress(1.0)
+    return store
+
+def expand_paths(text: str) -> list:
+    """
+    "a.csv; b.csv", a glob like "exports/*.csv" or a folder (its .csv files)
+    -> the existing files, globs and folders sorted.
+    """
+    paths = []
+    for part in str(text).split(";"):
+        part = part.strip()
+        if not part:
+            continue
+        if glob.has_magic(part):
+            paths.extend(p for p in sorted(glob.glob(part)) if os.path.isfile(p))
+        elif os.path.isdir(part):
+            paths.extend(sorted(glob.glob(os.path.join(glob.escape(part), "*.csv"))))
+        elif os.path.isfile(part):
+            paths.append(part)
+    return list(dict.fromkeys(paths))
+
+def _parse(path: str, progress=None, should_stop=None):
+    return stream_csv(path, progress, should_stop).to_table()
+
+def read_many(paths: list, progress=None, should_stop=None, read=None,
+              max_workers: int = MAX_WORKERS) -> list:
+    """
+    One ColumnarTable per path (same order), parsed on a small thread pool.
+    read(path, progress, should_stop) does a single file, a plain parse by
+    default. progress gets the overall fraction, weighted by file size.
+    """
+    read = read or _parse
+    sizes = [max(1, os.path.getsize(p)) for p in paths]
+    done = [0.0] * len(paths)
+    lock = threading.Lock()
+
+    def file_progress(i):
+        def report(frac):
+            with lock:
+                done[i] = frac * sizes[i]
+                total = sum(done) / sum(sizes)
+            if progress:
+                progress(total)
+        return report
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(paths)))) as pool:
+        futures = [pool.submit(read, p, file_progress(i), should_stop) for i, p in enumerate(paths)]
+        try:
+            return [f.result() for f in futures]
+        except BaseException:
+            for f in futures: # a failed or cancelled file stops the ones still queued
+                f.cancel()
+            raise
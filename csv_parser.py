@@ -0,0 +1,189 @@
+import os
+import re
+import time
+
+import numpy as np
+
+# typed column conversion for imports. the csv module splits the text (fast, C),
+# this module decides what every column is from a sample and converts the whole
+# column at once with numpy:
+#   int / float  thousands separators and decimal commas (common in ; files)
+#   date         ISO dates and timestamps, stored as float seconds since epoch
+#   category     anything else, stored as int codes + the list of categories
+# missing cells (empty, NA, null, -) come back as NaN with valid=False.
+# a column is numeric (or date) when most of its sample parses, the odd bad
+# cell is then invalid instead of turning the whole column into categories.
+
+SAMPLE_SIZE = 1000
+MIN_SHARE = 0.7 # of the non-missing sample cells that have to parse for a numeric/date kind
+MISSING = ["", "na", "n/a", "nan", "null", "none", "-", "?"]
+
+_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?Z?$")
+
+def _number_regex(decimal: str, thousands: str):
+    d, t = re.escape(decimal), re.escape(thousands)
+    # a thousands group never starts with 0, so "0,125" can only be a decimal comma
+    return re.compile(rf"^[+-]?(?:[1-9]\d{{0,2}}(?:[{t}\s]\d{{3}})+|\d+)?(?:{d}\d*)?(?:[eE][+-]?\d+)?$")
+
+# (decimal, thousands)
+_FORMATS = {
+    ".": (".", ","),
+    ",": (",", "."),
+}
+_REGEX = {dec: _number_regex(*fmt) for dec, fmt in _FORMATS.items()}
+
+_MISSING_CASES = sorted({v for m in MISSING for v in (m, m.upper(), m.title())})
+
+def _present(values: np.ndarray) -> np.ndarray:
+    # a few vectorized compares beat lowercasing every cell
+    present = np.ones(values.size, dtype=bool)
+    for marker in _MISSING_CASES:
+        present &= values != marker
+    return present
+
+def infer_kind(sample) -> tuple:
+    """
+    (kind, decimal, thousands) for a column from a sample of its cells.
+    kind is "int", "float", "date" or "category".
+    """
+    cells = [c for c in (str(v).strip() for v in sample) if c.lower() not in MISSING]
+    if not cells:
+        return "float", ".", ","
+    need = MIN_SHARE * len(cells)
+    # decimal comma only when some cell can't be read the other way ("0,5",
+    # "1.234,5"), "1,250" alone is a thousands separator. the file's delimiter doesn't decide
+    comma = any(_REGEX[","].match(c) and not _REGEX["."].match(c) for c in cells)
+    decimal, thousands = _FORMATS["," if comma else "."]
+    regex = _REGEX[decimal]
+    numbers = [c for c in cells if regex.match(c) and any(ch.isdigit() for ch in c)]
+    if len(numbers) >= need:
+        is_int = not any(decimal in c or "e" in c.lower() for c in numbers)
+        return ("int" if is_int else "float"), decimal, thousands
+    if sum(1 for c in cells if _DATE.match(c)) >= need:
+        return "date", ".", ","
+    return "category", ".", ","
+
+def is_number(cell: str) -> bool:
+    return infer_kind([cell])[0] in ("int", "float") and str(cell).strip() != ""
+
+def _fallback(values: np.ndarray, present: np.ndarray, parse=float) -> tuple:
+    """Cell by cell, only when the vectorized cast hit a bad cell."""
+    out = np.full(values.size, np.nan)
+    for i, cell in enumerate(values.tolist()):
+        if present[i]:
+            try:
+                out[i] = parse(cell)
+            except ValueError:
+                pass
+    return out, np.isfinite(out)
+
+def _epoch_seconds(cell: str) -> float:
+    stamp = np.datetime64(cell, "s")
+    if np.isnat(stamp):
+        raise ValueError(cell)
+    return float(stamp.astype(np.int64))
+
+def convert(values, kind: str, decimal: str = ".", thousands: str = ",") -> tuple:
+    """
+    Whole column -> (array, valid, categories). Numbers and dates come back as
+    float64 (int64 for clean int columns) with NaN where valid is False.
+    """
+    raw = np.char.strip(np.asarray(values if len(values) else [], dtype=str))
+    if raw.size == 0:
+        return np.empty(0), np.empty(0, dtype=bool), None
+    present = _present(raw)
+
+    if kind == "category":
+        categories, inverse = np.unique(raw[present], return_inverse=True) # missing is no category
+        codes = np.zeros(raw.size, dtype=np.int64)
+        codes[present] = inverse
+        return codes, present, categories.tolist()
+
+    if kind == "date":
+        text = np.where(present, np.char.rstrip(np.char.replace(raw, " ", "T"), "Z"), "NaT")
+        try:
+            stamps = text.astype("datetime64[s]")
+        except ValueError: # a bad cell, only that one ends up invalid
+            return _fallback(text, present, _epoch_seconds) + (None,)
+        ok = ~np.isnat(stamps)
+        out = stamps.astype(np.int64).astype(np.float64)
+        out[~ok] = np.nan
+        return out, ok, None
+
+    text = np.where(present, raw, "0")
+    seps = [sep for sep in {thousands, " ", "\u00a0"} - {decimal} if np.char.find(text, sep).max() >= 0]
+    if seps:
+        # separators only between groups of three ("1,234,567"), "1,2,3" is no number.
+        # only the cells that have one go through the regex
+        grouped = np.zeros(text.size, dtype=bool)
+        for sep in seps:
+            grouped |= np.char.find(text, sep) >= 0
+        rows = np.flatnonzero(grouped)
+        regex = _REGEX[decimal]
+        bad = rows[[not regex.match(c) for c in text[rows].tolist()]]
+        if bad.size:
+            present = present.copy()
+            present[bad] = False
+            text[bad] = "0"
+        for sep in seps:
+            text = np.char.replace(text, sep, "")
+    if decimal != ".":
+        text = np.char.replace(text, decimal, ".")
+    if kind == "int" and present.all():
+        try:
+            return text.astype(np.int64), present, None
+        except (ValueError, OverflowError):
+            pass
+    try:
+        out = text.astype(np.float64)
+    except ValueError:
+        out, ok = _fallback(text, present)
+        return out, ok, None
+    out[~present] = np.nan
+    ok = present & np.isfinite(out)
+    out[~ok] = np.nan
+    return out, ok, None
+
+def parse_column(values) -> tuple:
+    """infer_kind on a sample + convert. Returns (array, valid, kind, categories)."""
+    kind, decimal, thousands = infer_kind(values[:SAMPLE_SIZE])
+    out, ok, categories = convert(values, kind, decimal, thousands)
+    if kind == "int" and out.dtype.kind == "f":
+        kind = "float" # missing cells in an int column, NaN needs floats
+    return out, ok, kind, categories
+
+# throughput check, python csv_parser.py [file.csv] [rows]
+def make_reference_file(path: str, rows: int = 500_000, seed: int = 0):
+    """Mixed-type reference csv: label, int, float, thousands, date, category, gaps."""
+    rng = np.random.default_rng(seed)
+    days = np.datetime64("2020-01-01") + rng.integers(0, 2000, rows).astype("timedelta64[D]")
+    price = rng.normal(1000, 300, rows)
+    cats = np.array(["north", "south", "east", "west"])[rng.integers(0, 4, rows)]
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("Label,Count,Value,Amount,Date,Region\n")
+        for i in range(rows):
+            value = "" if i % 97 == 0 else f"{rng.random():.5f}"
+            f.write(f"r{i},{i % 1000},{value},\"{price[i]:,.2f}\",{days[i]},{cats[i]}\n")
+
+def benchmark(path: str, repeat: int = 3) -> dict:
+    """Best-of-n import of path (read + split + typed conversion), in MB/s."""
+    import csv_importer # lazy, csv_importer imports this module through data_model
+    size = os.path.getsize(path)
+    best = float("inf")
+    table = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        table = csv_importer.stream_csv(path).to_table()
+        best = min(best, time.perf_counter() - start)
+    return {"bytes": size, "seconds": best, "mb_s": size / 1e6 / best,
+            "rows": len(table), "kinds": dict(zip(table.names[1:], table.kinds))}
+
+if __name__ == "__main__":
+    import sys
+    target = sys.argv[1] if len(sys.argv) > 1 else "reference.csv"
+    if not os.path.exists(target):
+        make_reference_file(target, int(sys.argv[2]) if len(sys.argv) > 2 else 500_000)
+    result = benchmark(target)
+    print(f"{target}: {result['bytes'] / 1e6:.1f} MB, {result['rows']} rows, "
+          f"{result['seconds']:.2f} s, {result['mb_s']:.1f} MB/s")
+    print(result["kinds"])
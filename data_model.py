@@ -0,0 +1,226 @@
+import datetime
+import itertools
+
+import numpy as np
+
+import csv_parser
+import expressions
+
+# typed columnar storage for the data view. first column is the label column
+# (kept as strings), every other column is a series parsed once by csv_parser
+# (int, float, date as epoch seconds, category as codes) with a validity mask
+# for missing or unparseable cells.
+# invalid cells hold 0, the old renderer treated them as 0.0 too, so plots can
+# use the arrays as they are and stats can mask them out.
+# expression columns (see expressions.py) are ordinary float columns plus the
+# formula, recomputed only when a column they read has a new version.
+
+_uids = itertools.count(1)
+NUMERIC_KINDS = ("int", "float") # dates and category codes are not values to plot or stat
+
+def parse_column(values) -> tuple:
+    """Strings (or numbers) -> (array, valid, kind, categories). Whole column at once."""
+    out, valid, kind, categories = csv_parser.parse_column(values)
+    if out.dtype.kind == "f" and not valid.all():
+        out[~valid] = 0.0
+    return out, valid, kind, categories
+
+def _cell_text(value, ok: bool, kind: str = "float", categories=None) -> str:
+    if not ok:
+        return ""
+    if kind == "category":
+        return str(categories[int(value)])
+    if kind == "date":
+        stamp = datetime.datetime.fromtimestamp(float(value), datetime.timezone.utc)
+        return stamp.strftime("%Y-%m-%d" if value % 86400 == 0 else "%Y-%m-%d %H:%M:%S")
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return f"{float(value):.1f}"
+    return str(value)
+
+class ColumnarTable:
+    def __init__(self, names: list, labels, columns: list, valid: list = None,
+                 kinds: list = None, categories: list = None, formulas: dict = None):
+        self.names = [str(n) for n in names] # header, names[0] is the label column
+        self.labels = np.asarray(labels, dtype=object)
+        self.columns = [np.asarray(c) for c in columns]
+        if valid is None:
+            valid = [np.ones(len(c), dtype=bool) for c in self.columns]
+        self.valid = [np.asarray(v, dtype=bool) for v in valid]
+        if kinds is None:
+            kinds = ["int" if c.dtype.kind == "i" else "float" for c in self.columns]
+        self.kinds = list(kinds)
+        self.categories = list(categories) if categories else [None] * len(self.columns)
+        self.versions = [0] * len(self.columns) # bumped on every edit, for caches
+        self.label_version = 0
+        self.formulas = dict(formulas or {}) # series index -> expression
+        self._formula_inputs = {} # series index -> dependency versions it was computed from
+        self.uid = next(_uids) # with a column index and version, identifies the data
+        for j, expr in list(self.formulas.items()): # saved by a version that took it, keep the values
+            try:
+                expressions.compile_expression(expr, tuple(self.names[1:j + 1]))
+            except expressions.ExpressionError:
+                del self.formulas[j]
+        self.refresh_formulas()
+
+    # construction
+    @classmethod
+    def from_rows(cls, names: list, rows) -> "ColumnarTable":
+        """Row lists (as the editor or a csv has them) -> parsed columns."""
+        rows = list(rows)
+        width = max([len(names)] + [len(r) for r in rows])
+        names = list(names) + [f"Series {i}" for i in range(len(names), width)]
+        cols = [[r[j] if j < len(r) else "" for r in rows] for j in range(width)]
+        return cls.from_string_columns(names, cols)
+
+    @classmethod
+    def from_string_columns(cls, names: list, cols: list) -> "ColumnarTable":
+        if not cols:
+            return cls(names[:1] or ["Label"], [], [])
+        labels = [str(v) for v in cols[0]]
+        parsed = [parse_column(c) for c in cols[1:]]
+        return cls(names, labels, [p[0] for p in parsed], [p[1] for p in parsed],
+                   [p[2] for p in parsed], [p[3] for p in parsed])
+
+    @classmethod
+    def from_state(cls, state: dict) -> "ColumnarTable":
+        """Old {"columns": [...], "rows": [[...]]} workspace dicts."""
+        return cls.from_rows(state.get("columns", ["Label"]), state.get("rows", []))
+
+    def to_state(self) -> dict:
+        return {"columns": list(self.names), "rows": [list(r) for r in self.iter_rows()]}
+
+    def snapshot(self) -> "ColumnarTable":
+        """
+        Shallow copy for saving on another thread. Shares the arrays but not the
+        lists, edits that resize or retype a column swap in a new array anyway.
+        """
+        copy = object.__new__(ColumnarTable)
+        copy.__dict__.update(self.__dict__)
+        copy.names, copy.kinds, copy.versions = list(self.names), list(self.kinds), list(self.versions)
+        copy.columns, copy.valid = list(self.columns), list(self.valid)
+        copy.categories = [list(c) if c else c for c in self.categories]
+        copy.formulas, copy._formula_inputs = dict(self.formulas), dict(self._formula_inputs)
+        return copy
+
+    def copy(self) -> "ColumnarTable":
+        """snapshot() with its own arrays too, for a writer that may still run while cells are edited."""
+        copy = self.snapshot()
+        copy.labels = self.labels.copy()
+        copy.columns = [c.copy() for c in self.columns]
+        copy.valid = [v.copy() for v in self.valid]
+        return copy
+
+    # shape
+    def __len__(self):
+        return len(self.labels)
+
+    @property
+    def n_series(self) -> int:
+        return len(self.columns)
+
+    @property
+    def series_names(self) -> list:
+        return self.names[1:]
+
+    def numeric_series(self) -> list:
+        """Indices of the int/float series."""
+        return [j for j, kind in enumerate(self.kinds) if kind in NUMERIC_KINDS]
+
+    def series(self, i: int) -> np.ndarray:
+        """Values of series i, invalid cells are 0. No copy."""
+        return self.columns[i]
+
+    def valid_values(self, i: int) -> np.ndarray:
+        """Only the cells that parsed, as float64 (copy only when something is masked)."""
+        col, ok = self.columns[i], self.valid[i]
+        values = col if ok.all() else col[ok]
+        return values.astype(np.float64, copy=False)
+
+    # text view, for the editor and csv export
+    def cell_text(self, row: int, col: int) -> str:
+        if col == 0:
+            return str(self.labels[row])
+        j = col - 1
+        return _cell_text(self.columns[j][row], self.valid[j][row],
+                          self.kinds[j], self.categories[j])
+
+    def iter_rows(self):
+        for r in range(len(self)):
+            yield [self.cell_text(r, c) for c in range(len(self.names))]
+
+    # edits, every one bumps the version of the column it touched
+    def set_cell(self, row: int, col: int, text: str):
+        if col == 0:
+            self.labels[row] = str(text)
+            self.label_version += 1
+            return
+        j = col - 1
+        kind = self.kinds[j]
+        if kind == "category":
+            cats = self.categories[j]
+            text = str(text).strip()
+            ok = text.lower() not in csv_parser.MISSING
+            if ok and text not in cats:
+                cats.append(text)
+            value = cats.index(text) if ok else 0
+        else:
+            values, valid, new_kind, _ = parse_column([text])
+            numeric = ("int", "float")
+            # text typed into a number column (or a number into a date one) is invalid
+            ok = bool(valid[0]) and (new_kind == kind or (kind in numeric and new_kind in numeric))
+            if ok and kind == "int" and new_kind == "float":
+                self.columns[j] = self.columns[j].astype(np.float64) # 1 -> 1.5 widens the column
+                self.kinds[j] = "float"
+            value = values[0] if ok else 0
+        self.columns[j][row] = value
+        self.valid[j][row] = ok
+        self.versions[j] += 1
+
+    def add_row(self, label: str = "New", fill: float = 0.0, count: int = 1):
+        self.labels = np.concatenate([self.labels, np.full(count, label, dtype=object)])
+        self.label_version += 1
+        for j, col in enumerate(self.columns):
+            self.columns[j] = np.concatenate([col, np.full(count, fill, dtype=col.dtype)])
+            numeric = self.kinds[j] in ("int", "float") # new dates/categories start empty
+            self.valid[j] = np.concatenate([self.valid[j], np.full(count, numeric)])
+            self.versions[j] += 1
+
+    def add_series(self, name: str, fill: float = 0.0):
+        self.names.append(str(name))
+        self.columns.append(np.full(len(self), fill, dtype=np.float64))
+        self.valid.append(np.ones(len(self), dtype=bool))
+        self.kinds.append("float")
+        self.categories.append(None)
+        self.versions.append(0)
+
+    def add_formula(self, name: str, expr: str):
+        """New series computed from expr, it can use any series left of it."""
+        # compiled and evaluated before the table changes, bad ones never get in
+        node, deps = expressions.compile_expression(expr, tuple(self.series_names))
+        values, valid = expressions.evaluate(node, self)
+        self.add_series(name)
+        j = self.n_series - 1
+        self.columns[j], self.valid[j] = values, valid
+        self.formulas[j] = expr
+        self._formula_inputs[j] = (len(self),) + tuple(self.versions[d] for d in deps)
+
+    def refresh_formulas(self):
+        """Recomputes expression columns whose inputs changed, left to right."""
+        for j in sorted(self.formulas):
+            node, deps = expressions.compile_expression(self.formulas[j], tuple(self.names[1:j + 1]))
+            inputs = (len(self),) + tuple(self.versions[d] for d in deps)
+            if self._formula_inputs.get(j) == inputs:
+                continue
+            values, valid = expressions.evaluate(node, self) # a failure leaves the column as it was
+            self.columns[j], self.valid[j] = values, valid
+            self.kinds[j], self.categories[j] = "float", None
+            self.versions[j] += 1
+            self._formula_inputs[j] = inputs
+
+    def clear(self):
+        self.names = ["Label"]
+        self.labels = np.empty(0, dtype=object)
+        self.columns, self.valid, self.versions = [], [], []
+        self.kinds, self.categories = [], []
+        self.formulas, self._formula_inputs = {}, {}
+        self.uid = next(_uids)
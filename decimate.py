@@ -0,0 +1,106 @@
+import numpy as np
+
+# screen-sized versions of big series for plotext. plotext walks every point in
+# python, but a terminal only has a few hundred columns, so everything past a
+# few points per column is work nobody sees.
+#   minmax  per bucket the lowest and the highest sample, in time order. the
+#           same picture a full line plot draws, spikes and edges included
+#   lttb    largest triangle three buckets, one point per bucket that keeps the
+#           shape, for scatter plots where a min/max pair reads as noise
+# both keep the first and last sample and hand small series back untouched.
+# the same helpers thin the matplotlib exports, with a budget sized for an image.
+
+PIE_SLICES = 12 # pie slices, the smallest ones past this become "Other"
+
+def screen_points(widget) -> int:
+    """Samples worth drawing in a plot widget, a few per braille column."""
+    width = getattr(getattr(widget, "size", None), "width", 0) or 100
+    return max(400, width * 4)
+
+def _as_arrays(x, y) -> tuple:
+    y = np.asarray(y, dtype=np.float64)
+    x = np.arange(len(y), dtype=np.float64) if x is None else np.asarray(x, dtype=np.float64)
+    return x, y
+
+def minmax_indices(y, n_points: int) -> np.ndarray:
+    """Sorted indices of the min and max of every bucket, about n_points of them."""
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    buckets = max(1, n_points // 2)
+    if n <= n_points or n <= 2:
+        return np.arange(n)
+    size = -(-n // buckets) # ceil
+    buckets = -(-n // size)
+    # pad to a full grid, the padding can never win min or max. NaN neither
+    lo = np.full(buckets * size, np.inf)
+    hi = np.full(buckets * size, -np.inf)
+    finite = np.isfinite(y)
+    lo[:n] = np.where(finite, y, np.inf)
+    hi[:n] = np.where(finite, y, -np.inf)
+    start = np.arange(buckets) * size
+    idx = np.concatenate([start + lo.reshape(buckets, size).argmin(axis=1),
+                          start + hi.reshape(buckets, size).argmax(axis=1), [0, n - 1]])
+    return np.unique(np.minimum(idx, n - 1))
+
+def lttb_indices(x, y, n_points: int) -> np.ndarray:
+    """Largest triangle three buckets, n_points indices (first and last included)."""
+    x, y = _as_arrays(x, y)
+    n = len(y)
+    if n <= n_points or n_points < 3:
+        return np.arange(n)
+    y = np.where(np.isfinite(y), y, 0.0)
+    edges = np.linspace(1, n - 1, n_points - 1).astype(np.int64) # inner buckets
+    out = np.empty(n_points, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    prev = 0
+    for b in range(n_points - 2):
+        lo, hi = edges[b], max(edges[b + 1], edges[b] + 1)
+        nlo, nhi = edges[b + 1], edges[b + 2] if b + 2 < len(edges) else n
+        # third corner: average of the next bucket (the last sample for the last bucket)
+        cx, cy = x[nlo:max(nhi, nlo + 1)].mean(), y[nlo:max(nhi, nlo + 1)].mean()
+        ax, ay = x[prev], y[prev]
+        area = np.abs((ax - cx) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (cy - ay))
+        prev = lo + int(area.argmax())
+        out[b + 1] = prev
+    return out
+
+def decimate(x, y, n_points: int, method: str = "minmax") -> tuple:
+    """(x, y) with about n_points points. x None means the sample index."""
+    x, y = _as_arrays(x, y)
+    if method == "lttb":
+        idx = lttb_indices(x, y, n_points)
+    else:
+        idx = minmax_indices(y, n_points)
+    if len(idx) == len(y):
+        return x, y
+    return x[idx], y[idx]
+
+def peak_rows(series: list, n_rows: int) -> np.ndarray:
+    """
+    For bar charts: per bucket of rows, the one with the largest magnitude in
+    any series, so the tallest bars always survive.
+    """
+    mags = np.abs(np.nan_to_num(np.vstack([np.asarray(s, dtype=np.float64) for s in series]))).max(axis=0)
+    n = len(mags)
+    if n <= n_rows:
+        return np.arange(n)
+    size = -(-n // n_rows)
+    buckets = -(-n // size)
+    grid = np.full(buckets * size, -1.0)
+    grid[:n] = mags
+    return np.arange(buckets) * size + grid.reshape(buckets, size).argmax(axis=1)
+
+def top_slices(values, labels: list, k: int) -> tuple:
+    """Pie values/labels with the k - 1 largest slices kept and the rest summed into "Other"."""
+    vals = np.abs(np.asarray(values, dtype=np.float64))
+    if len(vals) <= k:
+        return vals, list(labels)
+    keep = np.sort(np.argpartition(vals, len(vals) - (k - 1))[len(vals) - (k - 1):])
+    rest = vals.sum() - vals[keep].sum()
+    return np.append(vals[keep], rest), [labels[i] for i in keep] + ["Other"]
+
+def tick_positions(n: int, max_ticks: int) -> np.ndarray:
+    """Evenly spaced label positions, all of them when they fit."""
+    if n <= max_ticks:
+        return np.arange(n)
+    return np.unique(np.linspace(0, n - 1, max(2, max_ticks)).round().astype(np.int64))
@@ -3,6 +3,8 @@ import math
 
 import numpy as np
 
+import decimate
+
 # lazy loaded matplotlib
 
 def get_default_filename(prefix: str) -> str: #should not be used much
@@ -41,8 +43,16 @@ def export_rc_transient(data: dict, filename: str = None) -> str:
     def plot(plt):
         plt.xlabel("Time (s)")
         plt.ylabel("Voltage (V)")
-        for c in data["curves"]:
-            plt.plot(data["time"], c["voltage"], label=f"R={c['R']}Ω")
+        if hasattr(data, "voltage"): # sweep result
+            if len(data) > 20: # envelope of the whole sweep, plus a few curves
+                plt.fill_between(data.time, data.voltage.min(axis=0),
+                                 data.voltage.max(axis=0), alpha=0.2,
+                                 label=f"{len(data)} curves")
+            for i in data.pick(20):
+                plt.plot(data.time, data.voltage[i], label=data.label(i))
+        else:
+            for c in data["curves"]:
+                plt.plot(data["time"], c["voltage"], label=f"R={c['R']}Ω")
         plt.legend()
 
     return _setup_and_save(filename, "RC step response", plot)
@@ -60,6 +70,25 @@ def export_square_wave(data: dict, filename: str = None) -> str:
 
     return _setup_and_save(filename, "RC square wave", plot)
 
+def export_bode(data: dict, filename: str = None) -> str:
+    if not filename:
+        filename = get_default_filename("rc_bode")
+
+    def plot(plt):
+        fig = plt.gcf()
+        fig.clear()
+        fig.suptitle(f"RC low-pass Bode plot (fc={data['f_c']:.4g}Hz)")
+        mag, phase = fig.subplots(2, 1, sharex=True)
+        mag.semilogx(data["freq"], data["magnitude_db"], color="tab:blue")
+        mag.axvline(data["f_c"], color="tab:red", linestyle="--", label="-3 dB corner")
+        mag.set_ylabel("Magnitude (dB)")
+        mag.legend()
+        phase.semilogx(data["freq"], data["phase_deg"], color="tab:orange")
+        phase.set_ylabel("Phase (°)")
+        phase.set_xlabel("Frequency (Hz)")
+
+    return _setup_and_save(filename, "RC Bode", plot)
+
 def export_555_astable(data: dict, filename: str = None) -> str:
     if not filename:
         filename = get_default_filename("555_astable")
@@ -68,7 +97,10 @@ def export_555_astable(data: dict, filename: str = None) -> str:
         plt.title(f"555 Astable output (Freq={data['freq']:.1f}Hz)")
         plt.xlabel("Time (s)")
         plt.ylabel("Voltage (V)")
-        plt.plot(data["time"], data["voltage"], label="Output Pin 3", color="tab:blue")
+        from sim_controller import SimulationController # lazy, same cache key as the plot
+        # plenty for 1500px, cached so repeated exports skip the expansion
+        time, voltage = SimulationController.astable_samples(data, 4000)
+        plt.plot(time, voltage, label="Output Pin 3", color="tab:blue")
         plt.ylim(-0.5, 6)
         plt.legend()
 
@@ -91,7 +123,46 @@ def export_555_monostable(data: dict, filename: str = None) -> str:
 
     return _setup_and_save(filename, "555 Monostable", plot)
 
+def export_netlist(data: dict, filename: str = None) -> str:
+    if not filename:
+        filename = get_default_filename("netlist")
+
+    def plot(plt):
+        plt.xlabel("Time (s)")
+        plt.ylabel("Voltage (V)")
+        for p in data["probes"]:
+            plt.plot(data["time"], data["voltages"][data["nodes"].index(p)], label=f"V({p})")
+        plt.legend()
+
+    return _setup_and_save(filename, f"Netlist transient ({len(data['nodes'])} nodes)", plot)
+
+def export_monte_carlo(data: dict, filename: str = None) -> str:
+    if not filename:
+        filename = get_default_filename("monte_carlo")
+
+    title = (f"Monte Carlo, {data['runs']} runs "
+             f"(yield {data['yield']:.1f}% at ±{data['spec_pct']:g}%)")
+
+    def plot(plt):
+        names = list(data["metrics"])
+        plt.gcf().clear() # drop the default axes, one subplot per metric
+        plt.suptitle(title)
+        for i, name in enumerate(names):
+            plt.subplot(1, len(names), i + 1)
+            plt.hist(data["metrics"][name], bins=60, color="tab:blue", alpha=0.8)
+            plt.axvline(data["nominal"][name], color="tab:red", linestyle="--",
+                        label="Nominal")
+            plt.xlabel(name)
+            plt.legend()
+
+    return _setup_and_save(filename, title, plot)
+
 # exporting, white background, ink saving.
+# big tables go through the same thinning as the terminal view, sized for a
+# 1500px image: matplotlib gets a few thousand points, not every row.
+EXPORT_POINTS = 4000 # line/area/scatter
+EXPORT_BARS = 150    # bar groups, the tallest row of every bucket
+EXPORT_TICKS = 12    # x labels, more overlap at 1500px
 
 def export_generic_plot(data: dict, title: str = "Data Export", mode: str = "line",
                          filename: str = None, active_index: int = 0) -> str:
@@ -102,25 +173,43 @@ def export_generic_plot(data: dict, title: str = "Data Export", mode: str = "lin
         labels = data.get("labels", [])
         series = data.get("series", [])
         names = data.get("names", [])
+        how = data.get("aggregate") # bar/pie grouped by label, see aggregate.py
 
         safe_colors = ["tab:red", "tab:green", "tab:orange", "tab:blue", "tab:purple", "tab:cyan", "black"]
 
         if not series and "values" in data:
             series = [data["values"]]; names = ["Data"]
 
-        if mode == "pie": # plot
+        if mode == "histogram" and "hist" in data: # binned already, never the raw points
+            edges = np.asarray(data["hist"]["edges"])
+            for i, counts in enumerate(data["hist"]["counts"]):
+                label = names[i] if i < len(names) else f"Series {i+1}"
+                plt.bar(edges[:-1], counts, width=np.diff(edges), align="edge", alpha=0.5,
+                        label=label, color=safe_colors[i % len(safe_colors)])
+            plt.xlabel("Value"); plt.ylabel("Count"); plt.legend()
+        elif mode == "kde" and "kde" in data:
+            grid = np.asarray(data["kde"]["grid"])
+            for i, dens in enumerate(data["kde"]["density"]):
+                label = names[i] if i < len(names) else f"Series {i+1}"
+                col = safe_colors[i % len(safe_colors)]
+                plt.plot(grid, dens, label=label, color=col)
+                plt.fill_between(grid, dens, alpha=0.2, color=col)
+            plt.xlabel("Value"); plt.ylabel("Density"); plt.legend()
+        elif mode == "pie": # plot
             if series:
                 idx = active_index if 0 <= active_index < len(series) else 0
-                vals = [abs(x) for x in series[idx]]
+                vals, slice_labels = decimate.top_slices(series[idx], labels, decimate.PIE_SLICES)
                 s_name = names[idx] if idx < len(names) else f"Series {idx+1}"
-                plt.title(f"{s_name} (Distribution)")
+                plt.title(f"{s_name} ({how} by label)" if how else f"{s_name} (Distribution)")
 
-                if sum(vals) > 0:
-                    plt.pie(vals, labels=labels, autopct='%1.1f%%', startangle=90, colors=safe_colors)
+                if vals.sum() > 0:
+                    plt.pie(vals, labels=slice_labels, autopct='%1.1f%%', startangle=90, colors=safe_colors)
                     plt.axis('equal')
                 else: plt.text(0.5, 0.5, "Sum is zero, fix.", ha='center') 
         else:
-            x = np.arange(len(labels))
+            rows = np.arange(len(labels))
+            if mode == "bar" and series: # bars sit side by side, one slot per kept row
+                rows = decimate.peak_rows(series, EXPORT_BARS)
             for i, s_data in enumerate(series):
                 label = names[i] if i < len(names) else f"Series {i+1}"
                 col = safe_colors[i % len(safe_colors)]
@@ -128,14 +217,21 @@ def export_generic_plot(data: dict, title: str = "Data Export", mode: str = "lin
                 if mode == "bar":
                     width = 0.8 / len(series)
                     offset = (i - len(series)/2 + 0.5) * width
-                    plt.bar(x + offset, s_data, width, label=label, color=col)
-                elif mode == "scatter": plt.scatter(x, s_data, label=label, color=col)
-                elif mode == "area":
-                    plt.plot(x, s_data, label=label, color=col)
-                    plt.fill_between(x, s_data, alpha=0.3, color=col)
-                else: plt.plot(s_data, marker='o', label=label, color=col)
-
-            plt.xticks(x, labels); plt.legend()
+                    plt.bar(np.arange(len(rows)) + offset, np.asarray(s_data)[rows], width, label=label, color=col)
+                elif mode == "scatter":
+                    plt.scatter(*decimate.decimate(None, s_data, EXPORT_POINTS, "lttb"), label=label, color=col)
+                else:
+                    x, y = decimate.decimate(None, s_data, EXPORT_POINTS)
+                    if mode == "area":
+                        plt.plot(x, y, label=label, color=col)
+                        plt.fill_between(x, y, alpha=0.3, color=col)
+                    else: plt.plot(x, y, marker='o' if len(y) <= 100 else None, label=label, color=col)
+
+            ticks = decimate.tick_positions(len(rows), EXPORT_TICKS)
+            positions = ticks if mode == "bar" else rows[ticks]
+            plt.xticks(positions, [labels[rows[t]] for t in ticks]); plt.legend()
+            if how:
+                plt.xlabel(f"Label ({how})")
 
     return _setup_and_save(filename, title, plot)
 
@@ -168,11 +264,11 @@ def export_multi_series(data: dict, filename_base: str, export_mode: str = "comb
 
             for i, ax in enumerate(ax_flat):
                 if i < n:
-                    vals = [abs(x) for x in series[i]]
+                    vals, slice_labels = decimate.top_slices(series[i], labels, decimate.PIE_SLICES)
                     s_name = names[i] if i < len(names) else f"Series {i+1}"
                     ax.set_title(s_name)
-                    if sum(vals) > 0:
-                        ax.pie(vals, labels=labels, autopct='%1.1f%%', startangle=90, colors=safe_colors)
+                    if vals.sum() > 0:
+                        ax.pie(vals, labels=slice_labels, autopct='%1.1f%%', startangle=90, colors=safe_colors)
                         ax.axis('equal')
                     else: ax.text(0.5, 0.5, "Zero sum, fix", ha='center')
                 else: ax.axis('off')
@@ -188,10 +284,10 @@ def export_multi_series(data: dict, filename_base: str, export_mode: str = "comb
             plt.figure(figsize=(8, 6))
             s_name = names[i] if i < len(names) else f"Series {i+1}"
             plt.title(s_name)
-            vals = [abs(x) for x in s_data]
+            vals, slice_labels = decimate.top_slices(s_data, labels, decimate.PIE_SLICES)
 
-            if sum(vals) > 0:
-                plt.pie(vals, labels=labels, autopct='%1.1f%%', startangle=90, colors=safe_colors)
+            if vals.sum() > 0:
+                plt.pie(vals, labels=slice_labels, autopct='%1.1f%%', startangle=90, colors=safe_colors)
                 plt.axis('equal')
 
             out_name = f"{filename_base}_{i+1}_{s_name}.png".replace(" ", "_")
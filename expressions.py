@@ -0,0 +1,197 @@
+import ast
+import functools
+import re
+
+import numpy as np
+
+# derived series for the data view, e.g. "S3 = rolling_mean(S1, 20) / S2".
+# python's own parser splits the text, the tree is then checked against a
+# whitelist and turned into small tuples, nothing ever goes through eval:
+#   ("num", value)  ("col", series index)  ("neg", node)
+#   ("op", "+", left, right)  ("call", name, [args])
+# evaluation works on whole columns, invalid cells are NaN on the way in and
+# whatever is not finite at the end is invalid.
+# columns are referenced by name (plain identifiers or "quoted names") or by
+# position as S1, S2, ... like the default series names.
+# windows and shift counts have to be plain whole numbers in the text, so a
+# formula that compiles always evaluates.
+
+class ExpressionError(ValueError):
+    pass
+
+def _rolling(x, window, reduce: str):
+    window = int(window)
+    if window < 1:
+        raise ExpressionError("window must be at least 1")
+    x = np.atleast_1d(np.asarray(x, dtype=np.float64))
+    ok = np.isfinite(x)
+    vals = np.where(ok, x, 0.0)
+    # running sums, window sum is a difference of two of them
+    def window_sum(a):
+        c = np.concatenate([[0.0], np.cumsum(a)])
+        out = np.full(len(a), np.nan)
+        out[window - 1:] = c[window:] - c[:-window]
+        return out
+    count = window_sum(ok.astype(np.float64))
+    total = window_sum(vals)
+    full = count == window # a window with a gap has no value
+    if reduce == "sum":
+        out = total
+    else:
+        mean = total / window
+        if reduce == "mean":
+            out = mean
+        else: # std, population
+            out = np.sqrt(np.maximum(window_sum(vals * vals) / window - mean * mean, 0.0))
+    return np.where(full, out, np.nan)
+
+def _shift(x, n):
+    x = np.atleast_1d(np.asarray(x, dtype=np.float64))
+    n = max(-len(x), min(len(x), int(n))) # past either end is all NaN
+    out = np.full(len(x), np.nan)
+    if n >= 0:
+        out[n:] = x[:len(x) - n]
+    else:
+        out[:n] = x[-n:]
+    return out
+
+def _normalize(x):
+    lo, hi = np.nanmin(x), np.nanmax(x)
+    return (x - lo) / (hi - lo) if hi > lo else np.zeros_like(x)
+
+def _cumsum(x):
+    return np.where(np.isfinite(x), np.nancumsum(x), np.nan)
+
+# name -> (function, number of arguments)
+FUNCTIONS = {
+    "abs": (np.abs, 1),
+    "sqrt": (np.sqrt, 1),
+    "log": (np.log, 1),
+    "log10": (np.log10, 1),
+    "exp": (np.exp, 1),
+    "cumsum": (_cumsum, 1),
+    "diff": (lambda x: x - _shift(x, 1), 1),
+    "shift": (_shift, 2),
+    "normalize": (_normalize, 1),
+    "zscore": (lambda x: (x - np.nanmean(x)) / np.nanstd(x), 1),
+    "rolling_mean": (lambda x, w: _rolling(x, w, "mean"), 2),
+    "rolling_sum": (lambda x, w: _rolling(x, w, "sum"), 2),
+    "rolling_std": (lambda x, w: _rolling(x, w, "std"), 2),
+    "min": (np.fmin, 2),
+    "max": (np.fmax, 2),
+    "mean": (np.nanmean, 1),
+    "sum": (np.nansum, 1),
+    "std": (np.nanstd, 1),
+}
+
+_OPS = {
+    ast.Add: ("+", np.add),
+    ast.Sub: ("-", np.subtract),
+    ast.Mult: ("*", np.multiply),
+    ast.Div: ("/", np.divide),
+    ast.Pow: ("**", np.power),
+    ast.Mod: ("%", np.mod),
+}
+_BY_SYMBOL = {symbol: fn for symbol, fn in _OPS.values()}
+_WINDOWS = ("rolling_mean", "rolling_sum", "rolling_std") # second argument: rows, at least 1
+_POSITIONAL = re.compile(r"^[Ss](\d+)$")
+
+def split_definition(text: str) -> tuple:
+    """"NAME = expression" -> (name, expression)."""
+    name, sep, expr = str(text).partition("=")
+    name, expr = name.strip(), expr.strip()
+    if not sep or not name or not expr or expr.startswith("=") or "(" in name:
+        raise ExpressionError("use NAME = expression, e.g. S3 = rolling_mean(S1, 20) / S2")
+    return name, expr
+
+def _column(name: str, names: tuple) -> int:
+    if name in names:
+        return names.index(name)
+    m = _POSITIONAL.match(name)
+    if m and 1 <= int(m.group(1)) <= len(names):
+        return int(m.group(1)) - 1
+    raise ExpressionError(f"unknown column '{name}'")
+
+def _literal_int(node):
+    """Whole number written in the text (sign allowed), None for anything else."""
+    sign = 1
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        sign, node = (-1 if isinstance(node.op, ast.USub) else 1), node.operand
+    if isinstance(node, ast.Constant) and type(node.value) is int:
+        return sign * node.value
+    return None
+
+def _build(node, names: tuple, deps: set):
+    if isinstance(node, ast.Expression):
+        return _build(node.body, names, deps)
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, str): # "Series 1", names with spaces
+            j = _column(node.value, names)
+            deps.add(j)
+            return ("col", j)
+        if isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+            return ("num", float(node.value))
+    elif isinstance(node, ast.Name):
+        j = _column(node.id, names)
+        deps.add(j)
+        return ("col", j)
+    elif isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        inner = _build(node.operand, names, deps)
+        return ("neg", inner) if isinstance(node.op, ast.USub) else inner
+    elif isinstance(node, ast.BinOp) and type(node.op) in _OPS:
+        return ("op", _OPS[type(node.op)][0],
+                _build(node.left, names, deps), _build(node.right, names, deps))
+    elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+        name = node.func.id
+        if name not in FUNCTIONS:
+            raise ExpressionError(f"unknown function '{name}'")
+        if len(node.args) != FUNCTIONS[name][1]:
+            raise ExpressionError(f"{name} takes {FUNCTIONS[name][1]} argument(s)")
+        if name == "shift" or name in _WINDOWS:
+            count = _literal_int(node.args[1])
+            if count is None:
+                raise ExpressionError(f"{name} needs a whole number of rows, e.g. {name}(S1, 20)")
+            if name in _WINDOWS and count < 1:
+                raise ExpressionError(f"{name} window must be at least 1")
+            return ("call", name, [_build(node.args[0], names, deps), ("num", float(count))])
+        return ("call", name, [_build(a, names, deps) for a in node.args])
+    raise ExpressionError(f"not allowed in an expression: {ast.dump(node)[:40]}")
+
+@functools.lru_cache(maxsize=256)
+def compile_expression(expr: str, names: tuple) -> tuple:
+    """(tree, sorted dependency indices). names are the series names it may use."""
+    try:
+        tree = ast.parse(expr.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ExpressionError(f"syntax error: {e.msg}") from None
+    deps = set()
+    node = _build(tree, names, deps)
+    return node, tuple(sorted(deps))
+
+def _eval(node, columns):
+    kind = node[0]
+    if kind == "num":
+        return node[1]
+    if kind == "col":
+        return columns(node[1])
+    if kind == "neg":
+        return -_eval(node[1], columns)
+    if kind == "op":
+        return _BY_SYMBOL[node[1]](_eval(node[2], columns), _eval(node[3], columns))
+    fn = FUNCTIONS[node[1]][0]
+    return fn(*[_eval(a, columns) for a in node[2]])
+
+def evaluate(node, table) -> tuple:
+    """Whole-column evaluation against a ColumnarTable, (float64 values, valid)."""
+    n = len(table)
+    inputs = {}
+
+    def columns(j):
+        if j not in inputs: # NaN where the cell is missing, so it spreads
+            inputs[j] = np.where(table.valid[j], table.columns[j].astype(np.float64), np.nan)
+        return inputs[j]
+    with np.errstate(all="ignore"):
+        out = np.broadcast_to(np.asarray(_eval(node, columns), dtype=np.float64), (n,)).copy()
+    valid = np.isfinite(out)
+    out[~valid] = 0.0
+    return out, valid
@@ -1,5 +1,6 @@
 from textual.widgets import Input, Select, Static
 from textual_plotext import PlotextPlot
+import decimate
 import financial_manager
 import fin_indicators
 import exporter
@@ -64,7 +65,9 @@ class FinancialController:
             count = len(closes)
 
             plt.title(f"{symbol} ({count} candles)")
-            plt.plot(dates_safe, closes, label="Close price", color="green", fillx=True)
+            # min/max per column, years of minute candles still draw at screen size
+            xs, ys = decimate.decimate(dates_safe, closes, decimate.screen_points(widget))
+            plt.plot(xs, ys, label="Close price", color="green", fillx=True)
 
             step = max(1, count // 10)
             ticks = dates_safe[::step]
@@ -5,19 +5,34 @@ import os
 from textual.app import App, ComposeResult, on
 from textual.binding import Binding
 from textual.containers import Horizontal
-from textual.widgets import (Button, ContentSwitcher, DataTable, Footer,
-                             Header, Input, RichLog, Select)
+from textual.widgets import (Button, ContentSwitcher, Footer, Header, Input,
+                             ProgressBar, RichLog, Select, TextArea)
+from textual.worker import get_current_worker
 from textual_plotext import PlotextPlot
 
 import config_manager
+import csv_cache
+import csv_importer
+import data_model
 import exporter
+import expressions
 import fin_controller
+import merge
 import sim_controller
+import table_view
 import tools_views
 import views
 import workspace_manager
 from file_manager import FileScreen
 
+# widgets whose values the workspace keeps, changes are journaled by id
+AUTOSAVED_INPUTS = {
+    "fin_symbol", "fin_period", "fin_interval", "circuit_select",
+    "rc_mode", "rc_voltage", "rc_freq", "rc_res", "rc_cap", "ac_fstart", "ac_fstop", "ac_points",
+    "timer_r1", "timer_r2", "timer_c", "mono_r", "mono_c", "mono_trig", "mono_trig_w", "mono_retrig",
+    "sim_duration", "sim_solver", "net_text", "net_probe", "mc_tol_r", "mc_tol_c", "mc_runs", "mc_spec",
+}
+
 SHOW_LOGS = True # toggle to show logs at default, l for hide/show
 #minimum size
 MIN_WIDTH = 100
@@ -29,16 +44,18 @@ class GrafTUI(App):
         Binding("s", "open_settings", "Settings"),
         Binding("b", "toggle_sidebar", "Toggle Sidebar"),
         Binding("l", "toggle_logs", "Toggle Logs"),
+        Binding("c", "cancel_simulation", "Cancel sim"),
         Binding("q", "quit_and_save", "Quit"),
     ]
 
-    gen_data_state = {
+    gen_data_state = data_model.ColumnarTable.from_state({
         "columns": ["Label", "Series 1", "Series 2"],
         "rows": [["A", 10, 5], ["B", 25, 15], ["C", 15, 30]]
-    }
+    })
 
     sidebar_hidden = False
     active_series_index = 0
+    gen_window = None # (start, stop) rows shown in the data view, None is all
 
     def __init__(self):
         super().__init__()
@@ -48,6 +65,15 @@ class GrafTUI(App):
         self.last_gen_data = None
         self.last_gen_mode = "line"
         self._pending_export_path = None
+        self._sim_run_id = 0 # bumped per RUN, older worker results get dropped
+        self._import_id = 0 # same for csv imports
+        self._lazy_data = None # saved spreadsheet, read on first DATA VIEW visit
+        self.journal = None
+        self._input_values = {}  # last journaled value per widget id
+        self._input_changes = {} # not journaled yet, batched per FLUSH_SECONDS
+        self._last_import = None # (table uid, journal entry) of the last csv loaded in the editor
+        self._draft = None # what the open editor has journaled so far, see _flush_draft
+        self._restoring = False # journal replay still running on its worker
 
     # startup
     def on_mount(self) -> None:
@@ -57,18 +83,25 @@ class GrafTUI(App):
         self.push_screen(views.IntroScreen()) # optimize the intro? good enough.
         # restore. explained in function.
         self._restore_workspace()
+        # from here on changes go to the journal, restoring them is not a change
+        self._input_values = {wid: self._input_value(wid) for wid in AUTOSAVED_INPUTS}
+        self.journal = workspace_manager.Journal()
+        self.set_interval(workspace_manager.FLUSH_SECONDS, self._autosave)
 
         self.call_after_refresh(self.init_plots)
         self.check_screen_size()
         self.log_msg(f"Done! Theme: {self.theme}")
 
     def _restore_workspace(self):
-        ws = workspace_manager.load_workspace()
-        if not ws: return
-
-        # 1. bring back spreadsheet
-        if "data_view" in ws and ws["data_view"].get("rows"):
-            self.gen_data_state = ws["data_view"]
+        ws = workspace_manager.load_workspace() or {}
+
+        # 1. bring back spreadsheet, binary workspaces only read it once data view opens
+        data = ws.get("data_view")
+        if isinstance(data, workspace_manager.LazyTable):
+            self._lazy_data = data
+            self.log_msg(f"spreadsheet found: {len(data)} rows, loads on DATA VIEW")
+        elif data and data.get("rows"):
+            self.gen_data_state = data_model.ColumnarTable.from_state(data)
             self.log_msg("restored spreadsheet")
 
         # 2. restore financial inputs, if any...
@@ -94,6 +127,9 @@ class GrafTUI(App):
                 self.query_one("#rc_freq", Input).value = elec.get("rc_freq", "1000")
                 self.query_one("#rc_res", Input).value = elec.get("rc_res", "1000, 4700")
                 self.query_one("#rc_cap", Input).value = elec.get("rc_cap", "100")
+                self.query_one("#ac_fstart", Input).value = elec.get("ac_fstart", "0")
+                self.query_one("#ac_fstop", Input).value = elec.get("ac_fstop", "0")
+                self.query_one("#ac_points", Input).value = elec.get("ac_points", "10000")
                 #555
                 self.query_one("#timer_r1", Input).value = elec.get("timer_r1", "1000")
                 self.query_one("#timer_r2", Input).value = elec.get("timer_r2", "10000")
@@ -101,28 +137,109 @@ class GrafTUI(App):
                 #monostable 555
                 self.query_one("#mono_r", Input).value = elec.get("mono_r", "10000")
                 self.query_one("#mono_c", Input).value = elec.get("mono_c", "100")
+                self.query_one("#mono_trig", Input).value = elec.get("mono_trig", "")
+                self.query_one("#mono_trig_w", Input).value = elec.get("mono_trig_w", "0")
+                self.query_one("#mono_retrig", Select).value = elec.get("mono_retrig", "no")
                 self.query_one("#sim_duration", Input).value = elec.get("sim_duration", "0")
+                self.query_one("#sim_solver", Select).value = elec.get("sim_solver", "exact")
+                # netlist
+                if elec.get("net_text"):
+                    self.query_one("#net_text", TextArea).text = elec["net_text"]
+                self.query_one("#net_probe", Input).value = elec.get("net_probe", "")
+                # monte carlo
+                self.query_one("#mc_tol_r", Input).value = elec.get("mc_tol_r", "5")
+                self.query_one("#mc_tol_c", Input).value = elec.get("mc_tol_c", "10")
+                self.query_one("#mc_runs", Input).value = elec.get("mc_runs", "10000")
+                self.query_one("#mc_spec", Input).value = elec.get("mc_spec", "10")
             except Exception as e:
                 self.log_msg(f"Store Error, electronics: {e}")
 
         # 4. current tab the user was in, for example markets
         if "active_tab" in ws:
-            tab = ws["active_tab"]
+            self._show_tab(ws["active_tab"])
+
+        # 5. whatever happened after the last snapshot (crash, kill), from the journal
+        self._replay_journal(workspace_manager.read_journal())
+
+    def _show_tab(self, tab: str):
+        try:
+            self.query_one("#switcher", ContentSwitcher).current = tab
+            self.query(".nav-btn").remove_class("active-tab")
+            btn_map = {
+                "view_elec": "nav_elec",
+                "view_general": "nav_gen",
+                "view_fin": "nav_fin"
+            }
+            for view_id, btn_id in btn_map.items():
+                if tab == view_id:
+                    self.query_one(f"#{btn_id}").add_class("active-tab")
+            if tab == "view_general":
+                self._ensure_data()
+        except Exception:  # pragma: no cover
+            pass
+
+    def _replay_journal(self, entries: list):
+        if not entries: return
+        values = {}
+        for entry in entries:
+            if entry.get("op") == "inputs":
+                values.update(entry["values"])
+        for wid, value in values.items():
             try:
-                self.query_one("#switcher", ContentSwitcher).current = tab
-                self.query(".nav-btn").remove_class("active-tab")
-                btn_map = {
-                    "view_elec": "nav_elec",
-                    "view_general": "nav_gen",
-                    "view_fin": "nav_fin"
-                }
-                for view_id, btn_id in btn_map.items():
-                    if tab == view_id:
-                        self.query_one(f"#{btn_id}").add_class("active-tab")
+                if wid == "switcher":
+                    self._show_tab(value)
+                elif wid == "net_text":
+                    self.query_one("#net_text", TextArea).text = value
+                else:
+                    self.query_one(f"#{wid}").value = value
             except Exception:  # pragma: no cover
                 pass
+        if all(e.get("op") == "inputs" for e in entries):
+            self.log_msg(f"recovered {len(entries)} unsaved changes")
+            return
 
-    def action_quit_and_save(self):
+        # table entries can re-read whole csvs, that happens on a worker. the editor
+        # stays shut and no snapshot is taken until the table is back
+        self._restoring = True
+        lazy, self._lazy_data = self._lazy_data, None
+        table = self.gen_data_state
+        def work():
+            errors = []
+            base = table
+            if lazy is not None:
+                try:
+                    base = lazy.load()
+                except Exception as e:
+                    errors.append(f"spreadsheet: {e}")
+            data, failed, open_drafts = workspace_manager.replay_all(base, entries)
+            self.call_from_thread(self._journal_replayed, data, errors + failed, open_drafts, len(entries))
+
+        self.run_worker(work, thread=True, group="restore", exclusive=True)
+
+    def _journal_replayed(self, data, errors, open_drafts, count):
+        self.gen_data_state = data
+        self._restoring = False
+        if open_drafts: # editor edits from a crash are kept, a later discard must not drop them
+            self.journal.append({"op": "commit"})
+        sim_controller.SimulationController.warm_pyramids(self)
+        for e in errors:
+            self.log_msg(f"Store Error, journal: {e}")
+        self.log_msg(f"recovered {count} unsaved changes, spreadsheet: {len(data)} rows")
+
+    def _ensure_data(self):
+        """Reads the saved spreadsheet the first time the data view needs it."""
+        if self._lazy_data is None:
+            return
+        lazy, self._lazy_data = self._lazy_data, None
+        try:
+            self.gen_data_state = lazy.load()
+            sim_controller.SimulationController.warm_pyramids(self)
+            self.log_msg(f"restored spreadsheet: {len(self.gen_data_state)} rows")
+        except Exception as e:
+            self.log_msg(f"Store Error, spreadsheet: {e}")
+
+    def _collect_state(self) -> dict:
+        """Everything the workspace keeps, cheap enough to call on every autosave."""
         state = {}
         try:
             state["active_tab"] = self.query_one("#switcher").current
@@ -147,6 +264,9 @@ class GrafTUI(App):
                 "rc_freq": self.query_one("#rc_freq").value,
                 "rc_res": self.query_one("#rc_res").value,
                 "rc_cap": self.query_one("#rc_cap").value,
+                "ac_fstart": self.query_one("#ac_fstart").value,
+                "ac_fstop": self.query_one("#ac_fstop").value,
+                "ac_points": self.query_one("#ac_points").value,
 
                 "timer_r1": self.query_one("#timer_r1").value,
                 "timer_r2": self.query_one("#timer_r2").value,
@@ -154,16 +274,117 @@ class GrafTUI(App):
 
                 "mono_r": self.query_one("#mono_r").value,
                 "mono_c": self.query_one("#mono_c").value,
+                "mono_trig": self.query_one("#mono_trig").value,
+                "mono_trig_w": self.query_one("#mono_trig_w").value,
+                "mono_retrig": self.query_one("#mono_retrig").value,
 
-                "sim_duration": self.query_one("#sim_duration").value
+                "sim_duration": self.query_one("#sim_duration").value,
+                "sim_solver": self.query_one("#sim_solver").value,
+
+                "net_text": self.query_one("#net_text").text,
+                "net_probe": self.query_one("#net_probe").value,
+
+                "mc_tol_r": self.query_one("#mc_tol_r").value,
+                "mc_tol_c": self.query_one("#mc_tol_c").value,
+                "mc_runs": self.query_one("#mc_runs").value,
+                "mc_spec": self.query_one("#mc_spec").value
             }
         except Exception:  # pragma: no cover
             pass
 
-        state["data_view"] = self.gen_data_state # data state
-        workspace_manager.save_workspace(state)
+        # data state, a spreadsheet that was never opened is saved as it is
+        if self._lazy_data is not None:
+            state["data_view"] = self._lazy_data
+        else: # only arrays edited since the last save are copied for the writer thread
+            state["data_view"] = workspace_manager.snapshot(self.gen_data_state)
+        return state
+
+    # autosave
+    def _input_value(self, wid: str):
+        try:
+            widget = self.query_one(f"#{wid}")
+        except Exception:  # pragma: no cover
+            return None
+        return widget.text if isinstance(widget, TextArea) else widget.value
+
+    @on(Input.Changed)
+    @on(Select.Changed)
+    @on(TextArea.Changed)
+    def _track_input(self, event) -> None:
+        wid = event.control.id
+        if wid not in AUTOSAVED_INPUTS or self.journal is None:
+            return
+        value = self._input_value(wid)
+        if not isinstance(value, (str, int, float)): # Select.BLANK and friends
+            return
+        if self._input_values.get(wid) != value:
+            self._input_values[wid] = value
+            self._input_changes[wid] = value
+
+    def _flush_inputs(self):
+        if self._input_changes:
+            self.journal.append({"op": "inputs", "values": self._input_changes})
+            self._input_changes = {}
+
+    def _editor_table(self):
+        """VirtualTable of the open editor, also under a cell input on top of it."""
+        for screen in reversed(self.screen_stack):
+            if isinstance(screen, views.DataEditorScreen):
+                return screen.query_one("#editor_table", table_view.VirtualTable)
+        return None
+
+    def _flush_draft(self):
+        """
+        Journals what changed in the open editor since the last call, as draft
+        entries. Replay applies them once a "commit" follows (Save & Return) and
+        drops them on "discard" (Esc), drafts left open mean a crash and are kept.
+        """
+        table = self._editor_table()
+        if table is None:
+            return
+        draft = self._draft
+        if draft is None or draft["base"] != table.base.uid: # opened, cleared or imported
+            journaled = bool(draft and draft["journaled"])
+            draft = self._draft = {"base": table.base.uid, "rows": len(table.base),
+                                   "names": list(table.base.names), "edits": {}, "journaled": journaled}
+            if table.base is not self.gen_data_state:
+                imported = self._last_import and self._last_import[0] == table.base.uid
+                self.journal.append(dict(self._last_import[1] if imported else {"op": "clear"}, draft=True))
+                draft["journaled"] = True
+        edits = {cell: text for cell, text in table.dirty.items() if draft["edits"].get(cell) != text}
+        if edits or table.row_count != draft["rows"] or table.names != draft["names"]:
+            self.journal.append({"op": "cells", "draft": True, "rows": table.row_count, "names": table.names,
+                                 "formulas": {table.names[c]: e for c, e in table.new_formulas.items()},
+                                 "edits": [[r, c, text] for (r, c), text in edits.items()]})
+            draft["edits"].update(edits)
+            draft["rows"], draft["names"], draft["journaled"] = table.row_count, list(table.names), True
+
+    def _snapshot_safe(self) -> bool:
+        """A snapshot only holds committed data, open drafts and a running restore live in the journal."""
+        return not self._restoring and not (self._draft and self._draft["journaled"])
+
+    def _autosave(self):
+        """Timer tick: journal typed inputs and editor edits, fold the journal into a snapshot when due."""
+        self._flush_inputs()
+        self._flush_draft()
+        if self.journal.due() and self._snapshot_safe():
+            self.journal.compact(self._collect_state())
+
+    def action_quit_and_save(self):
+        self._flush_inputs()
+        self._flush_draft()
+        # final snapshot, waits for the disk. with the editor open its edits stay in
+        # the journal instead and come back on the next start
+        self.journal.close(self._collect_state() if self._snapshot_safe() else None)
         self.exit() # quit
 
+    def action_close_editor(self) -> None:
+        """Esc in the editor, its uncommitted edits are dropped, journaled drafts too."""
+        if self._draft and self._draft["journaled"]:
+            self.journal.append({"op": "discard"})
+        self._draft = None
+        self.pop_screen()
+
     def compose(self) -> ComposeResult:
         yield Header(show_clock=True)
         with Horizontal(classes="nav-bar"): # top ribbon
@@ -206,6 +427,10 @@ class GrafTUI(App):
         except Exception:  # pragma: no cover
             pass
 
+    def action_cancel_simulation(self) -> None:
+        if sim_controller.SimulationController.cancel(self):
+            self.log_msg("simulation cancelled")
+
     def action_open_settings(self) -> None:
         def apply_settings(new_prefs: dict | None) -> None:
             if new_prefs:
@@ -248,7 +473,12 @@ class GrafTUI(App):
     @on(Button.Pressed)
     def handle_nav(self, event: Button.Pressed) -> None:
         bid = event.button.id
+        if bid in ("nav_gen", "btn_open_editor"):
+            self._ensure_data()
         if bid == "btn_open_editor":
+            if self._restoring:
+                self.notify("Still restoring the spreadsheet, try again in a moment.", severity="warning")
+                return
             self.push_screen(views.DataEditorScreen(self.gen_data_state))
             return
 
@@ -261,6 +491,7 @@ class GrafTUI(App):
             self.query_one("#switcher", ContentSwitcher).current = targets[bid]
             self.query(".nav-btn").remove_class("active-tab")
             event.button.add_class("active-tab")
+            self._input_changes["switcher"] = targets[bid]
 
     # stonks
     @on(Button.Pressed, "#btn_fin_fetch")
@@ -288,7 +519,7 @@ class GrafTUI(App):
         try:
             btn_cycle = self.query_one("#btn_cycle_series")
             btn_export_all = self.query_one("#btn_export_all")
-            series_count = max(1, len(self.gen_data_state.get("columns", [])) - 1)
+            series_count = max(1, len(self.gen_data_state.numeric_series()))
             is_multi = series_count > 1
             is_pie = event.value == "pie"
             if is_pie and is_multi:
@@ -302,31 +533,22 @@ class GrafTUI(App):
 
     @on(Button.Pressed, "#btn_cycle_series") #cycles,
     def on_cycle_series(self): # ONLY FOR 3.14159 CHART!!!!
-        cols = self.gen_data_state.get("columns", [])
-        series_count = max(1, len(cols) - 1)
+        series_count = max(1, len(self.gen_data_state.numeric_series()))
         self.active_series_index = (self.active_series_index + 1) % series_count
         self.render_gen()
 
     # data editing
     def _update_table(self, op="add_row", col_name=None):
         try:
-            table = self.screen.query_one("#editor_table", DataTable)
-            ts = datetime.datetime.now().timestamp()
+            # pending until Save & Return, the editor keeps them as an overlay
+            table = self.screen.query_one("#editor_table", table_view.VirtualTable)
 
             if op == "add_row":
-                key = f"r_{table.row_count}_{ts}"
-                vals = ["New"] + ["0.0"] * (len(table.columns)-1)
-                table.add_row(*vals, key=key)
+                table.add_row()
             elif op == "add_col" and col_name:
-                key = f"c_{col_name}_{ts}"
-                table.add_column(col_name, key=key, width=15)
-                for rk in table.rows:
-                    table.update_cell(rk, key, "0.0")
+                table.add_series(col_name)
             elif op == "clear":
-                table.clear(columns=True)
-                self.gen_data_state["columns"] = ["Label"]
-                self.gen_data_state["rows"] = []
-                table.add_column("Label", key="col_Label")
+                table.clear()
         except Exception as e:
             self.log_msg(f"editor error {e}")
 
@@ -339,82 +561,196 @@ class GrafTUI(App):
         self.push_screen(views.InputScreen("Series name", "New series name"),
                          lambda n: self._update_table("add_col", n) if n else None)
 
+    @on(Button.Pressed, "#btn_edit_add_expr")
+    def edit_add_expression(self):
+        def on_text(text):
+            if not text: return
+            try:
+                table = self.screen.query_one("#editor_table", table_view.VirtualTable)
+                name, expr = expressions.split_definition(text)
+                table.add_expression(name, expr)
+                self.log_msg(f"expression column {name} = {expr}, computed on save")
+            except expressions.ExpressionError as e:
+                self.notify(f"Expression error: {e}", severity="error")
+            except Exception as e:
+                self.log_msg(f"editor error {e}")
+        try:
+            count = self.screen.query_one("#editor_table", table_view.VirtualTable).col_count
+        except Exception:  # pragma: no cover
+            count = 1
+        self.push_screen(views.InputScreen(f"S{count} = ", "Expression column (NAME = expression)"),
+                         on_text)
+
     @on(Button.Pressed, "#btn_edit_clear")
     def edit_clear(self):
         self._update_table("clear")
 
     @on(Button.Pressed, "#btn_edit_import")
     def edit_import_csv(self):
-        """Import CSV with format detection."""
+        """Import CSV with format detection, streamed in a worker."""
         def on_path(path):
             if not path or not os.path.exists(path):
                 if path:
                     self.log_msg(f"file not found: {path}")
                 return
-            try:
-                with open(path, 'r', encoding='utf-8-sig') as f:
-                    sample = f.read(1024)
-                    f.seek(0)
-                    try:
-                        dialect = csv.Sniffer().sniff(sample)
-                    except (csv.Error, Exception):
-                        dialect = csv.excel
-                    if dialect.delimiter not in [',', ';', '\t']:
-                        dialect.delimiter = ','
-                    reader = csv.reader(f, dialect)
-                    raw_rows = list(reader)
-
-                if not raw_rows: return
-
-                looks_transposed = False
-                if len(raw_rows) > 0 and len(raw_rows[0]) > 1:
-                    try:
-                        float(raw_rows[0][1])
-                        looks_transposed = True
-                    except (ValueError, IndexError):
-                        looks_transposed = False
-
-                def load_data(do_transpose): # transpose logic, rows become columns, columns become rows, easier said than done.
-                    table = self.screen.query_one("#editor_table", DataTable)
-                    table.clear(columns=True)
-                    ts = int(datetime.datetime.now().timestamp() * 1000)
-
-                    if do_transpose:
-                        self.log_msg("tranposing!")
-                        series_names = [r[0] for r in raw_rows]
-                        max_len = max(len(r) for r in raw_rows)
-                        data_matrix = []
-                        for r in raw_rows:
-                            row_data = r[1:] + ['0'] * (max_len - len(r))
-                            data_matrix.append(row_data)
-
-                        transposed = list(zip(*data_matrix))
-                        headers = ["Index"] + series_names
-                        for i, h in enumerate(headers):
-                            table.add_column(str(h), key=f"col_{i}_{ts}")
-                        for i, r in enumerate(transposed):
-                            full_row = [str(i+1)] + list(r)
-                            table.add_row(*full_row, key=f"row_{i}_{ts}")
-                    else:
-                        self.log_msg("loading standard csv")
-                        headers = raw_rows[0]
-                        for i, h in enumerate(headers):
-                            table.add_column(str(h), key=f"col_{i}_{ts}")
-                        for i, r in enumerate(raw_rows[1:]):
-                            table.add_row(*r, key=f"row_{i}_{ts}")
-
-                    self.log_msg(f"imported {path}")
-
-                if looks_transposed:
-                    self.push_screen(views.TransposePromptScreen(), load_data)
-                else:
-                    load_data(False)
+            self._import_id = getattr(self, "_import_id", 0) + 1
+            import_id = self._import_id
+            self._set_import_progress(total=100, progress=0)
+            self.log_msg(f"importing {path}...")
+
+            def work(): # big files would freeze the ui, read them off thread
+                worker = get_current_worker()
 
-            except (IOError, OSError, csv.Error) as e:
-                self.log_msg(f"csv error: {e}")
+                def stale():
+                    return worker.is_cancelled or self._import_id != import_id
+
+                def progress(frac):
+                    if not stale():
+                        self.call_from_thread(self._set_import_progress, progress=frac * 100)
+                try:
+                    # seen this exact file before? map the parsed columns instead
+                    digest = csv_cache.quick_digest(path)
+                    cached = csv_cache.load(path, digest)
+                    if cached:
+                        if not stale():
+                            self.call_from_thread(self._import_cached, path, digest, *cached)
+                        return
+                    store = csv_importer.stream_csv(path, progress, stale)
+                except csv_importer.ImportCancelled:
+                    return
+                except (IOError, OSError, csv.Error, UnicodeDecodeError) as e:
+                    self.call_from_thread(self.log_msg, f"csv error: {e}")
+                    return
+                if not stale():
+                    self.call_from_thread(self._import_loaded, path, store, digest)
+
+            self.run_worker(work, thread=True, group="import", exclusive=True)
 
         self.push_screen(FileScreen(title="Import CSV file"), on_path)
 
+    def _import_cached(self, path, digest, data, transposed):
+        try:
+            table = self.screen.query_one("#editor_table", table_view.VirtualTable)
+        except Exception:  # editor was closed while reading
+            return
+        table.load(data)
+        self._last_import = (data.uid, {"op": "import", "path": path,
+                                        "digest": digest, "transposed": transposed})
+        self._set_import_progress(progress=100)
+        self.log_msg(f"imported {path} from cache ({len(data)} rows"
+                     f"{', transposed' if transposed else ''})")
+
+    def _import_loaded(self, path, store, digest):
+        if not len(store): return
+
+        def load_data(do_transpose): # transpose logic, rows become columns, columns become rows, easier said than done.
+            try:
+                table = self.screen.query_one("#editor_table", table_view.VirtualTable)
+            except Exception:  # editor was closed while reading
+                return
+            self.log_msg("tranposing!" if do_transpose else "loading standard csv")
+            data = store.to_table(do_transpose) # parsed once, whole columns
+            table.load(data)
+            self._last_import = (data.uid, {"op": "import", "path": path,
+                                            "digest": digest, "transposed": do_transpose})
+            self.log_msg(f"imported {path} ({len(store)} lines)")
+            # sidecar for the next import of the same file, written off thread from
+            # a copy, Save & Return writes edited cells into data's own arrays
+            frozen = data.copy()
+            self.run_worker(lambda: csv_cache.save(path, digest, frozen, do_transpose),
+                            thread=True, group="csv_cache")
+
+        if csv_importer.looks_transposed(store.first_row()):
+            self.push_screen(views.TransposePromptScreen(), load_data)
+        else:
+            load_data(False)
+
+    @on(Button.Pressed, "#btn_edit_import_many")
+    def edit_import_many(self):
+        """Several CSVs (a folder, a glob or paths split by ';'), parsed in parallel and merged."""
+        def on_path(text):
+            if not text:
+                return
+            paths = csv_importer.expand_paths(text)
+            if len(paths) < 2:
+                self.log_msg(f"import many needs two or more files, '{text}' matched {len(paths)}")
+                return
+            self.push_screen(views.MergePromptScreen(len(paths)), lambda how: how and start(paths, how))
+
+        def start(paths, how):
+            self._import_id = getattr(self, "_import_id", 0) + 1
+            import_id = self._import_id
+            self._set_import_progress(total=100, progress=0)
+            self.log_msg(f"importing {len(paths)} files ({how})...")
+
+            def work():
+                worker = get_current_worker()
+                digests, misses = {}, []
+
+                def stale():
+                    return worker.is_cancelled or self._import_id != import_id
+
+                def progress(frac):
+                    if not stale():
+                        self.call_from_thread(self._set_import_progress, progress=frac * 100)
+
+                def read(path, report, should_stop): # one file, on a pool thread
+                    digests[path] = csv_cache.quick_digest(path)
+                    cached = csv_cache.load(path, digests[path])
+                    if cached and not cached[1]: # files are combined as they are, never transposed
+                        report(1.0)
+                        return cached[0]
+                    data = csv_importer.stream_csv(path, report, should_stop).to_table()
+                    misses.append((path, digests[path], data))
+                    return data
+                try:
+                    tables = csv_importer.read_many(paths, progress, stale, read)
+                    data = merge.merge(tables, how, [merge.source_name(p) for p in paths])
+                except csv_importer.ImportCancelled:
+                    return
+                except merge.MergeError as e:
+                    self.call_from_thread(self.log_msg, f"merge error: {e}")
+                    return
+                except (IOError, OSError, csv.Error, UnicodeDecodeError) as e:
+                    self.call_from_thread(self.log_msg, f"csv error: {e}")
+                    return
+                if not stale():
+                    self.call_from_thread(self._import_merged, paths, [digests[p] for p in paths],
+                                          how, data, misses)
+
+            self.run_worker(work, thread=True, group="import", exclusive=True)
+
+        self.push_screen(FileScreen(title="Import CSV files (a folder, data/*.csv or a.csv; b.csv)"), on_path)
+
+    def _import_merged(self, paths, digests, how, data, misses):
+        try:
+            table = self.screen.query_one("#editor_table", table_view.VirtualTable)
+        except Exception:  # editor was closed while reading
+            return
+        table.load(data)
+        self._last_import = (data.uid, {"op": "import_many", "how": how,
+                                        "paths": paths, "digests": digests})
+        self._set_import_progress(progress=100)
+        self.log_msg(f"imported {len(paths)} files ({how}): {len(data)} rows, {data.n_series} series")
+        if misses: # sidecars for the files that were parsed, written off thread. concat/join
+            # build new arrays, edits to the merged table never reach these
+            self.run_worker(lambda: [csv_cache.save(p, d, t, False) for p, d, t in misses],
+                            thread=True, group="csv_cache")
+
+    def _set_import_progress(self, **kwargs):
+        try:
+            self.screen.query_one("#import_progress", ProgressBar).update(**kwargs)
+        except Exception:  # editor not on top anymore
+            pass
+
+    def action_cancel_import(self) -> None:
+        running = any(w.group == "import" and w.is_running for w in self.workers)
+        self.workers.cancel_group(self, "import")
+        self._import_id = getattr(self, "_import_id", 0) + 1
+        self._set_import_progress(total=100, progress=0)
+        if running:
+            self.log_msg("import cancelled")
+
     @on(Button.Pressed, "#btn_edit_export")
     def edit_export_csv(self):
         def on_path(path):
@@ -423,16 +759,11 @@ class GrafTUI(App):
             if not path.lower().endswith('.csv'):
                 path += ".csv"
             try:
-                table = self.screen.query_one("#editor_table", DataTable)
-                cols = list(table.columns.values())
-                headers = [c.label.plain for c in cols]
-                rows = [[table.get_cell(rk, c.key) for c in cols]
-                        for rk in table.rows]
-
+                table = self.screen.query_one("#editor_table", table_view.VirtualTable)
                 with open(path, 'w', newline='', encoding='utf-8') as f:
                     writer = csv.writer(f)
-                    writer.writerow(headers)
-                    writer.writerows(rows)
+                    writer.writerow(table.names)
+                    writer.writerows(table.iter_rows())
 
                 self.log_msg(f"Exported CSV: {path}")
                 self.notify(f"Saved to {path}")
@@ -444,14 +775,21 @@ class GrafTUI(App):
     @on(Button.Pressed, "#btn_edit_done")
     def edit_done(self):
         try:
-            table = self.screen.query_one("#editor_table", DataTable)
-            cols = list(table.columns.values())
-            rows = [[table.get_cell(rk, c.key) for c in cols]
-                    for rk in table.rows]
-            self.gen_data_state = {"columns": [c.label.plain for c in cols],
-                                   "rows": rows}
+            table = self.screen.query_one("#editor_table", table_view.VirtualTable)
+            changed = len(table.dirty)
+            replaced = table.base is not self.gen_data_state # cleared or imported in the editor
+            self._flush_draft()
+            # only the touched cells get parsed, the rest of the columns stay as they are
+            self.gen_data_state = table.commit()
+            if self._draft and self._draft["journaled"]: # the drafts count from here on
+                self.journal.append({"op": "commit"})
+            self._draft = None
+            self.gen_window = None
+            sim_controller.SimulationController.warm_pyramids(self)
+            if replaced: # snapshot a whole new table now rather than replay an import later
+                self.journal.compact(self._collect_state())
             self.pop_screen()
-            self.log_msg(f"Data Saved: {len(rows)} rows.")
+            self.log_msg(f"Data Saved: {len(self.gen_data_state)} rows, {changed} cells changed.")
         except Exception as e:
             self.log_msg(f"[red]Save Error: {e}[/red]")
     # tools 'n utilities
@@ -461,15 +799,14 @@ class GrafTUI(App):
     @on(Button.Pressed, "#btn_tool_ohm")
     def open_ohms_law(self):
         self.push_screen(tools_views.OhmsLawScreen())
-    @on(DataTable.CellSelected, "#editor_table")
-    def edit_table_cell(self, event: DataTable.CellSelected):
+    @on(table_view.VirtualTable.CellSelected, "#editor_table")
+    def edit_table_cell(self, event: table_view.VirtualTable.CellSelected):
+        if event.table.is_computed(event.col):
+            self.notify("Expression column, it is computed from the others.", severity="warning")
+            return
         def on_input(val):
             if val is not None:
-                try:
-                    self.screen.query_one("#editor_table", DataTable).update_cell_at(
-                        event.coordinate, val)
-                except (AttributeError, NameError):
-                    pass
+                event.table.set_cell(event.row, event.col, val)
         self.push_screen(views.InputScreen(str(event.value), "Edit Cell"), on_input)
 
     # simulating
@@ -479,7 +816,8 @@ class GrafTUI(App):
         lookup = {
             "circuit_rc": "controls_rc",
             "circuit_555": "controls_555",
-            "circuit_555_mono": "controls_555_mono"
+            "circuit_555_mono": "controls_555_mono",
+            "circuit_netlist": "controls_netlist"
         }
         if event.value in lookup:
             switcher.current = lookup[event.value]
@@ -495,10 +833,41 @@ class GrafTUI(App):
         elif active == "circuit_555_mono":
             msg = (sim_controller.SimulationController
                    .run_555_monostable(self))
-        self.query_one("#main_plot", PlotextPlot).refresh()
+        elif active == "circuit_netlist":
+            msg = sim_controller.SimulationController.run_netlist(self)
+        # results are logged by the worker when they land
+        if msg:
+            self.log_msg(msg)
+
+    @on(Button.Pressed, "#btn_net_load")
+    def load_netlist(self):
+        def on_path(path):
+            if not path or not os.path.isfile(path):
+                if path:
+                    self.log_msg(f"file not found: {path}")
+                return
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.query_one("#net_text", TextArea).text = f.read()
+                self.log_msg(f"loaded netlist {path}")
+            except (IOError, OSError, UnicodeDecodeError) as e:
+                self.log_msg(f"netlist error: {e}")
+        self.push_screen(FileScreen(title="Load netlist"), on_path)
+
+    @on(Button.Pressed, "#btn_mc_run")
+    def run_monte_carlo(self):
+        msg = sim_controller.SimulationController.run_monte_carlo(self)
         if msg:
             self.log_msg(msg)
 
+    def action_zoom_data(self, zoom: float = None) -> None:
+        sim_controller.SimulationController.zoom_general(self, zoom)
+        self.render_gen()
+
+    def action_pan_data(self, shift: float) -> None:
+        sim_controller.SimulationController.zoom_general(self, 1.0, shift)
+        self.render_gen()
+
     @on(Button.Pressed, "#btn_gen_render")
     def render_gen(self):
         msg = sim_controller.SimulationController.run_general_plot(self)
@@ -533,12 +902,18 @@ class GrafTUI(App):
         def do_export(path):
             if self.last_mode == "rc_square":
                 return exporter.export_square_wave(self.last_data, path)
+            if self.last_mode == "rc_ac":
+                return exporter.export_bode(self.last_data, path)
             if self.last_mode == "rc_step":
                 return exporter.export_rc_transient(self.last_data, path)
             if self.last_mode == "555_astable":
                 return exporter.export_555_astable(self.last_data, path)
             if self.last_mode == "555_mono":
                 return exporter.export_555_monostable(self.last_data, path)
+            if self.last_mode == "netlist":
+                return exporter.export_netlist(self.last_data, path)
+            if self.last_mode == "monte_carlo":
+                return exporter.export_monte_carlo(self.last_data, path)
             return "Mode not supported for export."
 
         self._prompt_export("Save electronics plot", do_export)
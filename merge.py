@@ -0,0 +1,111 @@
+import collections
+import itertools
+import os
+
+import numpy as np
+
+import data_model
+
+# combining several imported tables into one, e.g. a folder of daily exports.
+#   concat  same series in every file, rows stacked in file order. int and float
+#           columns widen to float, category lists are merged and the codes
+#           remapped, a column with no valid cell in a file fits any kind
+#   join    one row per label (first appearance order), series side by side.
+#           every file gets a dict label -> row once, then each output row is a
+#           single lookup, no nested loops. a label missing from a file leaves
+#           that file's cells empty. a label repeated within one file is a
+#           MergeError, picking one of its rows would drop the others unseen
+# imported tables have no formulas, so none are carried over.
+
+class MergeError(ValueError):
+    pass
+
+def source_name(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0]
+
+def _merged_kind(parts: list, name: str) -> str:
+    kinds = {k for k, _, ok in parts if ok.any()} or {"float"}
+    if kinds <= {"int", "float"}:
+        return "float" if "float" in kinds else "int"
+    if len(kinds) > 1:
+        raise MergeError(f"column '{name}' mixes {' and '.join(sorted(kinds))}")
+    return kinds.pop()
+
+def concat(tables: list, sources: list = None) -> data_model.ColumnarTable:
+    """Rows of every table one after the other, the series names have to match."""
+    sources = sources or [f"file {i + 1}" for i in range(len(tables))]
+    names = tables[0].names
+    for t, src in zip(tables[1:], sources[1:]):
+        if t.names[1:] != names[1:]:
+            raise MergeError(f"{src} has columns {t.names[1:]}, expected {names[1:]}")
+    columns, valid, kinds, categories = [], [], [], []
+    for j in range(len(names) - 1):
+        parts = [(t.kinds[j], t.columns[j], t.valid[j]) for t in tables]
+        kind = _merged_kind(parts, names[j + 1])
+        cats = None
+        if kind == "category":
+            lists = [t.categories[j] or [] for t in tables]
+            cats = list(dict.fromkeys(itertools.chain.from_iterable(lists)))
+            index = {c: i for i, c in enumerate(cats)}
+            chunks = []
+            for (k, col, ok), own in zip(parts, lists):
+                if k != "category" or not own: # nothing valid in this file
+                    chunks.append(np.zeros(len(col), dtype=np.int64))
+                    continue
+                remap = np.fromiter(map(index.__getitem__, own), dtype=np.int64, count=len(own))
+                chunks.append(np.where(ok, remap[col], 0))
+        else:
+            dtype = np.int64 if kind == "int" else np.float64
+            chunks = [np.where(ok, col, 0).astype(dtype, copy=False) if k in ("int", "float", kind)
+                      else np.zeros(len(col), dtype=dtype) for k, col, ok in parts]
+        columns.append(np.concatenate(chunks))
+        valid.append(np.concatenate([ok for _, _, ok in parts]))
+        kinds.append(kind)
+        categories.append(cats)
+    labels = np.concatenate([t.labels for t in tables])
+    return data_model.ColumnarTable(names, labels, columns, valid, kinds, categories)
+
+def _rows(labels, source: str) -> dict:
+    """label -> its row, labels have to be unique within the file."""
+    values = labels.tolist()
+    index = dict(zip(values, range(len(values))))
+    if len(index) < len(values):
+        dupes = [k for k, n in collections.Counter(values).items() if n > 1]
+        shown = ", ".join(repr(str(k)) for k in dupes[:5])
+        more = f" and {len(dupes) - 5} more" if len(dupes) > 5 else ""
+        raise MergeError(f"{source} repeats labels {shown}{more}, join needs one row per label "
+                         f"(use concat, or group by label in the data view)")
+    return index
+
+def join(tables: list, sources: list = None) -> data_model.ColumnarTable:
+    """Outer join on the label column, clashing series names get the file name added."""
+    sources = sources or [f"file {i + 1}" for i in range(len(tables))]
+    keys = list(dict.fromkeys(itertools.chain.from_iterable(t.labels.tolist() for t in tables)))
+    names, columns, valid, kinds, categories = [tables[0].names[0]], [], [], [], []
+    taken = set()
+    for t, src in zip(tables, sources):
+        index = _rows(t.labels, src)
+        rows = np.fromiter(map(index.get, keys, itertools.repeat(-1)), dtype=np.int64, count=len(keys))
+        found = rows >= 0
+        rows[~found] = 0
+        for j, name in enumerate(t.names[1:]):
+            if name in taken:
+                name = f"{name} ({src})"
+            taken.add(name)
+            names.append(name)
+            ok = found & t.valid[j][rows] if len(t) else found
+            col = t.columns[j][rows] if len(t) else np.zeros(len(keys), dtype=t.columns[j].dtype)
+            columns.append(np.where(ok, col, 0).astype(col.dtype, copy=False))
+            valid.append(ok)
+            kinds.append(t.kinds[j])
+            categories.append(t.categories[j])
+    return data_model.ColumnarTable(names, keys, columns, valid, kinds, categories)
+
+MODES = {"concat": concat, "join": join}
+
+def merge(tables: list, how: str, sources: list = None) -> data_model.ColumnarTable:
+    if how not in MODES:
+        raise MergeError(f"unknown merge '{how}'")
+    if not tables:
+        raise MergeError("nothing to merge")
+    return MODES[how](tables, sources)
@@ -0,0 +1,225 @@
+import math
+import re
+
+import numpy as np
+
+# small spice-like netlist + transient solver (modified nodal analysis)
+#
+#   * comment
+#   R1 in n1 1k          resistor
+#   C1 n1 0 10u          capacitor
+#   V1 in 0 DC 5         voltage source, also: STEP v [delay],
+#                        PULSE low high period [duty %], SIN offset amp freq
+#   I1 0 n1 DC 1m        current source (flows from first node to second, through the source)
+#   .tran 10u 50m        timestep, stop time (optional)
+#   .probe n1 n3         nodes to plot (optional)
+#
+# ground is 0 or gnd. suffixes are spice style: f p n u m k meg g (m = milli!)
+
+GROUND = ("0", "gnd")
+
+_SUFFIX = {"f": 1e-15, "p": 1e-12, "n": 1e-9, "u": 1e-6, "µ": 1e-6,
+           "m": 1e-3, "k": 1e3, "meg": 1e6, "g": 1e9}
+_VALUE = re.compile(r"^([-+]?(?:\d+\.?\d*|\.\d+)(?:e[-+]?\d+)?)(meg|[fpnuµmkg])?[a-zω]*$")
+
+def parse_value(text: str) -> float:
+    """'4.7k' -> 4700.0, '10u' -> 1e-05, trailing units like 'ohm' or 'F' are ignored."""
+    match = _VALUE.match(text.strip().lower())
+    if not match:
+        raise ValueError(f"bad value '{text}'")
+    number, suffix = match.groups()
+    return float(number) * _SUFFIX.get(suffix, 1.0)
+
+def _parse_source(fields: list) -> dict:
+    """Waveform part of a V/I line, plain number means DC."""
+    if not fields:
+        raise ValueError("source without a value")
+    kind = fields[0].upper()
+    args = [parse_value(f) for f in fields[1:]]
+    if kind == "DC":
+        return {"kind": "dc", "value": args[0]}
+    if kind == "STEP":
+        return {"kind": "step", "value": args[0], "delay": args[1] if len(args) > 1 else 0.0}
+    if kind == "PULSE":
+        if len(args) < 3:
+            raise ValueError("PULSE needs low high period")
+        return {"kind": "pulse", "low": args[0], "high": args[1], "period": args[2],
+                "duty": (args[3] if len(args) > 3 else 50.0) / 100.0}
+    if kind == "SIN":
+        if len(args) < 3:
+            raise ValueError("SIN needs offset amplitude freq")
+        return {"kind": "sin", "offset": args[0], "amp": args[1], "freq": args[2]}
+    return {"kind": "dc", "value": parse_value(fields[0])}
+
+def source_values(src: dict, t: np.ndarray) -> np.ndarray:
+    """Source waveform over a whole time array."""
+    if src["kind"] == "dc":
+        return np.full(len(t), src["value"])
+    if src["kind"] == "step":
+        return np.where(t >= src["delay"], src["value"], 0.0)
+    if src["kind"] == "pulse":
+        high = np.mod(t, src["period"]) < src["period"] * src["duty"]
+        return np.where(high, src["high"], src["low"])
+    return src["offset"] + src["amp"] * np.sin(2 * np.pi * src["freq"] * t)
+
+def parse_netlist(text: str) -> dict:
+    elements = []
+    nodes = {} # name -> index, ground excluded
+    tran = None
+    probes = []
+
+    def node(name):
+        name = name.lower()
+        if name in GROUND:
+            return -1
+        if name not in nodes:
+            nodes[name] = len(nodes)
+        return nodes[name]
+
+    for lineno, raw in enumerate(text.splitlines(), 1):
+        line = raw.split(";")[0].strip()
+        if not line or line.startswith("*"):
+            continue
+        fields = line.split()
+        head = fields[0].lower()
+        try:
+            if head == ".tran":
+                tran = (parse_value(fields[1]), parse_value(fields[2]))
+            elif head == ".probe":
+                probes.extend(f.lower() for f in fields[1:])
+            elif head == ".end":
+                break
+            elif head[0] in "rc":
+                value = parse_value(fields[3])
+                if value <= 0:
+                    raise ValueError("value must be positive")
+                elements.append({"type": head[0], "name": fields[0],
+                                 "a": node(fields[1]), "b": node(fields[2]), "value": value})
+            elif head[0] in "vi":
+                elements.append({"type": head[0], "name": fields[0],
+                                 "a": node(fields[1]), "b": node(fields[2]),
+                                 "source": _parse_source(fields[3:])})
+            else:
+                raise ValueError(f"unknown element '{fields[0]}'")
+        except IndexError:
+            raise ValueError(f"line {lineno}: missing fields") from None
+        except ValueError as e:
+            raise ValueError(f"line {lineno}: {e}") from None
+
+    if not nodes:
+        raise ValueError("netlist has no nodes")
+    for p in probes:
+        if p not in nodes:
+            raise ValueError(f"probe on unknown node '{p}'")
+    return {"elements": elements, "nodes": nodes, "tran": tran, "probes": probes}
+
+def rc_ladder_netlist(stages: int, r: float = 1e3, c_uf: float = 1.0,
+                      v_in: float = 5.0) -> str:
+    """N-stage RC ladder driven by a DC step, handy for big test networks."""
+    lines = [f"* {stages}-stage RC ladder", f"V1 n0 0 STEP {v_in:g}"]
+    for i in range(1, stages + 1):
+        lines.append(f"R{i} n{i - 1} n{i} {r:g}")
+        lines.append(f"C{i} n{i} 0 {c_uf:g}u")
+    probes = dict.fromkeys(f"n{i}" for i in (1, max(1, stages // 2), stages))
+    lines.append(".probe " + " ".join(probes))
+    return "\n".join(lines)
+
+def _auto_stop(net: dict) -> float:
+    """No .tran and no duration: a few periods of the slowest source, else settle time."""
+    periods = [1 / e["source"]["freq"] if e["source"]["kind"] == "sin" else e["source"]["period"]
+               for e in net["elements"]
+               if e["type"] in "vi" and e["source"]["kind"] in ("pulse", "sin")]
+    if periods:
+        return 3 * max(periods)
+    r_total = sum(e["value"] for e in net["elements"] if e["type"] == "r")
+    c_total = sum(e["value"] for e in net["elements"] if e["type"] == "c")
+    delay = max([e["source"].get("delay", 0.0) for e in net["elements"] if e["type"] in "vi"],
+                default=0.0)
+    # sum(R)*sum(C) overestimates the slowest time constant of a ladder, fine for a view
+    return delay + 5 * r_total * c_total if r_total * c_total > 0 else 1.0
+
+def simulate_transient(text: str, duration: float = 0.0, points: int = 2000,
+                       progress=None) -> dict:
+    """
+    Backward-Euler transient of a netlist. The MNA system matrix only depends on
+    the timestep, so it is assembled sparse and LU-factorized once, then every
+    step is a pair of triangular solves.
+    progress(done, total) is called every 1% of the steps and may raise to stop.
+    """
+    from scipy import sparse # lazy import, only this circuit needs scipy
+    from scipy.sparse.linalg import splu
+
+    net = parse_netlist(text)
+    n = len(net["nodes"])
+    vsrc = [e for e in net["elements"] if e["type"] == "v"]
+    isrc = [e for e in net["elements"] if e["type"] == "i"]
+    m = len(vsrc)
+
+    # 1. Timebase
+    if duration > 0:
+        stop = duration
+        steps = max(2, int(points))
+    elif net["tran"]:
+        step, stop = net["tran"]
+        steps = max(2, int(math.ceil(stop / step)) + 1)
+    else:
+        stop = _auto_stop(net)
+        steps = max(2, int(points))
+    t = np.linspace(0, stop, steps)
+    h = t[1] - t[0]
+
+    # 2. Stamps, collected as coordinate triplets then summed by scipy
+    def stamp(rows, cols, vals, a, b, g):
+        for i, j, v in ((a, a, g), (b, b, g), (a, b, -g), (b, a, -g)):
+            if i >= 0 and j >= 0:
+                rows.append(i); cols.append(j); vals.append(v)
+
+    g_r, g_c, g_v = [], [], []
+    c_r, c_c, c_v = [], [], []
+    for e in net["elements"]:
+        if e["type"] == "r":
+            stamp(g_r, g_c, g_v, e["a"], e["b"], 1.0 / e["value"])
+        elif e["type"] == "c":
+            stamp(c_r, c_c, c_v, e["a"], e["b"], e["value"])
+    for k, e in enumerate(vsrc):
+        for node, sign in ((e["a"], 1.0), (e["b"], -1.0)):
+            if node >= 0:
+                g_r += [node, n + k]; g_c += [n + k, node]; g_v += [sign, sign]
+
+    size = n + m
+    G = sparse.coo_matrix((g_v, (g_r, g_c)), shape=(size, size)).tocsc()
+    Cm = sparse.coo_matrix((c_v, (c_r, c_c)), shape=(size, size)).tocsc()
+    C_h = Cm / h
+
+    try:
+        lu = splu((G + C_h).tocsc())
+    except RuntimeError:
+        raise ValueError("singular circuit (floating node or source loop?)") from None
+
+    # 3. Source waveforms for every step at once
+    rhs_src = np.zeros((steps, size))
+    for k, e in enumerate(vsrc):
+        rhs_src[:, n + k] = source_values(e["source"], t)
+    for e in isrc:
+        vals = source_values(e["source"], t)
+        if e["a"] >= 0: rhs_src[:, e["a"]] -= vals
+        if e["b"] >= 0: rhs_src[:, e["b"]] += vals
+
+    # 4. Time stepping, caps start discharged
+    x = np.zeros((steps, size))
+    every = max(1, steps // 100)
+    for i in range(1, steps):
+        x[i] = lu.solve(C_h @ x[i - 1] + rhs_src[i])
+        if progress and i % every == 0:
+            progress(i, steps)
+
+    names = list(net["nodes"])
+    probes = net["probes"] or names[:8]
+    return {
+        "time": t,
+        "nodes": names,
+        "voltages": x[:, :n].T.copy(), # (nodes, time)
+        "probes": probes,
+        "elements": len(net["elements"]),
+        "step": h,
+    }
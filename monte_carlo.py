@@ -0,0 +1,134 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+import simulators
+
+# component tolerance / yield analysis. samples are drawn all at once,
+# then cut in batches that go through the simulators functions.
+# every batch draws its own samples from a child seed, so the same seed gives
+# the same runs with or without the pool and only the metrics get pickled.
+BATCH_SIZE = 50_000
+PARALLEL_MIN_RUNS = BATCH_SIZE # one batch is ~3 ms, below this the pool is pure overhead
+_pool = None # one process pool for the whole session, started on first use
+_pool_size = 0 # and rebuilt when a run asks for another worker count
+
+# what gets reported per circuit, first one is used for the yield
+METRICS = {
+    "circuit_rc": ["tau", "f_c"],
+    "circuit_555": ["freq", "duty"],
+    "circuit_555_mono": ["pulse_width"],
+}
+
+UNITS = {"tau": "s", "f_c": "Hz", "freq": "Hz", "duty": "%", "pulse_width": "s"}
+
+class Cancelled(Exception):
+    """Raised between batches when should_stop() says so."""
+
+def draw_samples(nominal: float, tol_pct: float, runs: int, rng) -> np.ndarray:
+    """
+    Component values inside their tolerance band. Gaussian with the band at 3 sigma,
+    clipped to the band (parts outside it would be rejected by the supplier).
+    """
+    tol = abs(tol_pct) / 100.0
+    if tol == 0:
+        return np.full(runs, float(nominal))
+    spread = rng.normal(0.0, tol / 3.0, runs)
+    return nominal * (1.0 + np.clip(spread, -tol, tol))
+
+def _draw_batch(nominal: dict, tolerances: dict, n: int, seed) -> dict:
+    rng = np.random.default_rng(seed)
+    return {name: draw_samples(float(value), tolerances.get(name, tolerances.get(name[0], 0.0)), n, rng)
+            for name, value in nominal.items()}
+
+def _run_batch(circuit: str, params: dict) -> dict:
+    """One batch of runs, module level so the process pool can pickle it."""
+    if circuit == "circuit_rc":
+        tau = params["r"] * params["c"] * 1e-6
+        return {"tau": tau, "f_c": 1.0 / (2 * np.pi * tau)}
+    if circuit == "circuit_555":
+        timing = simulators.astable_timing(params["r1"], params["r2"], params["c"])
+        return {"freq": timing["freq"], "duty": timing["duty"]}
+    if circuit == "circuit_555_mono":
+        return {"pulse_width": simulators.monostable_pulse_width(params["r"], params["c"])}
+    raise ValueError(f"no monte carlo model for {circuit}")
+
+def _draw_and_run(circuit: str, nominal: dict, tolerances: dict, n: int, seed) -> dict:
+    """One batch, samples drawn where it runs. Module level so the process pool can pickle it."""
+    return _run_batch(circuit, _draw_batch(nominal, tolerances, n, seed))
+
+def _executor(workers=None) -> ProcessPoolExecutor:
+    global _pool, _pool_size
+    size = workers or os.cpu_count() or 1
+    if _pool is not None and _pool_size != size:
+        _pool.shutdown(wait=False) # queued batches of the old size still finish
+        _pool = None
+    if _pool is None:
+        _pool, _pool_size = ProcessPoolExecutor(max_workers=size), size
+    return _pool
+
+def run_tolerance_analysis(circuit: str, nominal: dict, tolerances: dict, runs: int,
+                           spec_pct: float = 10.0, seed=None, workers=None,
+                           progress=None, should_stop=None) -> dict:
+    """
+    nominal: component values, e.g. {"r": 1000, "c": 100} (ohms / µF)
+    tolerances: percent band per component, key "r" covers r1/r2 too.
+    A run passes when its first metric is within ±spec_pct of the nominal design.
+    progress(done_runs, runs) is called after every batch, should_stop() is
+    checked between batches and raises Cancelled.
+    """
+    if circuit not in METRICS:
+        raise ValueError(f"no monte carlo model for {circuit}")
+    runs = int(runs)
+    if runs < 1:
+        raise ValueError("runs must be at least 1")
+
+    sizes = [min(BATCH_SIZE, runs - i) for i in range(0, runs, BATCH_SIZE)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    nominal = {k: float(v) for k, v in nominal.items()}
+
+    parts = [None] * len(sizes)
+    done = 0
+
+    def finished(i, part):
+        nonlocal done
+        parts[i] = part
+        done += sizes[i]
+        if progress:
+            progress(done, runs)
+        if should_stop and should_stop():
+            raise Cancelled()
+
+    if runs > PARALLEL_MIN_RUNS and (workers or os.cpu_count() or 1) > 1:
+        pool = _executor(workers)
+        futures = {pool.submit(_draw_and_run, circuit, nominal, tolerances, n, s): i
+                   for i, (n, s) in enumerate(zip(sizes, seeds))}
+        try:
+            for fut in as_completed(futures):
+                finished(futures[fut], fut.result())
+        finally: # cancelled or failed, drop what has not started, the pool stays
+            for fut in futures:
+                fut.cancel()
+    else:
+        for i, (n, s) in enumerate(zip(sizes, seeds)):
+            finished(i, _draw_and_run(circuit, nominal, tolerances, n, s))
+
+    metrics = {m: np.concatenate([p[m] for p in parts]) for m in METRICS[circuit]}
+    reference = _run_batch(circuit, {k: np.array([v]) for k, v in nominal.items()})
+    nominal_metrics = {m: float(reference[m][0]) for m in metrics}
+
+    primary = METRICS[circuit][0]
+    target = nominal_metrics[primary]
+    window = abs(target) * spec_pct / 100.0
+    passed = np.abs(metrics[primary] - target) <= window
+
+    return {
+        "circuit": circuit,
+        "runs": runs,
+        "metrics": metrics,
+        "nominal": nominal_metrics,
+        "primary": primary,
+        "spec_pct": spec_pct,
+        "yield": float(passed.mean()) * 100,
+    }
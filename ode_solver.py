@@ -0,0 +1,175 @@
+import math
+
+import numpy as np
+
+# adaptive step integrator shared by the time-domain sims.
+#
+# Rosenbrock 2(3) pair (the ode23s scheme, Shampine & Reichelt 1997): an embedded,
+# linearly implicit Runge-Kutta method. It is L-stable, so when tau is much smaller
+# than the period the step grows through the flat parts instead of being capped
+# at ~tau like an explicit pair would be, and the error estimate shrinks it again
+# around edges.
+#
+# breakpoints: times where the right-hand side jumps (square edges, trigger pins).
+#   The integrator lands exactly on them and never steps across. A breakpoint can
+#   be (t, handler), handler(t, y) returns a new state or None.
+# events: state crossings (comparator thresholds), Event(g, handler, direction).
+#   The crossing is located on the dense output and handled like a breakpoint.
+
+_D = 1.0 / (2.0 + math.sqrt(2.0))
+_E32 = 6.0 + math.sqrt(2.0)
+
+class Event:
+    """Fires when g(t, y) crosses zero in `direction` (+1 up, -1 down, 0 both)."""
+
+    def __init__(self, g, handler=None, direction: int = 0, terminal: bool = False):
+        self.g = g
+        self.handler = handler
+        self.direction = direction
+        self.terminal = terminal
+
+    def crossed(self, g0: float, g1: float) -> bool:
+        if self.direction >= 0 and g0 < 0 <= g1:
+            return True
+        return self.direction <= 0 and g0 > 0 >= g1
+
+def _jacobian(f, t, y, f0):
+    """Forward-difference Jacobian, the systems here are a handful of states."""
+    n = len(y)
+    jac = np.empty((n, n))
+    for j in range(n):
+        delta = math.sqrt(np.finfo(float).eps) * max(1.0, abs(y[j]))
+        yj = y.copy()
+        yj[j] += delta
+        jac[:, j] = (f(t, yj) - f0) / delta
+    return jac
+
+def integrate(f, t0: float, t1: float, y0, rtol: float = 1e-5, atol: float = 1e-7,
+              breakpoints=(), events=(), max_step: float = math.inf,
+              first_step: float = None, progress=None):
+    """
+    Integrates y' = f(t, y) from t0 to t1. Returns (t, y) with y shaped (len(t), n).
+    Points where a handler changed the state are recorded twice (before/after),
+    so jumps stay vertical when plotted.
+    progress(done, total) gets the integrated part of [t0, t1] in steps of 1%
+    (total 100), it may raise to stop the run.
+    """
+    y = np.atleast_1d(np.asarray(y0, dtype=np.float64)).copy()
+    n = len(y)
+    eye = np.eye(n)
+    span = t1 - t0
+    if span <= 0:
+        raise ValueError("t1 must be after t0")
+    max_step = min(max_step, span)
+
+    stops = sorted(((bp if isinstance(bp, tuple) else (bp, None)) for bp in breakpoints),
+                   key=lambda bp: bp[0])
+    stops = [(tb, h) for tb, h in stops if t0 <= tb <= t1]
+    stop_i = 0
+
+    ts = [t0]
+    ys = [y.copy()]
+
+    def apply(handler, t, state):
+        new = handler(t, state.copy()) if handler else None
+        if new is None:
+            return state, False
+        new = np.atleast_1d(np.asarray(new, dtype=np.float64))
+        ts.append(t); ys.append(new.copy())
+        return new, True
+
+    # breakpoints sitting on t0 act before the first step
+    while stop_i < len(stops) and stops[stop_i][0] <= t0:
+        y, _ = apply(stops[stop_i][1], t0, y)
+        stop_i += 1
+
+    t = t0
+    h = first_step or span * 1e-4
+    f0 = f(t, y)
+    g_prev = [ev.g(t, y) for ev in events]
+    reported = 0
+
+    while t < t1:
+        if progress is not None and (t - t0) * 100 >= (reported + 1) * span:
+            reported = int((t - t0) * 100 // span)
+            progress(reported, 100)
+        next_stop = stops[stop_i][0] if stop_i < len(stops) else t1
+        h = min(h, max_step, next_stop - t)
+        hit_stop = h >= next_stop - t - 1e-12 * max(1.0, abs(next_stop))
+        if hit_stop:
+            h = next_stop - t
+
+        # one Rosenbrock step
+        jac = _jacobian(f, t, y, f0)
+        w = eye - h * _D * jac
+        k1 = np.linalg.solve(w, f0)
+        f1 = f(t + 0.5 * h, y + 0.5 * h * k1)
+        k2 = np.linalg.solve(w, f1 - k1) + k1
+        y_new = y + h * k2
+        f2 = f(t + h, y_new)
+        k3 = np.linalg.solve(w, f2 - _E32 * (k2 - f1) - 2.0 * (k1 - f0))
+        err_vec = h / 6.0 * (k1 - 2.0 * k2 + k3)
+        scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+        err = float(np.max(np.abs(err_vec) / scale))
+
+        if err > 1.0 and h > 1e-14 * max(1.0, abs(t)):
+            h *= max(0.2, 0.8 * err ** (-1.0 / 3.0))
+            continue
+
+        # dense output y(t + s*h), used to pin down event crossings
+        def dense(s, y=y, k1=k1, k2=k2, h=h):
+            return y + h * (s * (1 - s) / (1 - 2 * _D) * k1
+                            + s * (s - 2 * _D) / (1 - 2 * _D) * k2)
+
+        fired = None
+        g_new = [ev.g(t + h, y_new) for ev in events]
+        for i, ev in enumerate(events):
+            if ev.crossed(g_prev[i], g_new[i]):
+                # illinois false position on s in [0, 1]
+                lo, hi, g_lo, g_hi = 0.0, 1.0, g_prev[i], g_new[i]
+                side = 0
+                for _ in range(60):
+                    s = hi - g_hi * (hi - lo) / (g_hi - g_lo) if g_hi != g_lo else 0.5 * (lo + hi)
+                    g_s = ev.g(t + s * h, dense(s))
+                    if (g_s > 0) == (g_hi > 0):
+                        hi, g_hi = s, g_s
+                        if side == 1: g_lo *= 0.5
+                        side = 1
+                    else:
+                        lo, g_lo = s, g_s
+                        if side == -1: g_hi *= 0.5
+                        side = -1
+                    if hi - lo < 1e-12 or g_s == 0:
+                        break
+                if fired is None or hi < fired[0]:
+                    fired = (hi, ev)
+
+        if fired is not None:
+            s, ev = fired
+            t = t + s * h
+            y = dense(s)
+            ts.append(t); ys.append(y.copy())
+            y, _ = apply(ev.handler, t, y)
+            if ev.terminal:
+                break
+        else:
+            t = t + h
+            y = y_new
+            ts.append(t); ys.append(y.copy())
+            if hit_stop:
+                t = next_stop # no float drift on the breakpoint itself
+                ts[-1] = t
+                while stop_i < len(stops) and stops[stop_i][0] <= t:
+                    y, _ = apply(stops[stop_i][1], t, y)
+                    stop_i += 1
+
+        f0 = f(t, y)
+        g_prev = [ev.g(t, y) for ev in events]
+        # step size for next round, err 0 means the state did not move at all
+        growth = 5.0 if err == 0 else min(5.0, max(0.2, 0.8 * err ** (-1.0 / 3.0)))
+        h = h * growth
+        if fired is not None or hit_stop:
+            # restart small after a discontinuity, error control grows it back
+            h = max(h * 0.1, span * 1e-9)
+
+    return np.array(ts), np.array(ys).reshape(-1, n)
@@ -0,0 +1,58 @@
+import math
+
+import numpy as np
+
+# min/max pyramid over a column for zoom and pan in the data view. level k
+# holds the min and max of every block of 2**k samples, each level is built
+# from the one below in a single vectorized pass, all levels together are as
+# big as the column itself. a query picks the level whose blocks are about a
+# screen column wide, so any range costs the same: a slice of ~n_points.
+
+class MinMaxPyramid:
+    __slots__ = ("base", "levels")
+
+    def __init__(self, values):
+        self.base = np.asarray(values, dtype=np.float64)
+        self.levels = [] # levels[k - 1] = (mins, maxs) over blocks of 2**k
+        lo = hi = self.base
+        while len(lo) > 1:
+            if len(lo) % 2: # odd, repeat the last block, min/max stay the same
+                lo, hi = np.append(lo, lo[-1]), np.append(hi, hi[-1])
+            lo = np.fmin(lo[0::2], lo[1::2]) # fmin/fmax skip NaN
+            hi = np.fmax(hi[0::2], hi[1::2])
+            self.levels.append((lo, hi))
+
+    def __len__(self):
+        return len(self.base)
+
+    def query(self, start: float, stop: float, n_points: int) -> tuple:
+        """
+        (x, y) for samples [start, stop) in at most about n_points points:
+        the raw samples when they fit, otherwise the min and max of every
+        block at the level with the fewest blocks that still cover a column each.
+        """
+        start = max(0, int(start))
+        stop = min(len(self.base), int(math.ceil(stop)))
+        span = stop - start
+        if span <= 0:
+            return np.empty(0), np.empty(0)
+        if span <= n_points or not self.levels:
+            return np.arange(start, stop, dtype=np.float64), self.base[start:stop]
+        k = min(len(self.levels), math.ceil(math.log2(span / max(1, n_points // 2))))
+        lo, hi = self.levels[k - 1]
+        size = 1 << k
+        first, last = start >> k, ((stop - 1) >> k) + 1
+        centers = np.clip(np.arange(first, last) * size + (size - 1) / 2, start, stop - 1)
+        return np.repeat(centers, 2), np.column_stack([lo[first:last], hi[first:last]]).ravel()
+
+def window(length: int, current, zoom: float = 1.0, shift: float = 0.0) -> tuple:
+    """
+    New (start, stop) view of a series of length samples: zoom < 1 zooms in
+    around the middle, shift moves by that fraction of the visible span.
+    current None is the whole series. Never smaller than 8 samples.
+    """
+    start, stop = current if current else (0.0, float(length))
+    span = min(float(length), max(8.0, (stop - start) * zoom))
+    mid = (start + stop) / 2 + (stop - start) * shift
+    start = min(max(0.0, mid - span / 2), max(0.0, length - span))
+    return start, start + span
@@ -0,0 +1,118 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# bounded LRU for simulation results, sized by the arrays it holds.
+# keys are plain tuples of the normalized inputs, see SimulationController._key
+
+def _nbytes(value) -> int:
+    """Rough memory footprint, only counts what matters (arrays and containers)."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(_nbytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_nbytes(v) for v in value)
+    slots = getattr(type(value), "__slots__", None)
+    if slots:
+        return sum(_nbytes(getattr(value, s, None)) for s in slots)
+    return 64
+
+class SimCache:
+    def __init__(self, max_entries: int = 32, max_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._items = OrderedDict() # key -> (value, size)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock() # sims run in worker threads
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value):
+        size = _nbytes(value)
+        with self._lock:
+            if key in self._items:
+                self.total_bytes -= self._items.pop(key)[1]
+            if size > self.max_bytes: # would flush everything else, don't keep it
+                return value
+            self._items[key] = (value, size)
+            self.total_bytes += size
+            # evict least recently used until both limits hold
+            while len(self._items) > self.max_entries or self.total_bytes > self.max_bytes:
+                _, (_, old_size) = self._items.popitem(last=False)
+                self.total_bytes -= old_size
+        return value
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return item[0]
+            self.misses += 1
+        # compute outside the lock, other threads can keep reading
+        return self.put(key, compute())
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.total_bytes = 0
+
+    def summary(self) -> str:
+        return (f"cache {self.hits} hit / {self.misses} miss, "
+                f"{len(self._items)} entries, {self.total_bytes / 1e6:.1f} MB")
+
+CACHE = SimCache() # shared by the controller and the exporter
+# data view derivatives (pie clouds, groups, histograms...), kept apart so they
+# never evict a simulation and don't show up in its hit/miss counts
+DATA_CACHE = SimCache(max_entries=64)
+
+class PyramidCache:
+    """
+    Zoom pyramids of the table on screen, one per column and never evicted by
+    count or size, a data view redraw must not rebuild them. A new version of
+    a column replaces its pyramid, another table drops all of them.
+    """
+
+    def __init__(self):
+        self._items = {} # (table uid, column) -> (version, pyramid)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get_or_build(self, uid, col: int, version, build):
+        with self._lock:
+            item = self._items.get((uid, col))
+        if item is not None and item[0] == version:
+            return item[1]
+        value = build() # outside the lock, like get_or_compute
+        with self._lock:
+            if any(key[0] != uid for key in self._items):
+                self._items = {key: v for key, v in self._items.items() if key[0] == uid}
+            self._items[(uid, col)] = (version, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+PYRAMIDS = PyramidCache()
@@ -1,20 +1,161 @@
 import math
-import random
 
-from textual.widgets import Input, Select, Static
+import numpy as np
+from rich.markup import escape
+from textual.widgets import Input, ProgressBar, Select, Static, TextArea
+from textual.worker import get_current_worker
 from textual_plotext import PlotextPlot
 
+import aggregate
+import decimate
+import mna_solver
+import monte_carlo
+import pyramid
+import sim_cache
 import simulators
 import statistics_engine
 #tau = R * C
 #0.693 = time to half voltage / (r times c)
 class SimulationController: # handles logic
+    MAX_CURVES = 8 # plotext gets unreadable past this
+    MAX_SLICES = decimate.PIE_SLICES # the exporter keeps the same slices
+    CACHE = sim_cache.CACHE
+    DATA_CACHE = sim_cache.DATA_CACHE
+    PYRAMIDS = sim_cache.PYRAMIDS
+
+    @staticmethod
+    def _key(mode: str, *params) -> tuple:
+        """Normalized cache key, arrays/lists become tuples of plain floats."""
+        norm = [mode]
+        for p in params:
+            if isinstance(p, np.ndarray):
+                p = tuple(p.ravel().tolist())
+            elif isinstance(p, (list, tuple)):
+                p = tuple(SimulationController._key("", *p)[1:])
+            elif isinstance(p, (int, float, np.floating)) and not isinstance(p, bool):
+                p = float(p)
+            norm.append(p)
+        return tuple(norm)
+
+    @staticmethod
+    def _cached(mode: str, params: tuple, compute):
+        key = SimulationController._key(mode, *params)
+        return SimulationController.CACHE.get_or_compute(key, compute)
+
+    @staticmethod
+    def _data_cached(mode: str, params: tuple, compute):
+        """Same as _cached for data view results, they live in DATA_CACHE."""
+        key = SimulationController._key(mode, *params)
+        return SimulationController.DATA_CACHE.get_or_compute(key, compute)
+
+    @staticmethod
+    def _parse_values(raw: str) -> np.ndarray:
+        """
+        Parses '1000, 4700' style lists, tokens can also be ranges:
+        start:stop[:lin|log[:count]] e.g. 100:100000:log:500
+        """
+        parts = []
+        for token in raw.split(','):
+            token = token.strip()
+            if not token:
+                continue
+            if ':' not in token:
+                parts.append(np.array([float(token)]))
+                continue
+            fields = [f.strip() for f in token.split(':')]
+            if len(fields) < 2 or len(fields) > 4:
+                raise ValueError(f"bad range '{token}'")
+            start, stop = float(fields[0]), float(fields[1])
+            spacing = fields[2].lower() if len(fields) > 2 and fields[2] else "lin"
+            count = int(fields[3]) if len(fields) > 3 else 10
+            if count < 1:
+                raise ValueError(f"bad count in '{token}'")
+            if spacing == "log":
+                if start <= 0 or stop <= 0:
+                    raise ValueError("log range needs positive values")
+                parts.append(np.geomspace(start, stop, count))
+            elif spacing == "lin":
+                parts.append(np.linspace(start, stop, count))
+            else:
+                raise ValueError(f"unknown spacing '{spacing}'")
+        if not parts:
+            return np.empty(0)
+        return np.concatenate(parts)
+
     @staticmethod
     def _get_graph_theme(app_theme_name: str) -> str:
         if app_theme_name == "matrix":
             return "matrix"
         return "pro"
 
+    @staticmethod
+    def astable_samples(data: dict, points: int):
+        """sample_555_astable through the cache, plot and export share it."""
+        return SimulationController._cached(
+            "555_astable_samples",
+            (data["period"], data["t_high"], data["duration"], points),
+            lambda: simulators.sample_555_astable(data, points))
+
+    @staticmethod
+    def _solver(app) -> str:
+        try:
+            return app.query_one("#sim_solver", Select).value or "exact"
+        except (AttributeError, NameError):
+            return "exact"
+
+    @staticmethod
+    def _plot_points(widget) -> int:
+        """Samples worth generating for a widget, same budget as the market chart."""
+        return decimate.screen_points(widget)
+
+    @staticmethod
+    def _plot(plt, x, y, points: int, scatter: bool = False, **kwargs):
+        """
+        plt.plot / plt.scatter at screen resolution. Lines keep the min and max
+        of every bucket so spikes survive, scatter plots go through LTTB.
+        """
+        x, y = decimate.decimate(x, y, points, "lttb" if scatter else "minmax")
+        (plt.scatter if scatter else plt.plot)(x, y, **kwargs)
+
+    @staticmethod
+    def pyramid(table, j: int):
+        """Zoom pyramid of series j, cached until the column is edited."""
+        return SimulationController.PYRAMIDS.get_or_build(
+            table.uid, j, table.versions[j], lambda: pyramid.MinMaxPyramid(table.series(j)))
+
+    @staticmethod
+    def grouped(table, how: str) -> tuple:
+        """(group labels, one aggregated array per int/float series), grouped by the label column."""
+        groups = SimulationController._data_cached(
+            "groups", (table.uid, table.label_version), lambda: aggregate.Groups(table.labels))
+        series = [SimulationController._data_cached(
+                      "aggregate", (table.uid, table.label_version, j, table.versions[j], how),
+                      lambda j=j: np.nan_to_num(groups.aggregate(table.series(j), table.valid[j], how)))
+                  for j in table.numeric_series()] # category codes and dates don't add up
+        return list(groups.keys), series
+
+    @staticmethod
+    def warm_pyramids(app):
+        """Builds the pyramids of a freshly loaded table off the ui thread."""
+        table = app.gen_data_state
+
+        def build(): # the plotted series only, dates and categories never get one
+            for j in table.numeric_series():
+                SimulationController.pyramid(table, j)
+        app.run_worker(build, thread=True, group="pyramid", exclusive=True)
+
+    @staticmethod
+    def zoom_general(app, zoom: float = 1.0, shift: float = 0.0):
+        """Moves the data view window, zoom None shows everything again."""
+        if zoom is None:
+            app.gen_window = None
+        else:
+            app.gen_window = pyramid.window(len(app.gen_data_state), app.gen_window, zoom, shift)
+
+    @staticmethod
+    def _main_points(app) -> int:
+        return SimulationController._plot_points(app.query_one("#main_plot", PlotextPlot))
+
     @staticmethod
     def _prepare_plot(app, title: str):
         widget = app.query_one("#main_plot", PlotextPlot)
@@ -32,6 +173,82 @@ class SimulationController: # handles logic
 
         return plt, line_col
 
+    # threading, same idea as the market fetch: inputs are read here on the ui
+    # thread, compute() runs in a worker, only render() goes back through
+    # call_from_thread. a new RUN supersedes the old one (exclusive group + run id),
+    # a late result from a superseded run is dropped.
+    @staticmethod
+    def _dispatch(app, label: str, compute, render, show_cache: bool = True,
+                  progress_total=None):
+        app._sim_run_id = getattr(app, "_sim_run_id", 0) + 1
+        run_id = app._sim_run_id
+        SimulationController._set_progress(app, total=progress_total, progress=0)
+
+        def work():
+            worker = get_current_worker()
+
+            def stale():
+                return worker.is_cancelled or getattr(app, "_sim_run_id", 0) != run_id
+
+            try:
+                result = compute(stale)
+            except monte_carlo.Cancelled:
+                return
+            except Exception as e: # anything the sim raises ends up in the log
+                app.call_from_thread(SimulationController._finish, app, run_id,
+                                     None, f"{label} error: {e}", show_cache)
+                return
+            if not stale():
+                app.call_from_thread(SimulationController._finish, app, run_id,
+                                     render, result, show_cache)
+
+        app.run_worker(work, thread=True, group="sim", exclusive=True)
+        return f"{label}: running..."
+
+    @staticmethod
+    def _progress(app, stale):
+        """progress(done, total) for the solvers, stops the run with Cancelled once it is stale."""
+        def report(done, total):
+            if stale():
+                raise monte_carlo.Cancelled()
+            app.call_from_thread(SimulationController._set_progress, app, total=total, progress=done)
+        return report
+
+    @staticmethod
+    def _finish(app, run_id, render, result, show_cache):
+        if getattr(app, "_sim_run_id", 0) != run_id:
+            return # superseded while waiting for the ui thread
+        if render is None:
+            msg = result
+        else:
+            try:
+                msg = render(result)
+            except (ValueError, KeyError, AttributeError, IndexError) as e:
+                msg = f"Error: {e}"
+        app.query_one("#main_plot", PlotextPlot).refresh()
+        SimulationController._set_progress(app, total=1, progress=1)
+        if msg:
+            if show_cache:
+                # the log takes markup, unescaped "[cache ...]" would read as a tag and vanish
+                msg = f"{msg} {escape(f'[{SimulationController.CACHE.summary()}]')}"
+            app.log_msg(msg)
+
+    @staticmethod
+    def cancel(app) -> bool:
+        """Cancels the running sim, returns False when nothing was running."""
+        running = any(w.group == "sim" and w.is_running for w in app.workers)
+        app.workers.cancel_group(app, "sim")
+        app._sim_run_id = getattr(app, "_sim_run_id", 0) + 1 # drop late results
+        SimulationController._set_progress(app, total=1, progress=0)
+        return running
+
+    @staticmethod
+    def _set_progress(app, **kwargs):
+        try:
+            app.query_one("#sim_progress", ProgressBar).update(**kwargs)
+        except Exception: # sim view not mounted (another screen on top)
+            pass
+
     @staticmethod
     def _update_elec_stats(app, data, mode):
         text = statistics_engine.StatsEngine.analyze_simulation(data, mode)
@@ -53,35 +270,97 @@ class SimulationController: # handles logic
 
             if mode == "step":
                 raw = app.query_one("#rc_res", Input).value
-                res = [float(x) for x in raw.split(',') if x.strip()]
-                if not res:
+                res = SimulationController._parse_values(raw)
+                if res.size == 0:
                     return "No resistors." # early exit
-                data = simulators.calculate_rc_transient(v_in, c_uf, res, dur)
-                plt, _ = SimulationController._prepare_plot(app, "RC Step Response")
-                for c in data["curves"]:
-                    plt.plot(data["time"], c["voltage"], label=f"R={c['R']}Ω")
-                app.last_data = data
-                app.last_mode = "rc_step"
-
-                # Stats
-                SimulationController._update_elec_stats(app, data, "rc_step")
 
-                return f"RC Step: {len(res)} curves."
+                def compute(stale):
+                    return SimulationController._cached(
+                        "rc_step", (v_in, c_uf, res, dur),
+                        lambda: simulators.calculate_rc_sweep(
+                            v_in, c_uf, res, dur,
+                            progress=SimulationController._progress(app, stale)))
+
+                def render(data):
+                    title = "RC Step Response"
+                    if len(data) > SimulationController.MAX_CURVES:
+                        title += f" ({SimulationController.MAX_CURVES} of {len(data)} curves)"
+                    plt, _ = SimulationController._prepare_plot(app, title)
+                    points = SimulationController._main_points(app)
+                    for i in data.pick(SimulationController.MAX_CURVES):
+                        SimulationController._plot(plt, data.time, data.voltage[i], points,
+                                                   label=data.label(i))
+                    app.last_data = data
+                    app.last_mode = "rc_step"
+
+                    # Stats
+                    SimulationController._update_elec_stats(app, data, "rc_step")
+
+                    return f"RC Step: {len(data)} curves."
+                return SimulationController._dispatch(app, "RC Step", compute, render)
             elif mode == "square":
                 freq = float(app.query_one("#rc_freq", Input).value)
-                res = float(app.query_one("#rc_res", Input).value.split(',')[0])
-                data = simulators.calculate_square_wave_response(v_in, c_uf, res, freq)
-                data['freq'] = freq
-                plt, col = SimulationController._prepare_plot(app, f"RC Filter ({freq}Hz)")
-                plt.plot(data["time"], data["input_wave"], label="In", color="green")
-                plt.plot(data["time"], data["output_wave"], label="Out", color=col)
-                app.last_data = data
-                app.last_mode = "rc_square"
-
-                # Stats
-                SimulationController._update_elec_stats(app, data, "rc_square")
-
-                return f"RC Square: Tau={data['tau']:.4f}s"
+                res = float(SimulationController._parse_values(
+                    app.query_one("#rc_res", Input).value)[0])
+                method = SimulationController._solver(app)
+
+                def compute(stale):
+                    return SimulationController._cached(
+                        "rc_square", (v_in, c_uf, res, freq, method),
+                        lambda: simulators.calculate_square_wave_response(
+                            v_in, c_uf, res, freq, method=method,
+                            progress=SimulationController._progress(app, stale)))
+
+                def render(data):
+                    data = dict(data, freq=freq) # copy, data is the shared cache entry
+                    plt, col = SimulationController._prepare_plot(app, f"RC Filter ({freq}Hz)")
+                    points = SimulationController._main_points(app)
+                    SimulationController._plot(plt, data["time"], data["input_wave"], points,
+                                               label="In", color="green")
+                    SimulationController._plot(plt, data["time"], data["output_wave"], points,
+                                               label="Out", color=col)
+                    app.last_data = data
+                    app.last_mode = "rc_square"
+
+                    # Stats
+                    SimulationController._update_elec_stats(app, data, "rc_square")
+
+                    return f"RC Square: Tau={data['tau']:.4f}s ({len(data['time'])} samples)"
+                return SimulationController._dispatch(app, "RC Square", compute, render)
+            elif mode == "ac":
+                res = float(SimulationController._parse_values(
+                    app.query_one("#rc_res", Input).value)[0])
+                f_start = float(app.query_one("#ac_fstart", Input).value or 0)
+                f_stop = float(app.query_one("#ac_fstop", Input).value or 0)
+                points = int(app.query_one("#ac_points", Input).value or 1000)
+                widget = app.query_one("#main_plot", PlotextPlot)
+                plot_points = SimulationController._plot_points(widget)
+
+                def compute(stale):
+                    return SimulationController._cached(
+                        "rc_ac", (c_uf, res, f_start, f_stop, points),
+                        lambda: simulators.calculate_rc_ac_sweep(
+                            c_uf, res, f_start, f_stop, points))
+
+                def render(data):
+                    plt, col = SimulationController._prepare_plot(
+                        app, f"RC Bode (fc={data['f_c']:.4g}Hz)")
+                    # log axis by hand, plotext's xscale("log") breaks on re-render
+                    log_f = np.log10(data["freq"])
+                    SimulationController._plot(plt, log_f, data["magnitude_db"], plot_points,
+                                               label="|H| dB", color=col)
+                    SimulationController._plot(plt, log_f, data["phase_deg"], plot_points,
+                                               label="Phase °", color="cyan", yside="right")
+                    decades = np.arange(math.ceil(log_f[0]), math.floor(log_f[-1]) + 1)
+                    plt.xticks(decades.tolist(), [f"{10.0 ** d:g}" for d in decades])
+                    plt.xlabel("Frequency (Hz)")
+                    app.last_data = data
+                    app.last_mode = "rc_ac"
+
+                    SimulationController._update_elec_stats(app, data, "rc_ac")
+
+                    return f"RC AC sweep: {len(data['freq'])} points, fc={data['f_c']:.4g}Hz"
+                return SimulationController._dispatch(app, "RC AC sweep", compute, render)
         except Exception as e: return f"Error: {e}"
 
     @staticmethod
@@ -94,18 +373,29 @@ class SimulationController: # handles logic
                 dur = float(app.query_one("#sim_duration", Input).value)
             except (ValueError, AttributeError):
                 dur = 0.0
-            data = simulators.calculate_555_astable(r1, r2, c, dur)
+            widget = app.query_one("#main_plot", PlotextPlot)
+            points = SimulationController._plot_points(widget)
+        except (ValueError, KeyError, AttributeError) as e:
+            return f"Error: {e}"
+
+        def compute(stale):
+            data = SimulationController._cached(
+                "555_astable", (r1, r2, c, dur),
+                lambda: simulators.calculate_555_astable(r1, r2, c, dur))
+            return data, SimulationController.astable_samples(data, points)
+
+        def render(result):
+            data, (time, voltage) = result
             plt, col = SimulationController._prepare_plot(
                 app, f"555 Astable (Freq={data['freq']:.1f}Hz)")
-            plt.plot(data["time"], data["voltage"], label="Output", color=col)
+            SimulationController._plot(plt, time, voltage, points, label="Output", color=col)
             app.last_data = data
             app.last_mode = "555_astable"
 
             SimulationController._update_elec_stats(app, data, "555_astable")
 
             return f"Freq={data['freq']:.2f}Hz"
-        except (ValueError, KeyError, AttributeError) as e:
-            return f"Error: {e}"
+        return SimulationController._dispatch(app, "555 Astable", compute, render)
 
     @staticmethod
     def run_555_monostable(app):
@@ -116,47 +406,191 @@ class SimulationController: # handles logic
                 dur = float(app.query_one("#sim_duration", Input).value)
             except (ValueError, AttributeError):
                 dur = 0.0
-            data = simulators.calculate_555_monostable(r, c, dur)
+            starts = SimulationController._parse_values(
+                app.query_one("#mono_trig", Input).value)
+            retrigger = app.query_one("#mono_retrig", Select).value == "yes"
+            triggers = None
+            if starts.size:
+                try:
+                    width = float(app.query_one("#mono_trig_w", Input).value)
+                except ValueError:
+                    width = 0.0
+                if width <= 0:
+                    width = r * c * 1e-6 * 0.05 # short compared to the pulse
+                triggers = [(s, s + width) for s in starts]
+                if dur <= 0: # show the whole train plus one pulse
+                    dur = float(starts.max()) + width + 2.5 * 1.1 * r * c * 1e-6
+            widget = app.query_one("#main_plot", PlotextPlot)
+            points = SimulationController._plot_points(widget)
+            method = SimulationController._solver(app)
+        except (ValueError, KeyError, AttributeError) as e:
+            return f"Error: {e}"
+
+        def compute(stale):
+            return SimulationController._cached(
+                "555_mono", (r, c, dur, points, triggers, retrigger, method),
+                lambda: simulators.calculate_555_monostable(
+                    r, c, dur, points=points, triggers=triggers,
+                    retrigger=retrigger, method=method,
+                    progress=SimulationController._progress(app, stale)))
+
+        def render(data):
             plt, col = SimulationController._prepare_plot(
                 app, f"555 Monostable (R={r}Ω, C={c}µF)")
-            plt.plot(data["time"], data["trigger"], label="Trigger", color="green")
-            plt.plot(data["time"], data["output"], label="Output", color=col)
-            plt.plot(data["time"], data["cap_voltage"], label="Capacitor",
-                     color="blue")
+            for key, label, color in [("trigger", "Trigger", "green"), ("output", "Output", col),
+                                      ("cap_voltage", "Capacitor", "blue")]:
+                SimulationController._plot(plt, data["time"], data[key], points,
+                                           label=label, color=color)
             app.last_data = data
             app.last_mode = "555_mono"
 
             SimulationController._update_elec_stats(app, data, "555_mono")
 
-            return f"Pulse: {data['pulse_width']:.4f}s"
-        except (ValueError, KeyError, AttributeError) as e:
+            return (f"Pulse: {data['pulse_width']:.4f}s ({len(data['pulses'])} pulses, "
+                    f"{len(data['time'])} samples)")
+        return SimulationController._dispatch(app, "555 Monostable", compute, render)
+
+    @staticmethod
+    def run_netlist(app):
+        try:
+            text = app.query_one("#net_text", TextArea).text
+            try:
+                dur = float(app.query_one("#sim_duration", Input).value)
+            except (ValueError, AttributeError):
+                dur = 0.0
+            raw = app.query_one("#net_probe", Input).value
+            probes = [p.strip().lower() for p in raw.split(',') if p.strip()]
+        except AttributeError as e:
+            return f"Error: {e}"
+
+        def compute(stale):
+            return dict(SimulationController._cached( # copy, probes are per run
+                "netlist", (text, dur),
+                lambda: mna_solver.simulate_transient(
+                    text, dur, progress=SimulationController._progress(app, stale))))
+
+        def render(data):
+            for p in probes:
+                if p not in data["nodes"]:
+                    return f"Error: unknown node '{p}'"
+            if probes:
+                data["probes"] = probes
+
+            plt, _ = SimulationController._prepare_plot(
+                app, f"Netlist ({len(data['nodes'])} nodes)")
+            colors = ["yellow", "green", "cyan", "red", "magenta", "blue", "white"]
+            points = SimulationController._main_points(app)
+            for i, p in enumerate(data["probes"]):
+                v = data["voltages"][data["nodes"].index(p)]
+                SimulationController._plot(plt, data["time"], v, points,
+                                           label=f"V({p})", color=colors[i % len(colors)])
+            app.last_data = data
+            app.last_mode = "netlist"
+
+            SimulationController._update_elec_stats(app, data, "netlist")
+
+            return f"Netlist: {len(data['nodes'])} nodes, {len(data['time'])} steps"
+        return SimulationController._dispatch(app, "Netlist", compute, render)
+
+    @staticmethod
+    def run_monte_carlo(app):
+        try:
+            circuit = app.query_one("#circuit_select", Select).value
+            if circuit == "circuit_rc":
+                nominal = {
+                    "r": float(SimulationController._parse_values(
+                        app.query_one("#rc_res", Input).value)[0]),
+                    "c": float(app.query_one("#rc_cap", Input).value)}
+            elif circuit == "circuit_555":
+                nominal = {"r1": float(app.query_one("#timer_r1", Input).value),
+                           "r2": float(app.query_one("#timer_r2", Input).value),
+                           "c": float(app.query_one("#timer_c", Input).value)}
+            else:
+                nominal = {"r": float(app.query_one("#mono_r", Input).value),
+                           "c": float(app.query_one("#mono_c", Input).value)}
+            tolerances = {"r": float(app.query_one("#mc_tol_r", Input).value),
+                          "c": float(app.query_one("#mc_tol_c", Input).value)}
+            runs = int(app.query_one("#mc_runs", Input).value)
+            spec = float(app.query_one("#mc_spec", Input).value)
+        except (ValueError, KeyError, AttributeError, IndexError) as e:
             return f"Error: {e}"
 
+        def compute(stale):
+            def progress(done, total):
+                if not stale():
+                    app.call_from_thread(SimulationController._set_progress, app,
+                                         total=total, progress=done)
+            return monte_carlo.run_tolerance_analysis(
+                circuit, nominal, tolerances, runs, spec,
+                progress=progress, should_stop=stale)
+
+        def render(data):
+            plt, col = SimulationController._prepare_plot(
+                app, f"Monte Carlo ({runs} runs)")
+            names = list(data["metrics"])
+            if len(names) > 1:
+                plt.subplots(1, len(names))
+            for i, name in enumerate(names):
+                sub = plt.subplot(1, i + 1) if len(names) > 1 else plt
+                # bin here, plotext would loop over every sample in python
+                counts, edges = np.histogram(data["metrics"][name], bins=40)
+                centers = (edges[:-1] + edges[1:]) / 2
+                sub.bar(centers.tolist(), counts.tolist(), color=col, width=1)
+                sub.title(f"{name} ({monte_carlo.UNITS[name]})")
+            app.last_data = data
+            app.last_mode = "monte_carlo"
+
+            SimulationController._update_elec_stats(app, data, "monte_carlo")
+
+            return f"Monte Carlo: {runs} runs, yield {data['yield']:.1f}%"
+        return SimulationController._dispatch(app, "Monte Carlo", compute, render,
+                                              show_cache=False, progress_total=runs)
+
+    @staticmethod
+    def pie_cloud(values, n_points: int, seed: int = 0) -> list:
+        """
+        Points filling a disc, split into one (x, y) pair of arrays per slice.
+        Seeded, so the same data always gives the same picture. Empty list if
+        the values sum to zero.
+        """
+        vals = np.abs(np.asarray(values, dtype=np.float64))
+        total = vals.sum()
+        if not total > 0:
+            return []
+        rng = np.random.default_rng(seed)
+        r = np.sqrt(rng.random(n_points)) # sqrt, so the density is even over the area
+        theta = rng.random(n_points) * 360
+        edges = np.cumsum(vals) / total * 360
+        idx = np.minimum(np.searchsorted(edges, theta, side="right"), len(vals) - 1)
+        x = r * np.cos(np.radians(theta)) * 1.8 # terminal cells are ~2x taller than wide
+        y = r * np.sin(np.radians(theta))
+        order = np.argsort(idx, kind="stable")
+        bounds = np.cumsum(np.bincount(idx, minlength=len(vals)))[:-1]
+        return list(zip(np.split(x[order], bounds), np.split(y[order], bounds)))
+
     @staticmethod
     def run_general_plot(app):
         try:
-            data_state = getattr(app, "gen_data_state", {})
-            cols = data_state.get("columns", [])
-            rows = data_state.get("rows", [])
-
-            if len(cols) < 2 or not rows: return "No data."
-
-            labels = [str(r[0]) for r in rows]
-            series_names = cols[1:]
-            series_data = []
-            for col_idx in range(1, len(cols)):
-                col_vals = []
-                for r in rows:
-                    try:
-                        val = float(r[col_idx])
-                    except (ValueError, IndexError, TypeError):
-                        val = 0.0
-                    col_vals.append(val)
-                series_data.append(col_vals)
+            table = getattr(app, "gen_data_state", None)
+            if table is None or table.n_series < 1 or len(table) == 0: return "No data."
+
+            # columns are parsed on import/edit already, these are the arrays themselves.
+            # only int/float series, dates and category codes are no values to plot
+            cols = table.numeric_series()
+            if not cols: return "No numeric series."
+            labels = table.labels # no copy, only tick/bar rows get looked up
+            series_names = [table.series_names[j] for j in cols]
+            series_data = [table.series(j) for j in cols]
 
-            app.last_gen_data = {"labels": labels, "series": series_data, "names": series_names}
             app.last_gen_mode = app.query_one("#gen_type", Select).value
             mode = app.last_gen_mode
+            # bar/pie can group rows with the same label, one bar/slice per label
+            how = app.query_one("#gen_agg", Select).value
+            grouped = mode in ("bar", "pie") and how in aggregate.AGGREGATES
+            if grouped:
+                labels, series_data = SimulationController.grouped(table, how)
+            app.last_gen_data = {"labels": labels, "series": series_data, "names": series_names,
+                                 "aggregate": how if grouped else None}
 
             # stats update
             try:
@@ -164,11 +598,13 @@ class SimulationController: # handles logic
                 if active_idx >= len(series_data): active_idx = 0
 
                 if series_data:
-                    current_vals = series_data[active_idx]
                     s_name = series_names[active_idx]
+                    j = cols[active_idx]
 
-                    # Use modular engine
-                    stats_text = statistics_engine.StatsEngine.calculate_generic(current_vals, s_name)
+                    # Use modular engine, cached until the column is edited
+                    stats_text = statistics_engine.StatsEngine.calculate_generic(
+                        table.series(j), s_name, valid=table.valid[j],
+                        cache_key=(table.uid, j, table.versions[j]), kind=table.kinds[j])
                 else:
                     stats_text = "No data"
 
@@ -184,48 +620,45 @@ class SimulationController: # handles logic
             graph_theme = SimulationController._get_graph_theme(current_app_theme)
             plt.clear_figure()
             plt.theme(graph_theme)
-            plt.title("Data view")
-
             active_idx = getattr(app, "active_series_index", 0)
             if active_idx >= len(series_data): active_idx = 0
 
             colors = ["red", "green", "yellow", "blue", "magenta", "cyan", "white"]
+            # visible rows, zoom/pan keys move this window
+            start, stop = getattr(app, "gen_window", None) or (0, len(table))
+            start, stop = int(start), min(len(table), int(math.ceil(stop)))
+            zoomed = (start, stop) != (0, len(table))
+            plt.title(f"Data view (rows {start + 1}-{stop} of {len(table)})" if zoomed else "Data view")
+            if grouped: # the window is in rows, groups always show whole
+                start, stop, zoomed = 0, len(labels), False
+                plt.title(f"Data view ({how} by label, {len(labels)} groups)")
+            # everything goes in at screen resolution, the table can have millions of rows.
+            # line/area/scatter read the pyramid level that fits the window
+            points = SimulationController._plot_points(widget)
+            ticks = start + decimate.tick_positions(stop - start, max(2, widget.size.width // 10))
+            tick_labels = [labels[i] for i in ticks]
+            pyramids = [SimulationController.pyramid(table, j) for j in cols] \
+                if mode in ("line", "area", "scatter") else []
 
             if mode == "pie": # plotting with dots. normal pie is hard-impossible in plotext
                 if series_data:
-                    vals = [abs(x) for x in series_data[active_idx]]
                     name = series_names[active_idx]
-
-                    total = sum(vals)
-                    if total > 0:
-                        angles = []
-                        current = 0
-                        for v in vals:
-                            share = (v / total) * 360
-                            angles.append((current, current + share))
-                            current += share
-
-                        points_x = [[] for _ in vals]
-                        points_y = [[] for _ in vals]
-
-                        for _ in range(2000):
-                            r = math.sqrt(random.random()) # EVERY PREVIEW will be different, due to added noise.
-                            theta = random.random() * 360
-                            slice_idx = 0
-                            for i, (start, end) in enumerate(angles):
-                                if start <= theta < end:
-                                    slice_idx = i
-                                    break
-                            x = r * math.cos(math.radians(theta)) * 1.8
-                            y = r * math.sin(math.radians(theta))
-                            points_x[slice_idx].append(x)
-                            points_y[slice_idx].append(y)
-
-                        for i, _ in enumerate(vals): # finish up
-                            label_txt = f"{labels[i]}" if i < len(labels) else ""
+                    size = widget.size
+                    # braille gives 2x4 dots per cell, ~2 points per cell fills the disc
+                    n_points = int(min(20000, max(1000, size.width * size.height * 2)))
+                    values, slice_labels = decimate.top_slices(
+                        series_data[active_idx], labels, SimulationController.MAX_SLICES)
+                    slices = SimulationController._data_cached(
+                        "pie_cloud", (table.uid, cols[active_idx], table.versions[cols[active_idx]], n_points,
+                                      how if grouped else None, table.label_version),
+                        lambda: SimulationController.pie_cloud(values, n_points))
+
+                    if slices:
+                        for i, (xs, ys) in enumerate(slices): # finish up
+                            label_txt = f"{slice_labels[i]}" if i < len(slice_labels) else ""
                             col = colors[i % len(colors)]
-                            if points_x[i]:
-                                plt.scatter(points_x[i], points_y[i], label=label_txt, color=col)
+                            if len(xs):
+                                plt.scatter(xs, ys, label=label_txt, color=col)
 
                         plt.title(f"{name} ({active_idx + 1}/{len(series_data)})")
                         plt.plotsize(None, None)
@@ -233,30 +666,71 @@ class SimulationController: # handles logic
                         plt.yaxes(False, False)
                         plt.frame(False)
 
+            elif mode in ("histogram", "kde"): # distributions, plotext only gets the bins
+                width = max(20, widget.size.width)
+                n = len(cols) # int/float only, binning dates or category codes means nothing
+                versions = tuple((j, table.versions[j]) for j in cols)
+
+                def values(): # only the cells that parsed
+                    return [table.valid_values(j) for j in cols]
+                if mode == "histogram":
+                    hist = SimulationController._data_cached(
+                        "histogram", (table.uid, versions, width // 2),
+                        lambda: statistics_engine.StatsEngine.histogram(values(), max_bins=width // 2))
+                    edges = hist["edges"]
+                    centers = (edges[:-1] + edges[1:]) / 2
+                    for i, counts in enumerate(hist["counts"]): # side by side inside each bin
+                        offset = (i - n / 2 + 0.5) * (edges[1] - edges[0]) / n
+                        plt.bar((centers + offset).tolist(), counts.tolist(), width=1 / n,
+                                label=series_names[i], color=colors[i % len(colors)])
+                    app.last_gen_data["hist"] = hist
+                    plt.title(f"Histogram ({len(edges) - 1} bins, {len(table)} rows)")
+                else:
+                    dens = SimulationController._data_cached(
+                        "kde", (table.uid, versions, width * 2),
+                        lambda: statistics_engine.StatsEngine.kde(values(), n_grid=width * 2))
+                    for i, d in enumerate(dens["density"]):
+                        plt.plot(dens["grid"], d, label=series_names[i], color=colors[i % len(colors)])
+                    app.last_gen_data["kde"] = dens
+                    plt.title(f"Density ({len(table)} rows)")
+
             else: # other plot types (they take up less lines than the whole pie function)
                 if mode == "bar":
+                    # a bar needs a cell, keep the tallest row of every bucket
+                    rows = start + decimate.peak_rows(
+                        [s[start:stop] for s in series_data],
+                        max(1, widget.size.width // (len(series_data) + 1)))
+                    bar_labels = [labels[r] for r in rows]
+                    bar_data = [s[rows].tolist() for s in series_data]
                     try:
-                        plt.multiple_bar(labels, series_data)
+                        plt.multiple_bar(bar_labels, bar_data)
                     except (ValueError, AttributeError):
-                        plt.multiple_bar(labels, series_data)
+                        plt.multiple_bar(bar_labels, bar_data)
                 elif mode == "area":
                     for i, s in enumerate(series_data):
                         col = colors[i % len(colors)]
+                        xs, ys = pyramids[i].query(start, stop, points)
                         try:
-                            plt.plot(s, label=series_names[i], fillx=True, color=col)
+                            plt.plot(xs, ys, label=series_names[i], fillx=True, color=col)
                         except (ValueError, AttributeError):
-                            plt.plot(s, label=series_names[i], color=col)
-                    plt.xticks(range(len(labels)), labels)
+                            plt.plot(xs, ys, label=series_names[i], color=col)
+                    plt.xticks(ticks.tolist(), tick_labels)
                 elif mode == "scatter":
                     for i, s in enumerate(series_data):
                         col = colors[i % len(colors)]
-                        plt.scatter(s, label=series_names[i], color=col)
-                    plt.xticks(range(len(labels)), labels)
+                        # a few min/max points per column, LTTB picks the shape from those
+                        xs, ys = pyramids[i].query(start, stop, points * 4)
+                        SimulationController._plot(plt, xs, ys, points, scatter=True,
+                                                   label=series_names[i], color=col)
+                    plt.xticks(ticks.tolist(), tick_labels)
                 else:
                     for i, s in enumerate(series_data):
                         col = colors[i % len(colors)]
-                        plt.plot(s, label=series_names[i], color=col)
-                    plt.xticks(range(len(labels)), labels)
+                        xs, ys = pyramids[i].query(start, stop, points)
+                        plt.plot(xs, ys, label=series_names[i], color=col)
+                    plt.xticks(ticks.tolist(), tick_labels)
+                if zoomed:
+                    plt.xlim(start, stop - 1)
 
             widget.refresh()
             return f"Rendered {mode}."
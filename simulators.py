@@ -1,211 +1,512 @@
 import numpy as np
 import math
-def calculate_rc_transient(v_in, cap_uf, resistances, max_time_s=0):
+
+import ode_solver
+class RCSweepResult:
     """
-    Calculates voltage curves for a standard DC step response (charging).
-    Supports multiple resistance values (parametric sweep).
+    Compact result of an R x C x V step-response sweep.
+    One row of `voltage` per parameter combination, shape (params, time).
     """
-    C = cap_uf * 1e-6
-    results = {"curves": []}
-    
+    __slots__ = ("time", "R", "C", "V", "voltage", "t_max", "mode")
+
+    def __init__(self, time, R, C, V, voltage, t_max, mode):
+        self.time = time
+        self.R = R
+        self.C = C
+        self.V = V
+        self.voltage = voltage
+        self.t_max = t_max
+        self.mode = mode
+
+    def __len__(self):
+        return len(self.R)
+
+    @property
+    def tau(self):
+        return self.R * self.C
+
+    def pick(self, max_curves: int = 8) -> np.ndarray:
+        """Evenly spaced row indices, for plotting a few curves out of thousands."""
+        n = len(self)
+        if n <= max_curves:
+            return np.arange(n)
+        return np.unique(np.linspace(0, n - 1, max_curves).round().astype(np.int64))
+
+    def label(self, i: int) -> str:
+        parts = [f"R={self.R[i]:g}Ω"]
+        if np.ptp(self.C) > 0:
+            parts.append(f"C={self.C[i] * 1e6:g}µF")
+        if np.ptp(self.V) > 0:
+            parts.append(f"V={self.V[i]:g}V")
+        return " ".join(parts)
+
+SWEEP_CHUNK = 1 << 20 # samples per broadcast chunk of a sweep, ~8 MB
+
+def calculate_rc_sweep(v_in, cap_uf, resistances, max_time_s=0, points=200,
+                       progress=None) -> RCSweepResult:
+    """
+    DC step response (charging) for every R x C x V combination at once.
+    v_in, cap_uf and resistances can each be a number or a list/array.
+    progress(done, total) is called per chunk of curves and may raise to stop.
+    """
+    R = np.atleast_1d(np.asarray(resistances, dtype=np.float64))
+    C = np.atleast_1d(np.asarray(cap_uf, dtype=np.float64)) * 1e-6
+    V = np.atleast_1d(np.asarray(v_in, dtype=np.float64))
+    if R.size == 0 or C.size == 0 or V.size == 0:
+        raise ValueError("empty sweep")
+
+    # Flatten the grid, R varies slowest so rows stay grouped per resistor
+    RR, CC, VV = (g.ravel() for g in np.meshgrid(R, C, V, indexing="ij"))
+    tau = RR * CC
+
     # 1. Determine Time Scale
     if max_time_s > 0:
         t_max = max_time_s
-        results["mode"] = "Fixed"
+        mode = "Fixed"
     else:
-        # Auto-scale to the slowest curve (max R)
-        max_tau = max(resistances) * C
-        t_max = 5 * max_tau
-        results["mode"] = "Auto"
-        
-    # Generate time array (200 steps for smoothness)
-    t = np.linspace(0, t_max, 200)
-    results["time"] = t
-    results["t_max"] = t_max
-    
-    # 2. Calculate Curves
-    for R in resistances:
-        tau = R * C
-        # V(t) = V_in * (1 - e^(-t/RC))
-        v_c = v_in * (1 - np.exp(-t / tau))
-        
+        # Auto-scale to the slowest curve (max R*C)
+        t_max = 5 * float(tau.max())
+        mode = "Auto"
+
+    t = np.linspace(0, t_max, max(2, int(points)))
+
+    # 2. All curves broadcast: V(t) = V_in * (1 - e^(-t/RC)), a chunk of
+    # curves at a time so big sweeps can report progress
+    voltage = np.empty((len(tau), len(t)))
+    rows = max(1, SWEEP_CHUNK // len(t))
+    for i in range(0, len(tau), rows):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            voltage[i:i + rows] = VV[i:i + rows, None] * -np.expm1(-t[None, :] / tau[i:i + rows, None])
+        if progress:
+            progress(min(i + rows, len(tau)), len(tau))
+    voltage[tau <= 0] = VV[tau <= 0, None] # no RC, output jumps to V_in
+
+    return RCSweepResult(t, RR, CC, VV, voltage, t_max, mode)
+
+def calculate_rc_transient(v_in, cap_uf, resistances, max_time_s=0):
+    """
+    Calculates voltage curves for a standard DC step response (charging).
+    Supports multiple resistance values (parametric sweep).
+    Legacy per-curve dict format, see calculate_rc_sweep for big sweeps.
+    """
+    sweep = calculate_rc_sweep(v_in, cap_uf, resistances, max_time_s)
+    results = {
+        "mode": sweep.mode,
+        "time": sweep.time,
+        "t_max": sweep.t_max,
+        "curves": []
+    }
+    for i, R in enumerate(sweep.R):
         results["curves"].append({
-            "R": R,
-            "tau": tau,
-            "voltage": v_c
+            "R": float(R),
+            "tau": float(sweep.tau[i]),
+            "voltage": sweep.voltage[i]
         })
-        
+
     return results
 
-def calculate_square_wave_response(v_in, cap_uf, res_ohm, frequency_hz, cycles=3):
+def calculate_rc_ac_sweep(cap_uf, res_ohm, f_start=0.0, f_stop=0.0, points=1000) -> dict:
+    """
+    Small-signal AC analysis of the RC low-pass, H(f) = 1 / (1 + j*2*pi*f*RC).
+    The whole log-spaced grid is evaluated in one NumPy expression.
+    f_start/f_stop of 0 means 3 decades either side of the corner.
+    """
+    tau = res_ohm * cap_uf * 1e-6
+    if tau <= 0:
+        raise ValueError("R and C must be positive")
+    f_c = 1.0 / (2 * math.pi * tau)
+
+    if f_start <= 0:
+        f_start = f_c / 1000
+    if f_stop <= 0:
+        f_stop = f_c * 1000
+    if f_stop <= f_start:
+        raise ValueError("stop frequency must be above start")
+
+    freq = np.geomspace(f_start, f_stop, max(2, int(points)))
+    h = 1.0 / (1.0 + 1j * (2 * np.pi * tau) * freq)
+
+    return {
+        "freq": freq,
+        "magnitude_db": 20 * np.log10(np.abs(h)),
+        "phase_deg": np.degrees(np.angle(h)),
+        "f_c": f_c,
+        "tau": tau
+    }
+
+def find_corner(freq, magnitude_db, drop_db: float = 3.0103):
+    """First frequency where the response falls drop_db below its start, None if never."""
+    target = magnitude_db[0] - drop_db
+    below = np.flatnonzero(magnitude_db <= target)
+    if below.size == 0:
+        return None
+    i = below[0]
+    if i == 0:
+        return float(freq[0])
+    # interpolate on a log axis, the grid is log-spaced
+    lf = np.interp(target, [magnitude_db[i], magnitude_db[i - 1]],
+                   [math.log10(freq[i]), math.log10(freq[i - 1])])
+    return float(10 ** lf)
+
+def calculate_square_wave_response(v_in, cap_uf, res_ohm, frequency_hz, cycles=3,
+                                   points=1000, method="exact", progress=None):
     """
     Simulates an RC circuit responding to a Square Wave input (Charge/Discharge cycles).
+    Exact piecewise-exponential solution, every half-period is solved analytically,
+    so accuracy does not depend on the sample count (no Euler drift when dt ~ tau).
+    method="adaptive" integrates the ODE with ode_solver instead, samples are then
+    placed by the error control (dense at edges, sparse on the flat parts),
+    progress goes to the integrator.
     """
     C = cap_uf * 1e-6
     tau = res_ohm * C
     period = 1.0 / frequency_hz
+    half = period / 2
     total_time = cycles * period
-    
-    # High resolution time steps (1000 points to capture sharp edges)
-    t = np.linspace(0, total_time, 1000)
-    
-    v_out = np.zeros_like(t)
-    v_in_wave = np.zeros_like(t)
-    
-    # Iterative Simulation (Time Stepping)
-    dt = t[1] - t[0]
-    current_v = 0.0
-    
-    for i, time_val in enumerate(t):
-        # Generate Input Square Wave (0 or V_in)
-        # First half of period is High, second half is Low
-        if (time_val % period) < (period / 2):
-            target_v = v_in
-        else:
-            target_v = 0.0
-            
-        v_in_wave[i] = target_v
-        
-        # RC Update (Euler integration): dV = (V_target - V_current) * dt / RC eulr intergration?
-        change = (target_v - current_v) * (dt / tau)
-        current_v += change
-        v_out[i] = current_v
-        #awesomeness rating: 10/10 reason: simple yet effective!
+
+    if method == "adaptive" and tau > 0:
+        return _square_wave_adaptive(float(v_in), tau, half, total_time, progress)
+
+    t = np.linspace(0, total_time, max(2, int(points)))
+
+    # Which half-period every sample sits in. Even = input High, odd = input Low.
+    # (same rule as before: (t % period) < period/2 is High)
+    k = np.floor(t / half).astype(np.int64)
+    n_halves = int(k.max()) + 1
+    high = (k % 2) == 0
+    v_in_wave = np.where(high, float(v_in), 0.0)
+
+    if tau <= 0:
+        # no capacitor / no resistor, output follows the input instantly
+        return {
+            "time": t,
+            "input_wave": v_in_wave,
+            "output_wave": v_in_wave.copy(),
+            "tau": tau
+        }
+
+    # Voltage at the start of every half-period, closed form.
+    # a = decay over one half-period. start of cycle n: v = V*a/(1+a) * (1 - a^(2n))
+    # start of the Low half follows from one more High charge: V + (v - V)*a
+    a = math.exp(-half / tau)
+    j = np.arange(n_halves)
+    v_cycle = v_in * a / (1 + a) * (1 - a ** (2 * (j // 2)))
+    v_start = np.where(j % 2 == 0, v_cycle, v_in + (v_cycle - v_in) * a)
+
+    # Inside a half-period: V(t) = target + (V_start - target) * e^(-dt/RC)
+    local = t - k * half
+    v_out = v_in_wave + (v_start[k] - v_in_wave) * np.exp(-local / tau)
+
     return {
         "time": t,
         "input_wave": v_in_wave,
         "output_wave": v_out,
         "tau": tau
     }
-def calculate_555_astable(r1: float, r2: float, c_uf: float, duration: float = 0.0) -> dict:
-    """
-    Calculates 555 Timer Astable Multivibrator behavior.
-    Returns time/voltage arrays for plotting.
-    """
+def _square_wave_adaptive(v_in: float, tau: float, half: float, total_time: float,
+                          progress=None) -> dict:
+    """State is [v_out, v_input], every half-period edge flips the input."""
+    def rhs(t, y):
+        return np.array([(y[1] - y[0]) / tau, 0.0])
+
+    def edge(t, y):
+        y[1] = v_in - y[1]
+        return y
+
+    n_edges = int(math.floor(total_time / half + 1e-9))
+    edges = [(k * half, edge) for k in range(1, n_edges + 1)]
+    t, y = ode_solver.integrate(rhs, 0.0, total_time, [0.0, v_in],
+                                breakpoints=edges, max_step=half, progress=progress)
+    return {
+        "time": t,
+        "input_wave": y[:, 1],
+        "output_wave": y[:, 0],
+        "tau": tau
+    }
+
+def astable_timing(r1, r2, c_uf) -> dict:
+    """555 astable timing, works on plain numbers or whole arrays of samples."""
     # Convert units
-    C = c_uf * 1e-6
-    
+    C = np.asarray(c_uf, dtype=np.float64) * 1e-6
+    r1 = np.asarray(r1, dtype=np.float64)
+    r2 = np.asarray(r2, dtype=np.float64)
+
     # 555 Math
     t_high = 0.693 * (r1 + r2) * C # what is 0.693? -- ln(2)
     t_low = 0.693 * r2 * C
     period = t_high + t_low
-    freq = 1.0 / period if period > 0 else 0
-    duty_cycle = (t_high / period) * 100 if period > 0 else 0
-    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        freq = np.where(period > 0, 1.0 / period, 0.0)
+        duty = np.where(period > 0, t_high / period * 100, 0.0)
+    return {"t_high": t_high, "t_low": t_low, "period": period,
+            "freq": freq, "duty": duty}
+
+def monostable_pulse_width(r_ohms, c_uf):
+    """Exact 555 one-shot width RC*ln(3), plain numbers or arrays."""
+    return np.asarray(r_ohms, dtype=np.float64) * np.asarray(c_uf) * 1e-6 * math.log(3)
+
+def calculate_555_astable(r1: float, r2: float, c_uf: float, duration: float = 0.0) -> dict:
+    """
+    Calculates 555 Timer Astable Multivibrator behavior.
+    The waveform is kept as its edge description (t_high / t_low), use
+    astable_edges or sample_555_astable to get arrays at the needed resolution.
+    """
+    timing = astable_timing(r1, r2, c_uf)
+    t_high = float(timing["t_high"])
+    t_low = float(timing["t_low"])
+    period = float(timing["period"])
+    freq = float(timing["freq"])
+    duty_cycle = float(timing["duty"])
+
     # Auto-duration: show 5 cycles if not specified
     if duration <= 0:
         duration = 5 * period
-        
-    # Generate Waveform Points
-    # We construct a square wave manually
-    time = []
-    voltage = []
-    
-    t = 0
-    while t < duration:
-        # Rising edge
-        time.append(t); voltage.append(0)
-        time.append(t); voltage.append(5) # Logic High (assuming 5V)
-        
-        # High duration
-        t += t_high
-        if t > duration: break
-        time.append(t); voltage.append(5)
-        time.append(t); voltage.append(0) # Falling edge
-        
-        # Low duration
-        t += t_low
-        if t > duration: break
-        time.append(t); voltage.append(0)
 
     return {
-        "time": time,
-        "voltage": voltage,
         "freq": freq,
         "duty": duty_cycle,
         "period": period,
         "t_high": t_high,
-        "t_low": t_low
+        "t_low": t_low,
+        "duration": duration,
+        "v_high": 5.0 # Logic High (assuming 5V)
+    }
+
+def _astable_level(data: dict, t):
+    """Output level at time(s) t, high for the first t_high of every period."""
+    return np.where(np.mod(t, data["period"]) < data["t_high"], data["v_high"], 0.0)
+
+def _astable_edge_count(data: dict, t):
+    """Number of transitions in (0, t], rising edge at t=0 not counted."""
+    cycles = np.floor(np.asarray(t) / data["period"])
+    return 2 * cycles + (np.mod(t, data["period"]) >= data["t_high"])
+
+def astable_edges(data: dict, t_start: float = 0.0, t_end: float = None):
+    """
+    Transition times and the level right after each one, inside [t_start, t_end].
+    Edges are generated for the window only, nothing is stored per cycle.
+    """
+    if data["period"] <= 0:
+        raise ValueError("period must be positive")
+    if t_end is None:
+        t_end = data["duration"]
+    n = np.arange(math.floor(t_start / data["period"]),
+                  math.floor(t_end / data["period"]) + 1)
+    rises = n * data["period"]
+    times = np.column_stack([rises, rises + data["t_high"]]).ravel()
+    levels = np.tile([data["v_high"], 0.0], len(n))
+    keep = (times >= t_start) & (times <= t_end)
+    return times[keep], levels[keep]
+
+def sample_555_astable(data: dict, points: int = 1000, t_start: float = 0.0,
+                       t_end: float = None):
+    """
+    Expands the edge description into (time, voltage) arrays for a plot/export.
+    Exact step vertices when the window holds fewer edges than `points`,
+    otherwise a min/max envelope per bucket, so memory follows `points` and
+    not the number of cycles.
+    """
+    if data["period"] <= 0:
+        raise ValueError("period must be positive")
+    if t_end is None:
+        t_end = data["duration"]
+    points = max(4, int(points))
+    v_high = data["v_high"]
+
+    n_edges = _astable_edge_count(data, t_end) - _astable_edge_count(data, t_start)
+    if n_edges * 2 + 2 <= points:
+        times, levels = astable_edges(data, t_start, t_end)
+        before = np.where(levels > 0, 0.0, v_high) # level right before each edge
+        first = _astable_level(data, [t_start])
+        if len(times) and times[0] == t_start:
+            first = before[:1] # draw the edge at the window start, like a scope
+        time = np.concatenate([[t_start], np.repeat(times, 2), [t_end]])
+        voltage = np.concatenate([first,
+                                  np.column_stack([before, levels]).ravel(),
+                                  _astable_level(data, [t_end])])
+        return time, voltage
+
+    # envelope: a bucket with an edge inside shows both levels
+    bounds = np.linspace(t_start, t_end, points // 2 + 1)
+    counts = _astable_edge_count(data, bounds)
+    start_level = _astable_level(data, bounds[:-1])
+    busy = counts[1:] != counts[:-1]
+    lo = np.where(busy, 0.0, start_level)
+    hi = np.where(busy, v_high, start_level)
+    time = np.repeat(bounds[:-1], 2)
+    voltage = np.column_stack([hi, lo]).ravel()
+    return time, voltage
+
+def _monostable_segments(tau: float, triggers, retrigger: bool = False) -> np.ndarray:
+    """
+    Event pass over the trigger train. Returns rows of (start, end, charge_start),
+    one per stretch where the output is high and the capacitor charges from
+    charge_start. The threshold crossing is solved exactly: 0 -> 2/3 VCC takes
+    tau * ln(3), so no timestep is involved.
+    """
+    t_charge = tau * math.log(3)
+    segments = []
+    cur = None # [start, charge_start, trigger_hold_end]
+    for ts, te in sorted(triggers):
+        if cur is not None and ts < max(cur[1] + t_charge, cur[2]):
+            # trigger arrives while the output is still high
+            if retrigger:
+                # cap is dumped and timing restarts from this trigger
+                segments.append((cur[0], ts, cur[1]))
+                cur = [ts, ts, max(cur[2], te)]
+            else:
+                # standard 555 ignores it, but a trigger still held low
+                # at the threshold keeps the output high until released
+                cur[2] = max(cur[2], te)
+            continue
+        if cur is not None:
+            segments.append((cur[0], max(cur[1] + t_charge, cur[2]), cur[1]))
+        cur = [ts, ts, te]
+    if cur is not None:
+        segments.append((cur[0], max(cur[1] + t_charge, cur[2]), cur[1]))
+    return np.array(segments, dtype=np.float64).reshape(-1, 3)
+
+def _monostable_adaptive(tau: float, triggers, retrigger: bool, duration: float,
+                         progress=None) -> dict:
+    """State is [Vc, flip-flop, trigger pins held low]."""
+    VCC = 5.0
+    V_THRESHOLD = (2/3) * VCC
+
+    def rhs(t, y):
+        # Output HIGH, Discharge Open -> Capacitor Charges through R
+        return np.array([(VCC - y[0]) / tau if y[1] else 0.0, 0.0, 0.0])
+
+    def trigger_start(t, y):
+        y[2] += 1
+        if not y[1]: # SET: Trigger < 1/3 VCC
+            y[1], y[0] = 1.0, 0.0
+        elif retrigger:
+            y[0] = 0.0
+        return y
+
+    def trigger_end(t, y):
+        y[2] -= 1
+        if y[1] and y[2] == 0 and y[0] >= V_THRESHOLD: # was held past threshold
+            y[1], y[0] = 0.0, 0.0
+        return y
+
+    def threshold(t, y):
+        if y[2] > 0: # trigger still low, output stays high
+            return None
+        y[1], y[0] = 0.0, 0.0 # RESET, discharge shorts the cap
+        return y
+
+    stops = [(a, trigger_start) for a, _ in triggers] + [(b, trigger_end) for _, b in triggers]
+    comparator = ode_solver.Event(lambda t, y: y[0] - V_THRESHOLD if y[1] else -V_THRESHOLD,
+                                  threshold, direction=1)
+    t, y = ode_solver.integrate(rhs, 0.0, duration, [0.0, 0.0, 0.0], breakpoints=stops,
+                                events=[comparator], max_step=duration / 50, progress=progress)
+
+    output = y[:, 1] * VCC
+    rises = t[1:][np.diff(output) > 0]
+    falls = t[1:][np.diff(output) < 0]
+    falls = np.concatenate([falls, [duration] * (len(rises) - len(falls))])
+    pulses = np.column_stack([rises, falls[:len(rises)]])
+    return {
+        "time": t,
+        "trigger": np.where(y[:, 2] > 0, 0.0, VCC),
+        "output": output,
+        "cap_voltage": y[:, 0],
+        "pulse_width": float(pulses[0, 1] - pulses[0, 0]) if len(pulses) else tau * math.log(3),
+        "pulse_width_theoretical": tau * math.log(3),
+        "pulses": pulses
     }
 
-def calculate_555_monostable(r_ohms: float, c_uf: float, duration: float = 0.0) -> dict:
+def calculate_555_monostable(r_ohms: float, c_uf: float, duration: float = 0.0,
+                             points: int = 1000, triggers=None,
+                             retrigger: bool = False, method: str = "exact",
+                             progress=None) -> dict:
     """
-    Physically accurate 555 Monostable simulation.
-    Simulates the Capacitor Voltage (Vc) charging curve.
+    Physically accurate 555 Monostable simulation, event driven.
+    Trigger, charge and threshold-reset times are solved analytically and the
+    Capacitor Voltage (Vc) charging curve is sampled from them with NumPy.
+    triggers: list of (start, end) times where the trigger pin is held low,
+    defaults to one short pulse at 10% of the graph.
+    retrigger: a trigger during the pulse restarts the timing (cap dumped).
+    method="adaptive" integrates Vc with ode_solver, the threshold comparator
+    is an event on the dense output instead of a closed-form crossing,
+    progress goes to the integrator.
     """
     # 1. Constants
     C = c_uf * 1e-6
     R = r_ohms
     VCC = 5.0
-    V_THRESHOLD = (2/3) * VCC
     tau = R * C
-    
-    # Theoretical Pulse Width (for reference)
-    pulse_width_theoretical = 1.1 * R * C
+
+    # Exact pulse width: Vc goes 0 -> 2/3 VCC, t = RC * ln(3) (the famous 1.1RC)
+    pulse_width_theoretical = tau * math.log(3)
 
     # 2. Setup Timebase
     # We want to see the pulse plus some settling time
     if duration <= 0:
-        duration = pulse_width_theoretical * 2.5
+        duration = 1.1 * tau * 2.5
         if duration == 0: duration = 0.01
 
-    points = 1000
-    dt = duration / points
-    
-    time = []
-    trigger_signal = []
-    output_signal = []
-    cap_voltage = [] # <--- NEW: The Blue Line in your image
-    
-    # 3. Simulation State
-    # We assume trigger happens at 10% of the graph
-    trig_time_start = duration * 0.1
-    trig_time_end = trig_time_start + (duration * 0.02) # Short pulse
-    
-    vc = 0.0      # Capacitor Voltage
-    out = 0.0     # Output Voltage
-    latched = False # Internal Flip-Flop State
-    
-    for i in range(points):
-        t = i * dt
-        time.append(t)
-        
-        # A. Handle Trigger Input (Active Low)
-        trig_val = 5.0
-        if trig_time_start <= t <= trig_time_end:
-            trig_val = 0.0
-        trigger_signal.append(trig_val)
-        
-        # B. 555 Internal Logic
-        
-        # 1. SET Condition: Trigger < 1/3 VCC
-        if trig_val < (VCC / 3):
-            latched = True
-            
-        # 2. RESET Condition: Threshold > 2/3 VCC
-        if vc >= V_THRESHOLD:
-            latched = False
-            
-        # C. Circuit Physics
-        if latched:
-            # Output HIGH, Discharge Open -> Capacitor Charges through R
-            out = 5.0
-            # Vc_new = Vc_old + (Target - Vc_old) * (1 - exp(-dt/tau))
-            # Euler integration for exponential charge
-            vc = vc + (VCC - vc) * (dt / tau)
-        else:
-            # Output LOW, Discharge Closed -> Capacitor Shorts to Ground
-            out = 0.0
-            # Instant discharge (ideal 555) or fast decay
-            vc = 0.0 
-
-        output_signal.append(out)
-        cap_voltage.append(vc)
+    if triggers is None:
+        trig_time_start = duration * 0.1
+        triggers = [(trig_time_start, trig_time_start + duration * 0.02)] # Short pulse
+    triggers = [(float(a), float(b)) for a, b in triggers if b >= a]
+
+    if method == "adaptive" and tau > 0:
+        return _monostable_adaptive(tau, triggers, retrigger, duration, progress)
+
+    # 3. Events
+    segments = _monostable_segments(tau, triggers, retrigger)
+    trig = np.array(triggers, dtype=np.float64).reshape(-1, 2)
+    trig_starts = np.sort(trig[:, 0])
+    trig_ends = np.sort(trig[:, 1])
+
+    # 4. Timebase: uniform grid plus every event time twice (left and right
+    # value) so edges stay vertical at any resolution
+    events = np.concatenate([trig.ravel(), segments[:, 0], segments[:, 1]])
+    events = np.unique(events[(events >= 0) & (events <= duration)])
+    grid = np.linspace(0, duration, max(2, int(points)))
+    time = np.concatenate([grid, events, events])
+    # left copies are evaluated just before the event
+    t_eval = np.concatenate([grid, np.nextafter(events, -np.inf), events])
+    order = np.argsort(time, kind="stable")
+    time = time[order]
+    t_eval = t_eval[order]
+
+    # 5. Signals
+    # trigger is low inside any [start, end]
+    held = (np.searchsorted(trig_starts, t_eval, side="right")
+            - np.searchsorted(trig_ends, t_eval, side="left"))
+    trigger_signal = np.where(held > 0, 0.0, VCC)
+
+    idx = np.searchsorted(segments[:, 0], t_eval, side="right") - 1
+    safe = np.clip(idx, 0, None)
+    high = (idx >= 0) & (t_eval < segments[safe, 1]) if len(segments) else np.zeros(len(time), bool)
+    output_signal = np.where(high, VCC, 0.0)
+
+    # Vc = VCC * (1 - e^(-(t - t_charge_start)/RC)) while high, discharged otherwise
+    if len(segments) and tau > 0:
+        since = np.maximum(t_eval - segments[safe, 2], 0.0)
+        cap_voltage = np.where(high, VCC * -np.expm1(-since / tau), 0.0)
+    else:
+        cap_voltage = np.zeros(len(time))
+
+    # retriggered segments touch, merge them back into whole output pulses
+    pulses = segments[:, :2]
+    if len(pulses) > 1:
+        new_pulse = np.concatenate([[True], pulses[1:, 0] != pulses[:-1, 1]])
+        group = np.cumsum(new_pulse) - 1
+        ends = np.zeros(group[-1] + 1)
+        np.maximum.at(ends, group, pulses[:, 1])
+        pulses = np.column_stack([pulses[new_pulse, 0], ends])
+    widths = pulses[:, 1] - pulses[:, 0]
 
     return {
         "time": time,
         "trigger": trigger_signal,
         "output": output_signal,
-        "cap_voltage": cap_voltage, # Return this to plot it!
-        "pulse_width": pulse_width_theoretical
+        "cap_voltage": cap_voltage,
+        "pulse_width": float(widths[0]) if len(widths) else pulse_width_theoretical,
+        "pulse_width_theoretical": pulse_width_theoretical,
+        "pulses": pulses
     }
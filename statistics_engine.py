@@ -1,39 +1,220 @@
-import statistics
 import math
 
+import numpy as np
+
+import sim_cache
+import simulators
+
 class StatsEngine:
     """Central logic for calculating signal statistics."""
 
+    CACHE = sim_cache.SimCache(max_entries=128, max_bytes=1024 * 1024) # per series version
+
+    @staticmethod
+    def describe(values, valid=None) -> dict:
+        """
+        count, min, max, mean, stdev, median, q1/q3, skew, kurtosis and the NaN
+        count in one vectorized pass over the data (plus one partition for the
+        quantiles). valid: optional mask, cells outside it count as NaN.
+        """
+        x = np.asarray(values, dtype=np.float64)
+        ok = np.isfinite(x)
+        if valid is not None:
+            ok &= np.asarray(valid, dtype=bool)
+        nan_count = int(x.size - ok.sum())
+        if nan_count:
+            x = x[ok]
+        n = x.size
+        if n == 0:
+            return {"count": 0, "nan": nan_count}
+        mean = x.mean()
+        d = x - mean
+        d2 = d * d
+        m2, m3, m4 = d2.sum(), (d2 * d).sum(), (d2 * d2).sum()
+        q1, median, q3 = np.quantile(x, [0.25, 0.5, 0.75])
+        return StatsEngine._finish(n, nan_count, float(x.min()), float(x.max()),
+                                   float(mean), m2, m3, m4,
+                                   {"median": float(median), "q1": float(q1), "q3": float(q3)})
+
+    @staticmethod
+    def describe_chunks(chunks) -> dict:
+        """
+        Streaming describe for data that does not fit in memory: every chunk is
+        reduced with numpy, the partial moments are merged (Chan/Welford style,
+        up to the 4th moment). Exact median/quantiles need all the data, they are
+        left out here.
+        """
+        n, nan_count, mean, m2, m3, m4 = 0, 0, 0.0, 0.0, 0.0, 0.0
+        lo, hi = math.inf, -math.inf
+        for chunk in chunks:
+            x = np.asarray(chunk, dtype=np.float64)
+            ok = np.isfinite(x)
+            nan_count += int(x.size - ok.sum())
+            x = x[ok] if not ok.all() else x
+            nb = x.size
+            if nb == 0:
+                continue
+            mb = x.mean()
+            d = x - mb
+            d2 = d * d
+            b2, b3, b4 = d2.sum(), (d2 * d).sum(), (d2 * d2).sum()
+            lo, hi = min(lo, float(x.min())), max(hi, float(x.max()))
+            # merge (n, mean, m2, m3, m4) with the chunk's
+            na = n
+            n = na + nb
+            delta = mb - mean
+            delta_n = delta / n
+            m4 = (m4 + b4 + delta * delta_n ** 3 * na * nb * (na * na - na * nb + nb * nb)
+                  + 6 * delta_n ** 2 * (na * na * b2 + nb * nb * m2)
+                  + 4 * delta_n * (na * b3 - nb * m3))
+            m3 = (m3 + b3 + delta * delta_n ** 2 * na * nb * (na - nb)
+                  + 3 * delta_n * (na * b2 - nb * m2))
+            m2 = m2 + b2 + delta * delta_n * na * nb
+            mean = mean + delta_n * nb
+        if n == 0:
+            return {"count": 0, "nan": nan_count}
+        return StatsEngine._finish(n, nan_count, lo, hi, mean, m2, m3, m4, {})
+
+    @staticmethod
+    def _finish(n, nan_count, lo, hi, mean, m2, m3, m4, extra: dict) -> dict:
+        var_pop = m2 / n
+        skew = (m3 / n) / var_pop ** 1.5 if var_pop > 0 else 0.0
+        kurt = (m4 / n) / var_pop ** 2 - 3.0 if var_pop > 0 else 0.0 # excess
+        return {"count": n, "nan": nan_count, "min": lo, "max": hi, "mean": float(mean),
+                "stdev": math.sqrt(m2 / (n - 1)) if n > 1 else 0.0,
+                "skew": float(skew), "kurtosis": float(kurt), **extra}
+
+    # distributions. both bin with bincount on precomputed indices, one pass per series,
+    # so the charts and exports draw a few hundred bins instead of the raw points
+    @staticmethod
+    def bin_count(x: np.ndarray, rule: str = "auto", max_bins: int = 200) -> int:
+        """
+        Histogram bins for finite values x: "sturges", "fd" (Freedman-Diaconis)
+        or "auto", the finer of the two like numpy's. Capped at max_bins.
+        """
+        n = x.size
+        if n < 2:
+            return 1
+        sturges = math.log2(n) + 1
+        span = float(x.max() - x.min())
+        q1, q3 = np.percentile(x, [25, 75])
+        fd = span / (2 * (q3 - q1) * n ** (-1 / 3)) if q3 > q1 else 0.0
+        bins = {"sturges": sturges, "fd": fd or sturges}.get(rule, max(sturges, fd))
+        return int(min(max_bins, max(1, math.ceil(bins))))
+
+    @staticmethod
+    def _range(arrays) -> tuple:
+        arrays = [a for a in arrays if a.size]
+        if not arrays:
+            return 0.0, 1.0
+        lo = min(float(a.min()) for a in arrays)
+        hi = max(float(a.max()) for a in arrays)
+        return (lo - 0.5, hi + 0.5) if hi == lo else (lo, hi)
+
     @staticmethod
-    def calculate_generic(data_input, name: str = "Series") -> str:
+    def histogram(arrays, max_bins: int = 200, rule: str = "auto") -> dict:
+        """Histograms of several series (finite values) on shared edges: {"edges", "counts"}."""
+        arrays = [np.asarray(a, dtype=np.float64) for a in arrays]
+        lo, hi = StatsEngine._range(arrays)
+        bins = max([StatsEngine.bin_count(a, rule, max_bins) for a in arrays] + [1])
+        counts = []
+        for a in arrays:
+            idx = np.minimum(((a - lo) * (bins / (hi - lo))).astype(np.int64), bins - 1)
+            counts.append(np.bincount(idx, minlength=bins))
+        return {"edges": np.linspace(lo, hi, bins + 1), "counts": counts}
+
+    @staticmethod
+    def kde(arrays, n_grid: int = 256) -> dict:
+        """
+        Gaussian kernel density of several series on one grid, binned: counts on
+        the grid convolved with the kernel, Silverman's bandwidth per series.
+        {"grid", "density", "bandwidth"}
+        """
+        arrays = [np.asarray(a, dtype=np.float64) for a in arrays]
+        widths = []
+        for a in arrays:
+            if a.size < 2:
+                widths.append(1.0)
+                continue
+            q1, q3 = np.percentile(a, [25, 75])
+            spread = min(a.std(), (q3 - q1) / 1.34) or a.std() or abs(a[0]) * 1e-3 or 1.0
+            widths.append(0.9 * spread * a.size ** -0.2)
+        lo, hi = StatsEngine._range(arrays)
+        pad = 3 * max(widths + [0.0])
+        grid = np.linspace(lo - pad, hi + pad, n_grid)
+        step = grid[1] - grid[0]
+        density = []
+        for a, h in zip(arrays, widths):
+            if not a.size:
+                density.append(np.zeros(n_grid))
+                continue
+            idx = np.clip(np.rint((a - grid[0]) / step).astype(np.int64), 0, n_grid - 1)
+            counts = np.bincount(idx, minlength=n_grid).astype(np.float64)
+            half = min((n_grid - 1) // 2, math.ceil(4 * h / step)) # kernel no longer than the grid
+            offsets = np.arange(-half, half + 1) * step
+            kernel = np.exp(-0.5 * (offsets / h) ** 2)
+            dens = np.convolve(counts, kernel, mode="same") / (a.size * h * math.sqrt(2 * math.pi))
+            density.append(dens)
+        return {"grid": grid, "density": density, "bandwidth": widths}
+
+    @staticmethod
+    def calculate_generic(data_input, name: str = "Series", valid=None, cache_key=None,
+                          kind: str = "float") -> str:
+        """
+        cache_key: anything that changes with the data, e.g. (table uid, column, version).
+        kind: the column kind, dates and categories get no statistics.
+        """
         if data_input is None: return "No Data"
+        if kind not in ("int", "float"): return f"Target: {name}\n{kind} column, no statistics"
         try:
-            data_list = list(data_input)
-            clean_data = [float(x) for x in data_list if x is not None]
-            if not clean_data: return "Empty Data"
-
-            count = len(clean_data) # ship or 
-            min_val = min(clean_data)
-            max_val = max(clean_data)
-            mean_val = statistics.mean(clean_data)
-            try: stdev_val = statistics.stdev(clean_data)
-            except: stdev_val = 0.0
-
-            return (
+            if cache_key is not None:
+                s = StatsEngine.CACHE.get_or_compute(
+                    cache_key, lambda: StatsEngine.describe(data_input, valid))
+            else:
+                s = StatsEngine.describe(data_input, valid)
+            if not s["count"]: return "Empty Data"
+
+            text = (
                 f"Target: {name}\n"
-                f"Count: {count}\n"
-                f"Min: {min_val:.4f}\n"
-                f"Max: {max_val:.4f}\n"
-                f"Mean: {mean_val:.4f}\n"
-                f"StdDev: {stdev_val:.4f}"
+                f"Count: {s['count']}\n"
+                f"Min: {s['min']:.4f}\n"
+                f"Max: {s['max']:.4f}\n"
+                f"Mean: {s['mean']:.4f}\n"
+                f"StdDev: {s['stdev']:.4f}\n"
+                f"Median: {s['median']:.4f}\n"
+                f"Q1/Q3: {s['q1']:.4f} / {s['q3']:.4f}\n"
+                f"Skew: {s['skew']:.3f}\n"
+                f"Kurtosis: {s['kurtosis']:.3f}"
             )
-        except: return "Stats Error"
+            if s["nan"]:
+                text += f"\nMissing: {s['nan']}"
+            return text
+        except (ValueError, TypeError, KeyError): return "Stats Error"
 
     @staticmethod
     def analyze_simulation(data: dict, mode: str) -> str:
         """Analyzes simulation results based on circuit type."""
         try:
-            if mode == "rc_step":
+            if mode == "rc_step" and hasattr(data, "voltage"):
+                # sweep result, report the spread instead of one curve
+                if len(data) == 0: return "No Curves"
+                tau = data.tau
+                if len(data) == 1:
+                    return (
+                        f"Type: RC Step\n"
+                        f"Res: {data.R[0]:g} Ω\n"
+                        f"Tau: {tau[0]:.4f} s\n"
+                        f"5*Tau: {5*tau[0]:.4f} s"
+                    )
+                return (
+                    f"Type: RC Sweep\n"
+                    f"Curves: {len(data)}\n"
+                    f"Res: {data.R.min():g}-{data.R.max():g} Ω\n"
+                    f"Tau: {tau.min():.4f}-{tau.max():.4f} s\n"
+                    f"5*Tau max: {5*tau.max():.4f} s"
+                )
+
+            elif mode == "rc_step":
                 # Analyze the first curve usually
                 if not data.get("curves"): return "No Curves"
                 # Just pick the first one for stats
@@ -62,6 +243,17 @@ class StatsEngine:
                     f"V_min: {v_min:.2f} V"
                 )
 
+            elif mode == "rc_ac":
+                corner = simulators.find_corner(data["freq"], data["magnitude_db"])
+                corner_txt = f"{corner:.4g} Hz" if corner else "out of range"
+                return (
+                    f"Type: RC AC sweep\n"
+                    f"Tau: {data['tau']:.4f} s\n"
+                    f"-3dB: {corner_txt}\n"
+                    f"1/2πRC: {data['f_c']:.4g} Hz\n"
+                    f"Points: {len(data['freq'])}"
+                )
+
             elif mode == "555_astable":
                 freq = data.get("freq", 0)
                 duty = data.get("duty", 0)
@@ -74,12 +266,36 @@ class StatsEngine:
 
             elif mode == "555_mono":
                 pw = data.get("pulse_width", 0)
+                pulses = data.get("pulses", [])
                 return (
                     f"Type: 555 Mono\n"
                     f"Pulse: {pw:.4f} s\n"
-                    f"Triggered: Yes"
+                    f"ln3*RC: {data.get('pulse_width_theoretical', pw):.4f} s\n"
+                    f"Pulses: {len(pulses)}"
                 )
 
+            elif mode == "netlist":
+                lines = [
+                    f"Type: Netlist (MNA)",
+                    f"Nodes: {len(data['nodes'])}",
+                    f"Elements: {data['elements']}",
+                    f"Step: {data['step']:.3g} s",
+                ]
+                for p in data["probes"][:4]:
+                    v = data["voltages"][data["nodes"].index(p)]
+                    lines.append(f"V({p}) end: {v[-1]:.3f} V")
+                return "\n".join(lines)
+
+            elif mode == "monte_carlo":
+                lines = [f"Type: Monte Carlo", f"Runs: {data['runs']}"]
+                for name, vals in data["metrics"].items():
+                    lines.append(
+                        f"{name}: {vals.mean():.4g} ± {vals.std():.2g}\n"
+                        f"  [{vals.min():.4g}, {vals.max():.4g}]"
+                    )
+                lines.append(f"Yield (±{data['spec_pct']:g}%): {data['yield']:.1f} %")
+                return "\n".join(lines)
+
             return "Unknown Mode"
 
         except Exception as e:
@@ -0,0 +1,217 @@
+from rich.segment import Segment
+from textual import events
+from textual.binding import Binding
+from textual.geometry import Region, Size
+from textual.message import Message
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+import data_model
+import expressions
+
+# virtualized spreadsheet for the data editor. nothing is copied into widgets:
+# render_line pulls only the visible cells out of the ColumnarTable, edits sit in
+# a sparse overlay {(row, col): text} until "Save & Return" commits them.
+
+class VirtualTable(ScrollView, can_focus=True):
+    COL_WIDTH = 15
+
+    DEFAULT_CSS = """
+    VirtualTable > .vtable--header {
+        text-style: bold;
+        background: $primary-darken-2;
+    }
+    VirtualTable > .vtable--cursor {
+        background: $accent;
+    }
+    VirtualTable > .vtable--dirty {
+        color: $warning;
+    }
+    """
+    COMPONENT_CLASSES = {"vtable--header", "vtable--cursor", "vtable--dirty"}
+
+    BINDINGS = [
+        Binding("up", "move(-1, 0)", show=False),
+        Binding("down", "move(1, 0)", show=False),
+        Binding("left", "move(0, -1)", show=False),
+        Binding("right", "move(0, 1)", show=False),
+        Binding("pageup", "page(-1)", show=False),
+        Binding("pagedown", "page(1)", show=False),
+        Binding("home", "jump(0)", show=False),
+        Binding("end", "jump(1)", show=False),
+        Binding("enter", "select_cell", "Edit cell"),
+    ]
+
+    class CellSelected(Message):
+        def __init__(self, table: "VirtualTable", row: int, col: int, value: str):
+            super().__init__()
+            self.table = table
+            self.row = row
+            self.col = col
+            self.value = value
+
+        @property
+        def control(self) -> "VirtualTable":
+            return self.table
+
+    def __init__(self, *, id: str = None, classes: str = None):
+        super().__init__(id=id, classes=classes)
+        self.load(data_model.ColumnarTable(["Label"], [], []))
+
+    # data
+    def load(self, table):
+        """Show table as the base, drops pending edits."""
+        self.base = table
+        self.dirty = {}
+        self.new_names = [] # series added in the editor
+        self.new_rows = 0   # rows added in the editor
+        self.new_formulas = {} # column -> expression, for added expression columns
+        self.cursor = (0, 0)
+        self._resize()
+
+    @property
+    def names(self) -> list:
+        return self.base.names + self.new_names
+
+    @property
+    def row_count(self) -> int:
+        return len(self.base) + self.new_rows
+
+    @property
+    def col_count(self) -> int:
+        return len(self.names)
+
+    def cell(self, row: int, col: int) -> str:
+        value = self.dirty.get((row, col))
+        if value is not None:
+            return value
+        if row >= len(self.base):
+            return "New" if col == 0 else "0.0"
+        if col >= len(self.base.names):
+            return "" if col in self.new_formulas else "0.0" # expressions fill in on commit
+        return self.base.cell_text(row, col)
+
+    def iter_rows(self):
+        for r in range(self.row_count):
+            yield [self.cell(r, c) for c in range(self.col_count)]
+
+    def set_cell(self, row: int, col: int, text: str):
+        self.dirty[(row, col)] = str(text)
+        self.refresh()
+
+    def add_row(self):
+        self.new_rows += 1
+        self._resize()
+
+    def add_series(self, name: str):
+        self.new_names.append(str(name))
+        self._resize()
+
+    def add_expression(self, name: str, expr: str):
+        """Expression column, computed on commit. Raises ExpressionError for bad ones."""
+        expressions.compile_expression(expr, tuple(self.names[1:]))
+        self.new_formulas[self.col_count] = expr
+        self.add_series(name)
+
+    def is_computed(self, col: int) -> bool:
+        return col in self.new_formulas or (col - 1) in self.base.formulas
+
+    def clear(self):
+        self.load(data_model.ColumnarTable(["Label"], [], []))
+
+    def commit(self):
+        """Applies the pending rows, series and changed cells to the base table."""
+        table = self.base
+        if self.new_rows:
+            table.add_row(count=self.new_rows)
+        for name in self.new_names:
+            expr = self.new_formulas.get(len(table.names))
+            if expr is None:
+                table.add_series(name)
+            else:
+                table.add_formula(name, expr)
+        for (row, col), text in self.dirty.items():
+            table.set_cell(row, col, text)
+        table.refresh_formulas() # only the ones reading an edited column
+        self.load(table)
+        return table
+
+    # rendering
+    def _resize(self):
+        self.virtual_size = Size(self.col_count * self.COL_WIDTH, self.row_count + 1)
+        self.refresh()
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        width = self.size.width
+        first = scroll_x // self.COL_WIDTH
+        last = min(self.col_count, first + width // self.COL_WIDTH + 2)
+        base_style = self.rich_style
+
+        if y == 0: # header stays on top
+            style = base_style + self.get_component_rich_style("vtable--header")
+            cells = [(n, style) for n in self.names[first:last]]
+        else:
+            row = scroll_y + y - 1
+            if row >= self.row_count:
+                return Strip.blank(width, base_style)
+            cursor = self.get_component_rich_style("vtable--cursor")
+            dirty = self.get_component_rich_style("vtable--dirty")
+            cells = []
+            for col in range(first, last):
+                style = base_style
+                if (row, col) in self.dirty:
+                    style = style + dirty
+                if self.has_focus and (row, col) == self.cursor:
+                    style = style + cursor
+                cells.append((self.cell(row, col), style))
+
+        segments = [Segment(f" {text}"[:self.COL_WIDTH - 1].ljust(self.COL_WIDTH), style)
+                    for text, style in cells]
+        offset = scroll_x - first * self.COL_WIDTH
+        return Strip(segments).crop(offset, offset + width).extend_cell_length(width, base_style)
+
+    # cursor
+    def _show_cursor(self):
+        row, col = self.cursor
+        region = Region(col * self.COL_WIDTH, row, self.COL_WIDTH, 2) # row + header line
+        self.scroll_to_region(region, animate=False, immediate=True)
+        self.refresh()
+
+    def move_cursor(self, row: int, col: int):
+        row = max(0, min(row, self.row_count - 1))
+        col = max(0, min(col, self.col_count - 1))
+        self.cursor = (row, col)
+        self._show_cursor()
+
+    def action_move(self, d_row: int, d_col: int):
+        self.move_cursor(self.cursor[0] + d_row, self.cursor[1] + d_col)
+
+    def action_page(self, direction: int):
+        self.move_cursor(self.cursor[0] + direction * max(1, self.size.height - 2), self.cursor[1])
+
+    def action_jump(self, end: int):
+        self.move_cursor(self.row_count - 1 if end else 0, self.cursor[1])
+
+    def action_select_cell(self):
+        row, col = self.cursor
+        if row < self.row_count and col < self.col_count:
+            self.post_message(self.CellSelected(self, row, col, self.cell(row, col)))
+
+    def on_click(self, event: events.Click):
+        scroll_x, scroll_y = self.scroll_offset
+        if event.y < 1:
+            return
+        target = (scroll_y + event.y - 1, (scroll_x + event.x) // self.COL_WIDTH)
+        if target[0] >= self.row_count or target[1] >= self.col_count:
+            return
+        if target == self.cursor: # second click on the same cell edits it
+            self.action_select_cell()
+        else:
+            self.move_cursor(*target)
+
+    def on_focus(self):
+        self.refresh()
+
+    def on_blur(self):
+        self.refresh()
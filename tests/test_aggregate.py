@@ -0,0 +1,23 @@
+import numpy as np
+
+import aggregate
+import data_model
+from sim_controller import SimulationController
+
+def test_group_without_valid_cells_is_nan_for_every_aggregate():
+    groups = aggregate.Groups(["a", "b", "a"])
+    values, valid = np.array([1.0, 5.0, 2.0]), np.array([True, False, True])
+    for how in ("sum", "mean", "min", "max"):
+        out = groups.aggregate(values, valid, how)
+        assert np.isnan(out[1]), how
+    assert groups.aggregate(values, valid, "sum")[0] == 3.0
+    assert groups.aggregate(values, valid, "count").tolist() == [2.0, 0.0]
+
+def test_grouped_skips_categories_and_dates():
+    t = data_model.ColumnarTable.from_rows(["Label", "n", "kind", "day"],
+                                           [["a", "1", "x", "2024-01-01"], ["a", "2", "y", "2024-01-02"],
+                                            ["b", "3", "x", "2024-01-03"]])
+    assert t.kinds == ["int", "category", "date"]
+    keys, series = SimulationController.grouped(t, "sum")
+    assert keys == ["a", "b"]
+    assert [s.tolist() for s in series] == [[3.0, 3.0]]
@@ -0,0 +1,45 @@
+import os
+
+import numpy as np
+import pytest
+
+import csv_cache
+import data_model
+
+@pytest.fixture
+def csv_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(csv_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    path = tmp_path / "data.csv"
+    path.write_text("Label,A\na,1\n", encoding="utf-8")
+    return str(path)
+
+def _entry_bytes(path):
+    entry = csv_cache._entry_dir(path)
+    return sum(os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry))
+
+def test_round_trip(csv_file):
+    table = data_model.ColumnarTable.from_rows(["Label", "A", "B"], [["a", "1", "x"], ["é,b", "", "y"]])
+    digest = csv_cache.quick_digest(csv_file)
+    assert csv_cache.save(csv_file, digest, table, False)
+    assert csv_cache.known_digest(csv_file) == digest
+    back, transposed = csv_cache.load(csv_file, digest)
+    assert not transposed
+    assert back.labels.tolist() == ["a", "é,b"]
+    assert back.kinds == table.kinds and back.categories == table.categories
+    assert back.valid[0].tolist() == [True, False]
+    assert csv_cache.load(csv_file, "other digest") is None
+
+def test_one_long_label_does_not_pad_the_rest(csv_file):
+    n = 10_000
+    labels = np.array(["r"] * n, dtype=object)
+    labels[0] = "x" * 5000
+    table = data_model.ColumnarTable(["Label", "A"], labels, [np.zeros(n)])
+    csv_cache.save(csv_file, "d", table, False)
+    # the old fixed-width array took 5000 * 4 bytes for every row
+    assert _entry_bytes(csv_file) < 200_000
+    assert csv_cache.load(csv_file, "d")[0].labels.tolist() == labels.tolist()
+
+def test_empty_table(csv_file):
+    csv_cache.save(csv_file, "d", data_model.ColumnarTable(["Label", "A"], [], [np.zeros(0)]), False)
+    back, _ = csv_cache.load(csv_file, "d")
+    assert len(back) == 0
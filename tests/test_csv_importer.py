@@ -0,0 +1,53 @@
+import csv
+
+import pytest
+
+import csv_importer
+
+ROWS = [["Label", "A", "B"]] + [[f"r{i}", str(i), f"{i * 0.5:g}"] for i in range(257)]
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "data.csv"
+    with open(path, "w", newline="") as f:
+        csv.writer(f).writerows(ROWS)
+    return str(path)
+
+def test_chunked_read_equals_a_plain_reader(csv_file):
+    store = csv_importer.stream_csv(csv_file, chunk_rows=10)
+    assert len(store) == len(ROWS) and store.width == 3
+    assert [list(r) for r in zip(*store.columns)] == ROWS
+    table = store.to_table()
+    assert table.series_names == ["A", "B"] and len(table) == 257
+    assert table.columns[0].tolist() == list(range(257))
+    assert table.labels.tolist() == [r[0] for r in ROWS[1:]]
+
+def test_progress_grows_to_one_and_stop_cancels(csv_file):
+    seen = []
+    csv_importer.stream_csv(csv_file, progress=seen.append, chunk_rows=50)
+    assert seen == sorted(seen) and seen[-1] == 1.0 and len(seen) > 2
+    with pytest.raises(csv_importer.ImportCancelled):
+        csv_importer.stream_csv(csv_file, should_stop=lambda: True, chunk_rows=50)
+
+def test_ragged_rows_are_padded():
+    store = csv_importer.ColumnStore()
+    store.append_rows([["a", "1"], ["b"]])
+    store.append_rows([["c", "3", "x"]])
+    assert store.columns == [["a", "b", "c"], ["1", "", "3"], ["", "", "x"]]
+
+def test_transposed_file_turns_rows_into_series():
+    store = csv_importer.ColumnStore()
+    store.append_rows([["Label", "1", "2", "3"], ["A", "10", "20", "30"]])
+    assert csv_importer.looks_transposed(store.first_row())
+    headers, cols = store.string_columns(transpose=True)
+    assert headers == ["Index", "Label", "A"]
+    assert cols == [["1", "2", "3"], ["1", "2", "3"], ["10", "20", "30"]]
+    assert not csv_importer.looks_transposed(["Label", "A", "B"])
+
+def test_read_many_keeps_the_order(tmp_path, csv_file):
+    other = tmp_path / "other.csv"
+    other.write_text("Label,C\nx,1\n")
+    seen = []
+    tables = csv_importer.read_many([str(other), csv_file], progress=seen.append)
+    assert [t.series_names for t in tables] == [["C"], ["A", "B"]]
+    assert seen[-1] == pytest.approx(1.0)
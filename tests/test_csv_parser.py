@@ -0,0 +1,71 @@
+import numpy as np
+
+import csv_parser
+import data_model
+
+def test_stray_token_keeps_the_column_numeric():
+    out, ok, kind, categories = csv_parser.parse_column(["10", "20", "x", "40"] * 10)
+    assert kind == "float"
+    assert categories is None
+    assert out[:4][ok[:4]].tolist() == [10.0, 20.0, 40.0]
+    assert ok.tolist() == [True, True, False, True] * 10
+
+def test_text_column_is_category():
+    out, ok, kind, categories = csv_parser.parse_column(["north", "south", "1", "east"])
+    assert kind == "category"
+    assert categories == ["1", "east", "north", "south"]
+    assert ok.all()
+
+def test_dot_decimals_with_three_digits():
+    # three fractional digits used to match the "." thousands pattern, 1000x off
+    out, ok, kind, _ = csv_parser.parse_column(["0.125", "1.250", "2.500"])
+    assert kind == "float"
+    assert out.tolist() == [0.125, 1.25, 2.5]
+
+def test_decimal_commas():
+    out, _, kind, _ = csv_parser.parse_column(["0,125", "1,250", "2,500"])
+    assert kind == "float"
+    assert out.tolist() == [0.125, 1.25, 2.5]
+    out, _, _, _ = csv_parser.parse_column(["1.234,5", "2,5"])
+    assert out.tolist() == [1234.5, 2.5]
+
+def test_comma_alone_is_a_thousands_separator():
+    out, _, kind, _ = csv_parser.parse_column(["1,250", "2,500"])
+    assert kind == "int"
+    assert out.tolist() == [1250, 2500]
+    out, _, kind, _ = csv_parser.parse_column(["1,234.5", "2.5", "12,345"])
+    assert kind == "float"
+    assert out.tolist() == [1234.5, 2.5, 12345.0]
+
+def test_badly_grouped_numbers_are_invalid():
+    out, ok, kind, _ = csv_parser.parse_column(["1,2,3", "4", "5", "6"])
+    assert ok.tolist() == [False, True, True, True]
+    assert out[ok].tolist() == [4, 5, 6]
+    out, ok, _, _ = csv_parser.parse_column(["1,234,567", "1,23,456", "1 000", "7"])
+    assert ok.tolist() == [True, False, True, True]
+    assert out[ok].tolist() == [1234567, 1000, 7]
+
+def test_missing_cells_are_no_category():
+    out, ok, kind, categories = csv_parser.parse_column(["x", "", "y", "NA"])
+    assert kind == "category"
+    assert categories == ["x", "y"]
+    assert ok.tolist() == [True, False, True, False]
+    assert out[ok].tolist() == [0, 1]
+
+def test_missing_cells_are_invalid():
+    out, ok, kind, _ = csv_parser.parse_column(["1", "", "NA", "4", "null"])
+    assert kind == "float" # NaN needs floats
+    assert ok.tolist() == [True, False, False, True, False]
+    assert out[ok].tolist() == [1.0, 4.0]
+
+def test_bad_date_only_invalidates_its_cell():
+    out, ok, kind, _ = csv_parser.parse_column(
+        ["2020-01-01", "2020-01-02", "bad", "2020-01-04 10:00", "2020-01-05"])
+    assert kind == "date"
+    assert ok.tolist() == [True, True, False, True, True]
+    assert out[3] == np.datetime64("2020-01-04T10:00", "s").astype(np.int64)
+
+def test_table_series_of_a_mixed_column():
+    table = data_model.ColumnarTable.from_rows(["Label", "A"], [["a", "1"], ["b", "oops"], ["c", "3"], ["d", "4"]])
+    assert table.kinds == ["float"]
+    assert table.valid_values(0).tolist() == [1.0, 3.0, 4.0]
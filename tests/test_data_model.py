@@ -0,0 +1,58 @@
+import numpy as np
+
+import data_model
+
+ROWS = [["a", "1", "0.5", "red", "2024-01-02"],
+        ["b", "2", "", "blue", "2024-01-03"],
+        ["c", "3", "1.5", "red", ""]]
+NAMES = ["Label", "N", "F", "Color", "Day"]
+
+def test_columns_are_typed_once():
+    table = data_model.ColumnarTable.from_rows(NAMES, ROWS)
+    assert table.kinds == ["int", "float", "category", "date"]
+    assert table.numeric_series() == [0, 1]
+    assert table.columns[0].dtype.kind == "i" and table.columns[0].tolist() == [1, 2, 3]
+    assert table.valid_values(1).tolist() == [0.5, 1.5]
+    assert table.categories[2] == ["blue", "red"] and table.columns[2].tolist() == [1, 0, 1]
+
+def test_state_round_trip_keeps_the_cell_text():
+    table = data_model.ColumnarTable.from_rows(NAMES, ROWS)
+    state = table.to_state()
+    assert state["columns"] == NAMES
+    assert state["rows"] == [["a", "1", "0.5", "red", "2024-01-02"],
+                             ["b", "2", "", "blue", "2024-01-03"],
+                             ["c", "3", "1.5", "red", ""]]
+    again = data_model.ColumnarTable.from_state(state)
+    assert again.kinds == table.kinds
+    for a, b in zip(again.columns, table.columns):
+        np.testing.assert_array_equal(a, b)
+
+def test_edits_retype_and_bump_versions():
+    table = data_model.ColumnarTable.from_rows(NAMES, ROWS)
+    table.set_cell(0, 1, "1.5")
+    assert table.kinds[0] == "float" and table.columns[0].tolist() == [1.5, 2.0, 3.0]
+    table.set_cell(1, 1, "text") # not a number, cell goes invalid
+    assert not table.valid[0][1] and table.versions[0] == 2
+    table.set_cell(2, 3, "green")
+    assert table.categories[2] == ["blue", "red", "green"] and table.cell_text(2, 3) == "green"
+    table.set_cell(0, 0, "z")
+    assert table.labels[0] == "z" and table.label_version == 1
+
+def test_new_rows_and_series():
+    table = data_model.ColumnarTable.from_rows(NAMES, ROWS)
+    table.add_row("d", count=2)
+    assert len(table) == 5 and table.labels.tolist()[-2:] == ["d", "d"]
+    # numbers start at the fill value, dates and categories start empty
+    assert [v[-1] for v in table.valid] == [True, True, False, False]
+    table.add_series("G", fill=3.0)
+    assert table.series_names[-1] == "G" and table.columns[-1].tolist() == [3.0] * 5
+
+def test_snapshot_and_copy_are_isolated():
+    table = data_model.ColumnarTable.from_rows(NAMES, ROWS)
+    snap = table.snapshot()
+    own = table.copy()
+    table.add_series("G")
+    table.set_cell(0, 2, "9")
+    assert snap.n_series == 4 and own.n_series == 4
+    assert snap.columns[1][0] == 9.0 # arrays are shared, only the lists are not
+    assert own.columns[1][0] == 0.5
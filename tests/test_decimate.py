@@ -0,0 +1,56 @@
+import numpy as np
+
+import decimate
+
+def _signal(n=100_003):
+    rng = np.random.default_rng(5)
+    y = np.cumsum(rng.normal(size=n))
+    y[4321] = 1e6 # one spike
+    return y
+
+def test_minmax_keeps_every_bucket_extreme():
+    y = _signal()
+    idx = decimate.minmax_indices(y, 1000)
+    assert len(idx) <= 1002 and np.all(np.diff(idx) > 0)
+    assert idx[0] == 0 and idx[-1] == len(y) - 1
+    size = -(-len(y) // 500)
+    for b in range(0, len(y), size):
+        chunk = y[b:b + size]
+        kept = y[idx[(idx >= b) & (idx < b + size)]]
+        assert chunk.min() in kept and chunk.max() in kept
+
+def test_minmax_skips_nan_and_leaves_small_series():
+    y = np.array([np.nan, 1.0, 5.0, np.nan, -2.0, 3.0, np.nan, 0.0] * 100)
+    kept = y[decimate.minmax_indices(y, 100)]
+    assert np.nanmin(kept) == -2.0 and np.nanmax(kept) == 5.0
+    assert np.isnan(kept).sum() <= 1 # only the first sample, which is always kept
+    x, small = decimate.decimate(None, [3.0, 1.0, 2.0], 400)
+    assert small.tolist() == [3.0, 1.0, 2.0] and x.tolist() == [0.0, 1.0, 2.0]
+
+def test_lttb_picks_n_points_in_order_and_keeps_the_spike():
+    y = _signal()
+    x = np.linspace(0, 1, len(y))
+    idx = decimate.lttb_indices(x, y, 500)
+    assert len(idx) == 500 and idx[0] == 0 and idx[-1] == len(y) - 1
+    assert np.all(np.diff(idx) > 0)
+    assert 4321 in idx
+    xs, ys = decimate.decimate(x, y, 500, method="lttb")
+    np.testing.assert_array_equal(xs, x[idx])
+    np.testing.assert_array_equal(ys, y[idx])
+
+def test_lttb_on_a_line_stays_on_the_line():
+    x = np.arange(10_000, dtype=np.float64)
+    xs, ys = decimate.decimate(x, 2 * x + 1, 300, method="lttb")
+    np.testing.assert_allclose(ys, 2 * xs + 1)
+
+def test_bars_slices_and_ticks():
+    a = np.zeros(1000)
+    b = np.zeros(1000)
+    a[17], b[903] = 5.0, -9.0
+    rows = decimate.peak_rows([a, b], 100)
+    assert len(rows) == 100 and 17 in rows and 903 in rows
+    vals, labels = decimate.top_slices([5, -1, 8, 2, 3], list("abcde"), 3)
+    assert vals.tolist() == [5.0, 8.0, 6.0] and labels == ["a", "c", "Other"]
+    ticks = decimate.tick_positions(1000, 12)
+    assert len(ticks) == 12 and ticks[0] == 0 and ticks[-1] == 999
+    assert decimate.tick_positions(5, 12).tolist() == [0, 1, 2, 3, 4]
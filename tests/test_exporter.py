@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+import decimate
+import exporter
+
+class _Plt:
+    """Records what the export hands to matplotlib."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+    def called(self, name):
+        return [(args, kwargs) for n, args, kwargs in self.calls if n == name]
+
+@pytest.fixture
+def plt(monkeypatch):
+    recorder = _Plt()
+    monkeypatch.setattr(exporter, "_setup_and_save", lambda filename, title, plot: plot(recorder))
+    return recorder
+
+def _data(n):
+    rng = np.random.default_rng(1)
+    series = [rng.normal(size=n), rng.normal(size=n)]
+    series[0][n // 3] = 50.0 # a spike the thinning has to keep
+    return {"labels": np.array([f"r{i}" for i in range(n)], dtype=object),
+            "series": series, "names": ["a", "b"]}
+
+@pytest.mark.parametrize("mode", ["line", "area", "scatter", "bar"])
+def test_big_table_is_thinned(plt, mode):
+    exporter.export_generic_plot(_data(200_000), mode=mode, filename="x.png")
+    drawn = plt.called({"line": "plot", "area": "plot", "scatter": "scatter", "bar": "bar"}[mode])
+    assert len(drawn) == 2
+    for args, _ in drawn:
+        assert len(args[1]) <= exporter.EXPORT_POINTS + 2
+    assert max(drawn[0][0][1]) == 50.0
+    (positions, names), _ = plt.called("xticks")[0]
+    assert len(positions) == len(names) <= exporter.EXPORT_TICKS
+
+def test_pie_keeps_the_largest_slices(plt):
+    data = _data(200_000)
+    exporter.export_generic_plot(data, mode="pie", filename="x.png")
+    (vals,), kwargs = plt.called("pie")[0]
+    assert len(vals) == len(kwargs["labels"]) == decimate.PIE_SLICES
+    assert kwargs["labels"][-1] == "Other"
+    assert vals.sum() == pytest.approx(np.abs(data["series"][0]).sum())
+
+def test_small_table_is_drawn_as_it_is(plt):
+    data = {"labels": ["a", "b", "c"], "series": [np.array([1.0, 3.0, 2.0])], "names": ["s"]}
+    exporter.export_generic_plot(data, mode="line", filename="x.png")
+    (x, y), _ = plt.called("plot")[0]
+    assert y.tolist() == [1.0, 3.0, 2.0]
+    assert plt.called("xticks")[0][0][1] == ["a", "b", "c"]
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+import data_model
+import expressions
+
+def _table():
+    return data_model.ColumnarTable(["Label", "A", "B"], list("abcde"),
+                                    [[1.0, 2.0, 3.0, 4.0, 5.0], [2.0, 2.0, 2.0, 2.0, 2.0]])
+
+@pytest.mark.parametrize("expr", ["rolling_mean(A, B)", "rolling_sum(A, 2.5)", "rolling_std(A, 0)",
+                                  "rolling_mean(A, -3)", "shift(A, B)", "shift(A, 1 + 1)"])
+def test_windows_must_be_literal_whole_numbers(expr):
+    with pytest.raises(expressions.ExpressionError):
+        expressions.compile_expression(expr, ("A", "B"))
+
+def test_rolling_and_shift():
+    t = _table()
+    t.add_formula("M", "rolling_mean(A, 2)")
+    t.add_formula("P", "shift(A, -1)")
+    assert t.valid[2].tolist() == [False, True, True, True, True]
+    assert t.columns[2][1:].tolist() == [1.5, 2.5, 3.5, 4.5]
+    assert t.columns[3][:4].tolist() == [2.0, 3.0, 4.0, 5.0]
+    t.add_formula("Q", "shift(A, 10)") # past the end, all missing
+    assert not t.valid[4].any()
+
+def test_bad_formula_leaves_the_table_alone():
+    t = _table()
+    with pytest.raises(expressions.ExpressionError):
+        t.add_formula("M", "rolling_mean(A, B)")
+    assert t.names == ["Label", "A", "B"] and t.formulas == {}
+    t.refresh_formulas()
+
+def test_saved_formula_that_no_longer_compiles_loads_as_values():
+    t = data_model.ColumnarTable(["Label", "A", "M"], list("ab"), [[1.0, 2.0], [7.0, 8.0]],
+                                 formulas={1: "rolling_mean(A, A)"})
+    assert t.formulas == {}
+    assert t.columns[1].tolist() == [7.0, 8.0]
+
+def test_formula_follows_edits():
+    t = _table()
+    t.add_formula("C", "A * B")
+    t.set_cell(0, 1, "10")
+    t.refresh_formulas()
+    assert t.columns[2][0] == 20.0
+    assert np.isfinite(t.columns[2]).all()
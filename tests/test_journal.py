@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+import data_model
+import workspace_manager
+
+@pytest.fixture(autouse=True)
+def in_tmp(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path) # workspace and journal files are relative
+
+def _table():
+    return data_model.ColumnarTable(["Label", "A"], ["a", "b"], [[1.0, 2.0]])
+
+def _cells(rows, edits, names=("Label", "A"), draft=False):
+    entry = {"op": "cells", "rows": rows, "names": list(names), "formulas": {}, "edits": edits}
+    return dict(entry, draft=True) if draft else entry
+
+def test_committed_drafts_are_applied_discarded_ones_are_not():
+    entries = [_cells(2, [[0, 1, "10"]], draft=True), {"op": "commit"},
+               _cells(2, [[1, 1, "20"]], draft=True), {"op": "discard"},
+               {"op": "inputs", "values": {"rc_res": "1000"}}]
+    table, errors, open_drafts = workspace_manager.replay_all(_table(), entries)
+    assert errors == [] and open_drafts == 0
+    assert table.columns[0].tolist() == [10.0, 2.0]
+
+def test_drafts_left_open_are_kept():
+    entries = [_cells(3, [[2, 0, "c"], [2, 1, "5"]], draft=True)]
+    table, errors, open_drafts = workspace_manager.replay_all(_table(), entries)
+    assert open_drafts == 1
+    assert table.labels.tolist() == ["a", "b", "c"]
+    assert table.cell_text(2, 1) == "5.0"
+
+def test_draft_import_is_dropped_with_its_discard():
+    entries = [{"op": "clear", "draft": True}, {"op": "discard"}]
+    table, _, _ = workspace_manager.replay_all(_table(), entries)
+    assert len(table) == 2
+
+def test_cells_entries_are_idempotent():
+    entry = _cells(3, [[2, 1, "7"]], names=("Label", "A", "B"))
+    once = workspace_manager.replay(_table(), entry)
+    twice = workspace_manager.replay(workspace_manager.replay(_table(), entry), entry)
+    assert once.names == twice.names == ["Label", "A", "B"]
+    assert len(once) == len(twice) == 3
+    for a, b in zip(once.columns, twice.columns):
+        np.testing.assert_array_equal(a, b)
+
+def test_failing_entry_is_reported_and_skipped():
+    entries = [{"op": "import", "path": "gone.csv", "digest": "x"}, _cells(2, [[0, 1, "9"]])]
+    table, errors, _ = workspace_manager.replay_all(_table(), entries)
+    assert len(errors) == 1 and "gone.csv" in errors[0]
+    assert table.columns[0][0] == 9.0
+
+def test_torn_last_line_is_dropped():
+    with open(workspace_manager.JOURNAL_FILE, "w", encoding="utf-8") as f:
+        f.write('{"op": "commit"}\n{"op": "discard"}\n{"op": "cel')
+    assert workspace_manager.read_journal() == [{"op": "commit"}, {"op": "discard"}]
+
+def test_writer_survives_a_bad_snapshot_and_entry():
+    journal = workspace_manager.Journal()
+    journal.compact({"odd": object()}) # json.dumps raises, the thread has to live on
+    journal.append({"op": "inputs", "values": {"bad": object()}})
+    journal.append({"op": "inputs", "values": {"rc_res": "1000"}})
+    journal.close()
+    assert workspace_manager.read_journal() == [{"op": "inputs", "values": {"rc_res": "1000"}}]
+
+def test_snapshot_round_trip_empties_the_journal():
+    journal = workspace_manager.Journal()
+    journal.append(_cells(2, []))
+    journal.close({"active_tab": "view_general", "data_view": workspace_manager.snapshot(_table())})
+    assert workspace_manager.read_journal() == []
+    state = workspace_manager.load_workspace()
+    assert state["active_tab"] == "view_general"
+    assert state["data_view"].load().columns[0].tolist() == [1.0, 2.0]
@@ -0,0 +1,23 @@
+import pytest
+
+import data_model
+import merge
+
+def _table(rows):
+    return data_model.ColumnarTable.from_rows(["Key", "x"], rows)
+
+def test_join_lines_up_labels():
+    out = merge.join([_table([["a", "1"], ["b", "2"]]), _table([["b", "5"], ["c", "6"]])], ["j1", "j2"])
+    assert out.labels.tolist() == ["a", "b", "c"]
+    assert out.names == ["Key", "x", "x (j2)"]
+    assert out.valid[1].tolist() == [False, True, True]
+    assert out.columns[1][1:].tolist() == [5, 6]
+
+def test_join_refuses_repeated_labels():
+    dup = _table([["a", "1"], ["b", "2"], ["a", "3"], ["b", "4"], ["c", "5"]])
+    with pytest.raises(merge.MergeError, match="j2 repeats labels 'a', 'b',"):
+        merge.join([_table([["a", "1"]]), dup], ["j1", "j2"])
+
+def test_concat_keeps_repeated_labels():
+    out = merge.concat([_table([["a", "1"]]), _table([["a", "2"]])])
+    assert out.labels.tolist() == ["a", "a"]
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+import mna_solver
+
+RC = """
+V1 in 0 STEP 5
+R1 in out 1k
+C1 out 0 10u
+"""
+
+def test_values_use_spice_suffixes():
+    assert mna_solver.parse_value("4.7k") == 4700.0
+    assert mna_solver.parse_value("10u") == pytest.approx(1e-5)
+    assert mna_solver.parse_value("1meg") == 1e6
+    assert mna_solver.parse_value("2m") == pytest.approx(2e-3) # milli, not mega
+    assert mna_solver.parse_value("100ohm") == 100.0
+    with pytest.raises(ValueError):
+        mna_solver.parse_value("abc")
+
+def test_single_rc_matches_backward_euler_and_the_analytic_curve():
+    res = mna_solver.simulate_transient(RC, duration=0.05, points=5001)
+    out = res["voltages"][res["nodes"].index("out")]
+    h, tau = res["step"], 0.01
+    # same recurrence by hand: (v - v_prev)/h = (5 - v)/tau
+    ref = np.zeros(len(out))
+    for i in range(1, len(ref)):
+        ref[i] = (ref[i - 1] + h / tau * 5.0) / (1 + h / tau)
+    np.testing.assert_allclose(out, ref, rtol=1e-10, atol=1e-12)
+    np.testing.assert_allclose(out, 5.0 * (1 - np.exp(-res["time"] / tau)), atol=5e-3)
+
+def test_ladder_matches_a_dense_solve():
+    stages, points = 30, 400
+    res = mna_solver.simulate_transient(mna_solver.rc_ladder_netlist(stages, r=1e3, c_uf=1.0),
+                                        duration=0.2, points=points)
+    # node k is n{k+1}, the source node n0 is driven directly
+    n = stages + 1
+    G = np.zeros((n + 1, n + 1))
+    Cm = np.zeros((n + 1, n + 1))
+    for k in range(stages):
+        a, b = k, k + 1
+        G[a, a] += 1e-3; G[b, b] += 1e-3; G[a, b] -= 1e-3; G[b, a] -= 1e-3
+        Cm[b, b] += 1e-6
+    G[0, n] = G[n, 0] = 1.0
+    h = res["step"]
+    A = G + Cm / h
+    x = np.zeros(n + 1)
+    ref = [x]
+    for i in range(1, points):
+        x = np.linalg.solve(A, Cm / h @ x + np.eye(n + 1)[n] * 5.0)
+        ref.append(x)
+    ref = np.array(ref)
+    order = [res["nodes"].index(f"n{k}") for k in range(n)]
+    np.testing.assert_allclose(res["voltages"][order].T, ref[:, :n], atol=1e-9)
+    assert res["probes"] == ["n1", "n15", "n30"]
+
+def test_floating_node_is_reported():
+    with pytest.raises(ValueError, match="singular"):
+        mna_solver.simulate_transient("V1 a 0 DC 1\nC1 b c 1u\n", duration=1.0)
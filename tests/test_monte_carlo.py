@@ -0,0 +1,29 @@
+import numpy as np
+
+import monte_carlo
+
+NOMINAL = {"r1": 1000.0, "r2": 10000.0, "c": 10.0}
+TOL = {"r": 5.0, "c": 10.0}
+
+def test_pool_follows_the_worker_count():
+    try:
+        first = monte_carlo._executor(2)
+        assert monte_carlo._executor(2) is first
+        second = monte_carlo._executor(3)
+        assert second is not first and second._max_workers == 3
+    finally:
+        monte_carlo._pool.shutdown()
+        monte_carlo._pool = None
+
+def test_same_result_with_and_without_the_pool():
+    runs = 2 * monte_carlo.BATCH_SIZE + 10
+    serial = monte_carlo.run_tolerance_analysis("circuit_555", NOMINAL, TOL, runs, seed=7, workers=1)
+    try:
+        pooled = monte_carlo.run_tolerance_analysis("circuit_555", NOMINAL, TOL, runs, seed=7, workers=2)
+    finally:
+        if monte_carlo._pool is not None:
+            monte_carlo._pool.shutdown()
+            monte_carlo._pool = None
+    assert serial["runs"] == pooled["runs"] == runs
+    for name in serial["metrics"]:
+        np.testing.assert_array_equal(serial["metrics"][name], pooled["metrics"][name])
@@ -0,0 +1,54 @@
+import math
+
+import numpy as np
+import pytest
+
+import ode_solver
+
+def _decay(t, y):
+    return -y
+
+def test_decay_matches_exp_within_tolerance():
+    t, y = ode_solver.integrate(_decay, 0.0, 5.0, [1.0], rtol=1e-6, atol=1e-9)
+    assert t[0] == 0.0 and t[-1] == 5.0
+    np.testing.assert_allclose(y[:, 0], np.exp(-t), atol=1e-5)
+
+def test_stiff_system_does_not_step_at_tau():
+    # tau = 1 us over one second, an explicit pair would need ~1e6 steps
+    t, y = ode_solver.integrate(lambda t, y: (1.0 - y) / 1e-6, 0.0, 1.0, [0.0])
+    assert len(t) < 500
+    assert y[-1, 0] == pytest.approx(1.0, abs=1e-6)
+
+def test_breakpoints_are_hit_exactly_and_recorded_twice():
+    def flip(t, y):
+        return -y
+    t, y = ode_solver.integrate(lambda t, y: np.zeros(1), 0.0, 1.0, [2.0],
+                                breakpoints=[(0.3, flip), 0.7])
+    at = np.flatnonzero(t == 0.3)
+    assert len(at) == 2 and y[at].ravel().tolist() == [2.0, -2.0]
+    assert np.count_nonzero(t == 0.7) == 1 # plain breakpoint, no state change
+
+def test_event_is_located_on_the_dense_output():
+    crossings = []
+    ev = ode_solver.Event(lambda t, y: y[0] - 0.5, lambda t, y: crossings.append((t, y[0])), direction=-1)
+    ode_solver.integrate(_decay, 0.0, 3.0, [1.0], rtol=1e-7, atol=1e-9, events=[ev])
+    assert len(crossings) == 1
+    t, v = crossings[0]
+    # exact on the numerical trajectory, the time itself carries the rtol
+    assert v == pytest.approx(0.5, abs=1e-12)
+    assert t == pytest.approx(math.log(2), rel=1e-5)
+
+def test_terminal_event_stops_the_run():
+    ev = ode_solver.Event(lambda t, y: y[0] - 0.25, direction=-1, terminal=True)
+    t, y = ode_solver.integrate(_decay, 0.0, 10.0, [1.0], events=[ev])
+    assert t[-1] == pytest.approx(math.log(4), rel=1e-3)
+    assert y[-1, 0] == pytest.approx(0.25, abs=1e-12)
+
+def test_progress_is_reported_in_percent():
+    seen = []
+    ode_solver.integrate(_decay, 0.0, 1.0, [1.0], max_step=1e-3,
+                         progress=lambda done, total: seen.append((done, total)))
+    assert seen and all(total == 100 for _, total in seen)
+    assert seen == sorted(seen) and seen[-1][0] >= 99
+    with pytest.raises(ValueError):
+        ode_solver.integrate(_decay, 1.0, 1.0, [1.0])
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+import pyramid
+
+def _values(n=100_001):
+    rng = np.random.default_rng(11)
+    y = rng.normal(size=n)
+    y[::997] = np.nan # gaps in the data
+    return y
+
+def test_levels_hold_block_min_max():
+    y = _values(1000)
+    pyr = pyramid.MinMaxPyramid(y)
+    for k, (lo, hi) in enumerate(pyr.levels, 1):
+        size = 1 << k
+        assert len(lo) == -(-len(y) // size)
+        for b in (0, len(lo) // 2, len(lo) - 1):
+            block = y[b * size:(b + 1) * size]
+            if np.isnan(block).all():
+                continue
+            assert lo[b] == np.nanmin(block) and hi[b] == np.nanmax(block)
+
+@pytest.mark.parametrize("start, stop", [(0, 100_001), (12_345, 67_890), (99_000.5, 100_001), (3, 2_000)])
+def test_query_envelope_matches_raw_slices(start, stop):
+    y = _values()
+    pyr = pyramid.MinMaxPyramid(y)
+    xs, ys = pyr.query(start, stop, 400)
+    assert len(xs) == len(ys) <= 2 * 400 + 4
+    lo_i, hi_i = int(start), int(np.ceil(stop))
+    raw = y[lo_i:hi_i]
+    # edge blocks can take in samples just outside the range, up to a block away
+    assert np.nanmin(ys) <= np.nanmin(raw) and np.nanmax(ys) >= np.nanmax(raw)
+    reach = 4 * (hi_i - lo_i) // 400 + 1 # blocks are under 2 * span / (n_points / 2)
+    near = y[max(0, lo_i - reach):hi_i + reach]
+    assert np.isin(ys[np.isfinite(ys)], near).all()
+    assert xs.min() >= lo_i and xs.max() <= hi_i - 1
+    assert np.all(np.diff(xs) >= 0)
+
+def test_whole_series_envelope_is_exact():
+    y = _values()
+    xs, ys = pyramid.MinMaxPyramid(y).query(0, len(y), 400)
+    assert np.nanmin(ys) == np.nanmin(y) and np.nanmax(ys) == np.nanmax(y)
+
+def test_small_ranges_are_the_raw_samples():
+    y = _values()
+    xs, ys = pyramid.MinMaxPyramid(y).query(500, 600, 400)
+    np.testing.assert_array_equal(xs, np.arange(500, 600))
+    np.testing.assert_array_equal(ys, y[500:600])
+    assert len(pyramid.MinMaxPyramid(y).query(10, 10, 400)[0]) == 0
+
+def test_window_zooms_and_pans_inside_the_series():
+    assert pyramid.window(1000, None) == (0.0, 1000.0)
+    start, stop = pyramid.window(1000, None, zoom=0.5)
+    assert (start, stop) == (250.0, 750.0)
+    assert pyramid.window(1000, (start, stop), shift=1.0) == (500.0, 1000.0) # clamped at the end
+    assert pyramid.window(1000, (0.0, 10.0), zoom=0.1) == (1.0, 9.0) # never below 8 samples
@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from rich.text import Text
+
+from sim_controller import SimulationController
+
+class _App:
+    """Just enough of GrafTUI for _finish."""
+    _sim_run_id = 1
+
+    def __init__(self):
+        self.logged = []
+
+    def query_one(self, *args):
+        return SimpleNamespace(refresh=lambda: None, update=lambda **kwargs: None)
+
+    def log_msg(self, msg):
+        self.logged.append(msg)
+
+def test_cache_summary_survives_log_markup():
+    app = _App()
+    SimulationController._finish(app, 1, lambda r: "RC Step: 2 curves.", None, True)
+    # system_log is a RichLog with markup on, main.log_msg prefixes the time
+    shown = Text.from_markup(f"[12:00:00] {app.logged[0]}").plain
+    assert shown.startswith("[12:00:00] RC Step: 2 curves. [cache ")
+    assert "hit /" in shown and shown.endswith(" MB]")
+
+def test_astable_export_shares_the_plot_cache_entry(tmp_path):
+    pytest.importorskip("matplotlib")
+    import exporter
+    import simulators
+    data = simulators.calculate_555_astable(1000, 10000, 10)
+    SimulationController.astable_samples(data, 4000)
+    hits = SimulationController.CACHE.hits
+    exporter.export_555_astable(data, str(tmp_path / "a.png"))
+    assert SimulationController.CACHE.hits == hits + 1
+
+def test_square_render_leaves_the_cache_entry_alone(monkeypatch):
+    import simulators
+    monkeypatch.setattr(SimulationController, "_prepare_plot",
+                        staticmethod(lambda app, title: (SimpleNamespace(), "white")))
+    monkeypatch.setattr(SimulationController, "_main_points", staticmethod(lambda app: 100))
+    monkeypatch.setattr(SimulationController, "_plot", staticmethod(lambda *a, **k: None))
+    monkeypatch.setattr(SimulationController, "_update_elec_stats", staticmethod(lambda *a: None))
+    values = {"#rc_voltage": "5", "#rc_cap": "1", "#rc_mode": "square", "#sim_duration": "0",
+              "#rc_freq": "250", "#rc_res": "1000", "#sim_solver": "exact"}
+    app = _App()
+    app.query_one = lambda wid, *a: SimpleNamespace(value=values[wid])
+    SimulationController.CACHE.clear()
+    rendered = [] # compute and render in place, no worker
+    monkeypatch.setattr(SimulationController, "_dispatch", staticmethod(
+        lambda app, label, compute, render, **kw: rendered.append(render(compute(lambda: False)))))
+    SimulationController.run_rc_filter(app)
+    cached = SimulationController.CACHE.get(SimulationController._key("rc_square", 5.0, 1.0, 1000.0, 250.0, "exact"))
+    assert rendered and "freq" not in cached
+    assert app.last_data["freq"] == 250.0
+
+def test_pie_cloud_is_deterministic_and_follows_the_slices():
+    import numpy as np
+    values = [1.0, 3.0, -4.0] # negative slices are drawn by size
+    first = SimulationController.pie_cloud(values, 8000)
+    again = SimulationController.pie_cloud(values, 8000)
+    assert len(first) == 3
+    for (x1, y1), (x2, y2) in zip(first, again):
+        np.testing.assert_array_equal(x1, x2)
+        np.testing.assert_array_equal(y1, y2)
+    sizes = np.array([len(x) for x, _ in first])
+    assert sizes.sum() == 8000
+    np.testing.assert_allclose(sizes / 8000, [0.125, 0.375, 0.5], atol=0.02)
+    edges = [0, 45, 180, 360]
+    for k, (x, y) in enumerate(first):
+        angle = np.degrees(np.arctan2(y, x / 1.8)) % 360
+        assert np.all((angle >= edges[k] - 1e-9) & (angle <= edges[k + 1] + 1e-9))
+        assert np.all((x / 1.8) ** 2 + y ** 2 <= 1 + 1e-12)
+    assert SimulationController.pie_cloud([0.0, 0.0], 100) == []
@@ -0,0 +1,176 @@
+import math
+
+import numpy as np
+import pytest
+
+import simulators
+
+def _euler_square_wave(v_in, tau, frequency_hz, cycles, points):
+    # the old per-sample loop, accurate once dt << tau
+    period = 1.0 / frequency_hz
+    t = np.linspace(0, cycles * period, points)
+    dt = t[1] - t[0]
+    out = np.empty(points)
+    v = 0.0
+    for i, time_val in enumerate(t):
+        target = v_in if (time_val % period) < period / 2 else 0.0
+        out[i] = v
+        v += (target - v) * (dt / tau)
+    return t, out
+
+def test_square_wave_matches_a_fine_step_reference():
+    res = simulators.calculate_square_wave_response(5.0, 10.0, 1000.0, 20.0, cycles=3, points=400)
+    t_ref, v_ref = _euler_square_wave(5.0, 0.01, 20.0, 3, 200_001)
+    ref = np.interp(res["time"], t_ref, v_ref)
+    # edges are vertical in the reference only to within one step, skip them
+    period = 1 / 20.0
+    phase = np.mod(res["time"], period / 2)
+    away = (phase > 1e-4) & (phase < period / 2 - 1e-4)
+    np.testing.assert_allclose(res["output_wave"][away], ref[away], atol=2e-3)
+
+def test_square_wave_settles_to_the_steady_state_swing():
+    # after many cycles every High half starts at V*a/(1+a)
+    res = simulators.calculate_square_wave_response(1.0, 1.0, 1000.0, 500.0, cycles=40, points=40 * 64 + 1)
+    a = math.exp(-1e-3 / 1e-3)
+    starts = res["output_wave"][::64]
+    assert abs(starts[-1] - a / (1 + a)) < 1e-9
+
+def test_square_wave_adaptive_agrees_with_exact():
+    exact = simulators.calculate_square_wave_response(5.0, 10.0, 1000.0, 20.0, cycles=3)
+    adaptive = simulators.calculate_square_wave_response(5.0, 10.0, 1000.0, 20.0, cycles=3, method="adaptive")
+    t = adaptive["time"]
+    assert t[0] == 0 and t[-1] == exact["time"][-1]
+    # evaluate the closed form at the adaptive sample times, right-hand value at edges
+    period = 1 / 20.0
+    k = np.floor(t / (period / 2) + 1e-12).astype(int)
+    a = math.exp(-(period / 2) / 0.01)
+    v = 0.0
+    starts = []
+    for j in range(k.max() + 1):
+        starts.append(v)
+        target = 5.0 if j % 2 == 0 else 0.0
+        v = target + (v - target) * a
+    target = np.where(k % 2 == 0, 5.0, 0.0)
+    expected = target + (np.array(starts)[k] - target) * np.exp(-(t - k * period / 2) / 0.01)
+    np.testing.assert_allclose(adaptive["output_wave"], expected, atol=5e-3)
+
+def test_rc_sweep_rows_match_the_per_curve_formula():
+    sweep = simulators.calculate_rc_sweep([5.0, 12.0], [1.0, 22.0], [100.0, 1000.0, 4700.0], points=200)
+    assert sweep.voltage.shape == (12, 200)
+    assert sweep.mode == "Auto" and sweep.t_max == pytest.approx(5 * 4700.0 * 22e-6)
+    for i in range(len(sweep)):
+        expected = sweep.V[i] * (1 - np.exp(-sweep.time / (sweep.R[i] * sweep.C[i])))
+        np.testing.assert_allclose(sweep.voltage[i], expected, rtol=1e-12, atol=1e-12)
+    # R varies slowest
+    assert sweep.R[:4].tolist() == [100.0] * 4
+
+def test_rc_sweep_chunks_give_the_same_result(monkeypatch):
+    whole = simulators.calculate_rc_sweep(5.0, 10.0, np.linspace(100, 5000, 50), points=100)
+    monkeypatch.setattr(simulators, "SWEEP_CHUNK", 300)
+    calls = []
+    chunked = simulators.calculate_rc_sweep(5.0, 10.0, np.linspace(100, 5000, 50), points=100,
+                                            progress=lambda done, total: calls.append(done))
+    np.testing.assert_array_equal(whole.voltage, chunked.voltage)
+    assert calls[-1] == 50 and len(calls) == 17
+
+def test_rc_transient_keeps_the_legacy_shape():
+    res = simulators.calculate_rc_transient(5.0, 10.0, [1000.0, 0.0], max_time_s=0.05)
+    assert res["mode"] == "Fixed" and len(res["time"]) == 200
+    first, shorted = res["curves"]
+    assert first["R"] == 1000.0 and first["tau"] == pytest.approx(0.01)
+    np.testing.assert_allclose(first["voltage"], 5.0 * (1 - np.exp(-res["time"] / 0.01)))
+    assert np.all(shorted["voltage"] == 5.0)
+
+def test_astable_timing_uses_the_datasheet_formulas():
+    data = simulators.calculate_555_astable(1000.0, 10000.0, 10.0)
+    assert data["t_high"] == pytest.approx(0.693 * 11000 * 10e-6)
+    assert data["t_low"] == pytest.approx(0.693 * 10000 * 10e-6)
+    assert data["freq"] == pytest.approx(1 / data["period"])
+    assert data["duty"] == pytest.approx(100 * 11 / 21)
+    assert data["duration"] == pytest.approx(5 * data["period"])
+
+def test_astable_edges_alternate_at_the_right_times():
+    data = simulators.calculate_555_astable(1000.0, 10000.0, 10.0)
+    times, levels = simulators.astable_edges(data)
+    assert len(times) == 11 # rise and fall for 5 cycles plus the rise at the end
+    expected = np.cumsum([0.0] + [data["t_high"], data["t_low"]] * 5)
+    np.testing.assert_allclose(times, expected)
+    assert levels.tolist() == [5.0, 0.0] * 5 + [5.0]
+
+def test_astable_samples_follow_the_square_wave():
+    data = simulators.calculate_555_astable(1000.0, 10000.0, 10.0)
+    time, voltage = simulators.sample_555_astable(data, points=1000)
+    # step vertices: between two vertices the level is constant
+    probe = np.linspace(0, data["duration"], 5001)
+    drawn = voltage[np.searchsorted(time, probe, side="right") - 1]
+    truth = np.where(np.mod(probe, data["period"]) < data["t_high"], 5.0, 0.0)
+    assert np.array_equal(drawn[1:-1], truth[1:-1])
+
+def test_astable_envelope_is_bounded_by_points():
+    data = simulators.calculate_555_astable(1000.0, 10000.0, 10.0, duration=1e4)
+    time, voltage = simulators.sample_555_astable(data, points=1000)
+    assert len(time) == len(voltage) == 1000
+    assert set(voltage.tolist()) <= {0.0, 5.0}
+    # every bucket is longer than a period, so each one shows both levels
+    assert voltage[0::2].min() == 5.0 and voltage[1::2].max() == 0.0
+
+def test_monostable_pulse_is_rc_ln3():
+    res = simulators.calculate_555_monostable(10000.0, 10.0)
+    tau = 10000.0 * 10e-6
+    assert res["pulse_width"] == pytest.approx(tau * math.log(3))
+    assert res["pulse_width_theoretical"] == pytest.approx(tau * math.log(3))
+    # the cap reaches 2/3 VCC right before the reset and is dumped after
+    end = res["pulses"][0, 1]
+    before = res["time"] <= end
+    assert res["cap_voltage"][before].max() == pytest.approx(5.0 * 2 / 3, rel=1e-9)
+    assert np.all(res["cap_voltage"][res["time"] > end] == 0.0)
+
+def test_monostable_adaptive_matches_exact():
+    triggers = [(0.05, 0.051), (0.08, 0.081), (0.3, 0.301), (0.55, 0.6)]
+    for retrigger in (False, True):
+        exact = simulators.calculate_555_monostable(10000.0, 10.0, duration=0.8, triggers=triggers,
+                                                    retrigger=retrigger)
+        adaptive = simulators.calculate_555_monostable(10000.0, 10.0, duration=0.8, triggers=triggers,
+                                                       retrigger=retrigger, method="adaptive")
+        assert exact["pulses"].shape == adaptive["pulses"].shape
+        # starts are breakpoints, ends come from the comparator event and carry
+        # the integrator's rtol
+        np.testing.assert_allclose(adaptive["pulses"][:, 0], exact["pulses"][:, 0], atol=1e-12)
+        widths = np.diff(exact["pulses"], axis=1)
+        np.testing.assert_allclose(np.diff(adaptive["pulses"], axis=1), widths, rtol=1e-4)
+
+def test_monostable_retrigger_extends_the_pulse():
+    tau = 10000.0 * 10e-6
+    triggers = [(0.05, 0.051), (0.1, 0.101)]
+    plain = simulators.calculate_555_monostable(10000.0, 10.0, duration=0.5, triggers=triggers)
+    again = simulators.calculate_555_monostable(10000.0, 10.0, duration=0.5, triggers=triggers,
+                                                retrigger=True)
+    np.testing.assert_allclose(plain["pulses"], [[0.05, 0.05 + tau * math.log(3)]])
+    np.testing.assert_allclose(again["pulses"], [[0.05, 0.1 + tau * math.log(3)]])
+
+def test_monostable_trigger_held_past_threshold_keeps_output_high():
+    res = simulators.calculate_555_monostable(1000.0, 10.0, duration=0.1, triggers=[(0.01, 0.05)])
+    np.testing.assert_allclose(res["pulses"], [[0.01, 0.05]])
+
+def test_ac_sweep_matches_the_transfer_function():
+    res = simulators.calculate_rc_ac_sweep(10.0, 1000.0, points=301)
+    tau = 0.01
+    assert res["f_c"] == pytest.approx(1 / (2 * math.pi * tau))
+    f = res["freq"]
+    assert f[0] == pytest.approx(res["f_c"] / 1000) and f[-1] == pytest.approx(res["f_c"] * 1000)
+    w = 2 * math.pi * f * tau
+    np.testing.assert_allclose(res["magnitude_db"], -10 * np.log10(1 + w ** 2), atol=1e-9)
+    np.testing.assert_allclose(res["phase_deg"], -np.degrees(np.arctan(w)), atol=1e-9)
+
+def test_corner_is_found_at_minus_3db():
+    res = simulators.calculate_rc_ac_sweep(10.0, 1000.0, points=301)
+    assert simulators.find_corner(res["freq"], res["magnitude_db"]) == pytest.approx(res["f_c"], rel=1e-3)
+    # a sweep that stays in the passband never crosses
+    flat = simulators.calculate_rc_ac_sweep(10.0, 1000.0, 0.1, 1.0, points=50)
+    assert simulators.find_corner(flat["freq"], flat["magnitude_db"]) is None
+
+def test_ac_sweep_rejects_bad_ranges():
+    with pytest.raises(ValueError):
+        simulators.calculate_rc_ac_sweep(0.0, 1000.0)
+    with pytest.raises(ValueError):
+        simulators.calculate_rc_ac_sweep(10.0, 1000.0, 100.0, 10.0)
@@ -0,0 +1,50 @@
+import statistics
+
+import numpy as np
+import pytest
+
+from statistics_engine import StatsEngine
+
+def _sample():
+    rng = np.random.default_rng(3)
+    return rng.gamma(2.0, 3.0, 5001) # skewed on purpose
+
+def _moments(x):
+    d = x - x.mean()
+    var = (d ** 2).mean()
+    return (d ** 3).mean() / var ** 1.5, (d ** 4).mean() / var ** 2 - 3
+
+def test_describe_matches_the_statistics_module():
+    x = _sample()
+    s = StatsEngine.describe(x)
+    assert s["count"] == x.size and s["nan"] == 0
+    assert s["min"] == x.min() and s["max"] == x.max()
+    assert s["mean"] == pytest.approx(statistics.mean(x.tolist()), rel=1e-12)
+    assert s["stdev"] == pytest.approx(statistics.stdev(x.tolist()), rel=1e-12)
+    assert s["median"] == pytest.approx(statistics.median(x.tolist()), rel=1e-12)
+    skew, kurt = _moments(x)
+    assert s["skew"] == pytest.approx(skew, rel=1e-9)
+    assert s["kurtosis"] == pytest.approx(kurt, rel=1e-9)
+
+def test_masked_and_non_finite_cells_are_missing():
+    x = np.array([1.0, np.nan, 3.0, np.inf, 100.0])
+    s = StatsEngine.describe(x, valid=[True, True, True, True, False])
+    assert s["count"] == 2 and s["nan"] == 3 and s["mean"] == 2.0
+    assert StatsEngine.describe([np.nan]) == {"count": 0, "nan": 1}
+
+def test_chunked_moments_equal_the_single_pass():
+    x = _sample()
+    whole = StatsEngine.describe(x)
+    parts = StatsEngine.describe_chunks([x[:7], x[7:2000], np.append(x[2000:], np.nan)])
+    for key in ("count", "min", "max"):
+        assert parts[key] == whole[key]
+    for key in ("mean", "stdev", "skew", "kurtosis"):
+        assert parts[key] == pytest.approx(whole[key], rel=1e-9)
+    assert parts["nan"] == 1 and "median" not in parts
+
+def test_generic_text_keeps_the_old_lines():
+    text = StatsEngine.calculate_generic([1.0, 2.0, 3.0, 4.0], "V")
+    assert text.splitlines()[:6] == ["Target: V", "Count: 4", "Min: 1.0000", "Max: 4.0000",
+                                     "Mean: 2.5000", "StdDev: 1.2910"]
+    assert StatsEngine.calculate_generic([], "V") == "Empty Data"
+    assert "no statistics" in StatsEngine.calculate_generic([1.0], "D", kind="date")
@@ -0,0 +1,54 @@
+import asyncio
+
+import numpy as np
+from textual.app import App
+
+import data_model
+import table_view
+
+def _table():
+    return data_model.ColumnarTable.from_rows(["Label", "A"], [["a", "1"], ["b", "2"]])
+
+def test_edits_wait_in_the_overlay_until_commit():
+    view = table_view.VirtualTable()
+    base = _table()
+    view.load(base)
+    view.set_cell(0, 1, "5")
+    view.add_row()
+    view.add_series("B")
+    view.add_expression("C", "A * 2")
+    assert list(view.iter_rows())[0] == ["a", "5", "0.0", ""]
+    assert base.columns[0].tolist() == [1, 2] and base.n_series == 1
+    table = view.commit()
+    assert table is base and view.dirty == {}
+    assert table.to_state()["rows"] == [["a", "5", "0.0", "10.0"],
+                                        ["b", "2", "0.0", "4.0"],
+                                        ["New", "0", "0.0", "0.0"]]
+    assert view.is_computed(3) and not view.is_computed(2)
+
+class _App(App):
+    def compose(self):
+        yield table_view.VirtualTable()
+
+def test_render_reads_only_the_visible_cells():
+    n = 200_000
+    table = data_model.ColumnarTable(["Label", "A"], np.array([f"r{i}" for i in range(n)], dtype=object),
+                                     [np.arange(n, dtype=np.float64)])
+
+    async def run():
+        app = _App()
+        async with app.run_test(size=(80, 24)) as pilot:
+            view = app.query_one(table_view.VirtualTable)
+            view.load(table)
+            await pilot.pause() # virtual size is applied on the next layout
+            view.scroll_to(y=150_000, animate=False, immediate=True)
+            await pilot.pause()
+            calls = []
+            read = table.cell_text
+            table.cell_text = lambda r, c: calls.append((r, c)) or read(r, c)
+            line = view.render_line(1).text
+        return line, calls
+
+    line, calls = asyncio.run(run())
+    assert line.split() == ["r150000", "150000.0"]
+    assert calls == [(150_000, 0), (150_000, 1)]
@@ -0,0 +1,86 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+import data_model
+import workspace_manager
+
+@pytest.fixture(autouse=True)
+def in_tmp(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path) # the workspace file is relative
+
+def _table():
+    rows = [["a", "1", "0.5", "red", "2024-01-02"],
+            ["é b", "2", "", "blue", "2024-01-03"],
+            ["", "3", "1.5", "red", ""]]
+    table = data_model.ColumnarTable.from_rows(["Label", "N", "F", "Color", "Day"], rows)
+    table.add_formula("G", "N * 2")
+    return table
+
+@pytest.mark.parametrize("values", [np.array([0.5, -1e300, np.nan]), np.arange(5, dtype=np.int64),
+                                    np.array([True, False, True]),
+                                    np.array(["a", "", "é,b", "c d"], dtype=object),
+                                    np.array([], dtype=object)])
+def test_blocks_decode_to_what_was_encoded(values):
+    data, spec = workspace_manager._encode(values)
+    out = workspace_manager._decode(data, spec)
+    if values.dtype == object:
+        assert list(out) == values.tolist()
+    else:
+        assert out.dtype == values.dtype
+        np.testing.assert_array_equal(out, values)
+
+def test_lazy_table_loads_the_saved_table():
+    table = _table()
+    assert workspace_manager.save_workspace({"rc_res": "1000", "data_view": table})
+    state = workspace_manager.load_workspace()
+    assert state["rc_res"] == "1000"
+    lazy = state["data_view"]
+    assert isinstance(lazy, workspace_manager.LazyTable)
+    assert len(lazy) == 3 and lazy.names == table.names
+    loaded = lazy.load()
+    assert loaded.to_state() == table.to_state()
+    assert loaded.kinds == table.kinds and loaded.formulas == {4: "N * 2"}
+    for a, b, va, vb in zip(loaded.columns, table.columns, loaded.valid, table.valid):
+        assert a.dtype == b.dtype
+        np.testing.assert_array_equal(a, b)
+        np.testing.assert_array_equal(va, vb)
+
+def test_unopened_lazy_table_is_saved_again_as_it_is():
+    workspace_manager.save_workspace({"data_view": _table()})
+    lazy = workspace_manager.load_workspace()["data_view"]
+    assert workspace_manager.save_workspace({"active_tab": "x", "data_view": lazy})
+    again = workspace_manager.load_workspace()
+    assert again["active_tab"] == "x"
+    assert again["data_view"].load().to_state() == _table().to_state()
+    assert lazy.load().to_state() == _table().to_state() # points at the new file
+
+def test_only_edited_columns_are_compressed_again(monkeypatch):
+    table = _table()
+    workspace_manager.save_workspace({"data_view": table})
+    encoded = []
+    encode = workspace_manager._encode
+    monkeypatch.setattr(workspace_manager, "_encode", lambda v: encoded.append(v) or encode(v))
+    workspace_manager.save_workspace({"data_view": table})
+    assert encoded == []
+    table.set_cell(0, 2, "7")
+    workspace_manager.save_workspace({"data_view": table})
+    assert len(encoded) == 2 # values and validity of that one column
+    assert workspace_manager.load_workspace()["data_view"].load().cell_text(0, 2) == "7.0"
+
+def test_failed_save_keeps_the_previous_file(monkeypatch):
+    workspace_manager.save_workspace({"rc_res": "1", "data_view": _table()})
+    def broken(src, dst):
+        raise OSError("disk full")
+    with monkeypatch.context() as m:
+        m.setattr(os, "replace", broken)
+        assert not workspace_manager.save_workspace({"rc_res": "2", "data_view": _table()})
+    assert workspace_manager.load_workspace()["rc_res"] == "1"
+
+def test_legacy_json_workspace_is_still_read():
+    with open(workspace_manager.LEGACY_FILE, "w", encoding="utf-8") as f:
+        json.dump({"rc_res": "5", "data_view": {"columns": ["Label", "A"], "rows": [["a", "1"]]}}, f)
+    state = workspace_manager.load_workspace()
+    assert state["data_view"]["rows"] == [["a", "1"]]
@@ -3,9 +3,12 @@ from textual.binding import Binding
 from textual.containers import Container, Horizontal, VerticalScroll
 from textual.screen import ModalScreen, Screen
 from textual.widgets import (Button, ContentSwitcher, DataTable, Footer,
-                             Header, Input, Label, RadioButton, RadioSet,
-                             RichLog, Select, Static)
+                             Header, Input, Label, ProgressBar, RadioButton,
+                             RadioSet, RichLog, Select, Static, TextArea)
 from textual_plotext import PlotextPlot
+
+import mna_solver
+import table_view
 title_art = r"""  ________              ____________________ ___.___ 
  /  _____/___________ _/ ____\__    ___/    |   \   |
 /   \  __\_  __ \__  \\   __\  |    |  |    |   /   |
@@ -142,9 +145,31 @@ class TransposePromptScreen(ModalScreen): # ask for transposing, known to happen
         if event.button.id == "btn_yes": self.dismiss(True)
         else: self.dismiss(False)
 
+class MergePromptScreen(ModalScreen): # several files at once, stack them or line them up by label
+    def __init__(self, count: int):
+        super().__init__()
+        self.count = count
+
+    def compose(self) -> ComposeResult:
+        with Container(id="settings_dialog"):
+            yield Label("IMPORT OPTIONS", classes="group-title")
+            yield Label(f"{self.count} files selected. How should they be combined?")
+            yield Label("Concat stacks the rows (same columns), join matches rows by label.")
+
+            with Horizontal(classes="modal-btn-row"):
+                yield Button("CANCEL", id="btn_cancel", classes="btn-secondary")
+                yield Button("JOIN (by label)", id="btn_join", classes="btn-secondary")
+                yield Button("CONCAT (rows)", id="btn_concat", classes="btn-primary")
+
+    def on_button_pressed(self, event: Button.Pressed):
+        if event.button.id == "btn_concat": self.dismiss("concat")
+        elif event.button.id == "btn_join": self.dismiss("join")
+        else: self.dismiss(None)
+
 class DataEditorScreen(Screen):
-    BINDINGS = [("escape", "app.pop_screen", "Close")]
-    def __init__(self, data_state: dict): super().__init__(); self.data_state = data_state
+    BINDINGS = [("escape", "app.close_editor", "Close"),
+                ("c", "app.cancel_import", "Cancel import")]
+    def __init__(self, data_state): super().__init__(); self.data_state = data_state
 
     def compose(self) -> ComposeResult:
         yield Header()
@@ -152,21 +177,21 @@ class DataEditorScreen(Screen):
             with Horizontal(classes="editor-toolbar"):
                 yield Button("Add row", id="btn_edit_add_row", classes="btn-secondary")
                 yield Button("Add series", id="btn_edit_add_col", classes="btn-secondary")
+                yield Button("Add expression", id="btn_edit_add_expr", classes="btn-secondary")
                 yield Button("Import CSV", id="btn_edit_import", classes="btn-secondary")
+                yield Button("Import many", id="btn_edit_import_many", classes="btn-secondary")
                 yield Button("Export CSV", id="btn_edit_export", classes="btn-secondary")
                 yield Button("Clear", id="btn_edit_clear", classes="btn-secondary")
                 yield Button("Save & Return", id="btn_edit_done", classes="btn-primary")
-            yield DataTable(id="editor_table")
+            yield ProgressBar(total=100, show_eta=False, id="import_progress")
+            yield table_view.VirtualTable(id="editor_table")
         yield Footer()
 
     def on_mount(self):
-        table = self.query_one(DataTable)
-        table.cursor_type = "cell"
-        table.clear(columns=True)
-        for col in self.data_state.get("columns", ["Label", "Value"]):
-            table.add_column(col, key=f"col_{col}")
-        for i, row in enumerate(self.data_state.get("rows", [])):
-            table.add_row(*row, key=f"row_{i}")
+        # only the visible window is ever drawn, size of the data does not matter
+        table = self.query_one(table_view.VirtualTable)
+        table.load(self.data_state)
+        table.focus()
 
 class ExportModeScreen(ModalScreen): # exporting for pie chart
     BINDINGS = [Binding("escape", "cancel", "Cancel")] # keybinds as is
@@ -265,7 +290,8 @@ class ElectronicsView(Container):
                 yield Label("ACTIVE CIRCUIT", classes="group-title")
                 circuits = [("RC Filter / circuit", "circuit_rc"),
                             ("555 Timer (astable)", "circuit_555"),
-                            ("555 Timer (monostable)", "circuit_555_mono")]
+                            ("555 Timer (monostable)", "circuit_555_mono"),
+                            ("Netlist (MNA)", "circuit_netlist")]
                 yield Select(circuits, value="circuit_rc",
                              id="circuit_select")
 
@@ -275,13 +301,20 @@ class ElectronicsView(Container):
                         yield Label("SOURCE CONFIG", classes="group-title")
                         yield Label("Waveform type")
                         waveforms = [("Step (DC)", "step"),
-                                     ("Square (AC)", "square")]
+                                     ("Square (AC)", "square"),
+                                     ("AC sweep (Bode)", "ac")]
                         yield Select(waveforms, value="step",
                                      id="rc_mode")
                         yield Label("Voltage (V)")
                         yield Input(value="5.0", id="rc_voltage", type="number")
                         yield Label("Freq (Hz) [AC Mode]")
                         yield Input(value="1000", id="rc_freq", type="number")
+                        yield Label("Sweep start (Hz) [Bode, 0 = auto]")
+                        yield Input(value="0", id="ac_fstart", type="number")
+                        yield Label("Sweep stop (Hz) [Bode, 0 = auto]")
+                        yield Input(value="0", id="ac_fstop", type="number")
+                        yield Label("Sweep points")
+                        yield Input(value="10000", id="ac_points", type="integer")
 
                     with Container(classes="control-group"):
                         yield Label("COMPONENTS", classes="group-title")
@@ -307,6 +340,36 @@ class ElectronicsView(Container):
                         yield Input(value="10000", id="mono_r", type="number")
                         yield Label("C (µF)")
                         yield Input(value="100", id="mono_c", type="number")
+                        yield Label("Trigger times (s) [blank = auto]")
+                        yield Input(value="", id="mono_trig", type="text",
+                                    placeholder="e.g. 0.5, 2, 3.2")
+                        yield Label("Trigger width (s) [0 = auto]")
+                        yield Input(value="0", id="mono_trig_w", type="number")
+                        yield Label("Retrigger during pulse")
+                        retrig = [("No (standard 555)", "no"), ("Yes", "yes")]
+                        yield Select(retrig, value="no", id="mono_retrig")
+
+                with Container(id="controls_netlist"):
+                    with Container(classes="control-group"):
+                        yield Label("NETLIST", classes="group-title")
+                        yield TextArea(mna_solver.rc_ladder_netlist(3, 1e3, 100),
+                                       id="net_text")
+                        yield Label("Probe nodes [blank = .probe]")
+                        yield Input(value="", id="net_probe", type="text",
+                                    placeholder="e.g. n1, n3")
+                        yield Button("LOAD NETLIST", id="btn_net_load", classes="btn-secondary")
+
+            with Container(classes="control-group"):
+                yield Label("MONTE CARLO", classes="group-title")
+                yield Label("R tolerance (%)")
+                yield Input(value="5", id="mc_tol_r", type="number")
+                yield Label("C tolerance (%)")
+                yield Input(value="10", id="mc_tol_c", type="number")
+                yield Label("Runs")
+                yield Input(value="10000", id="mc_runs", type="integer")
+                yield Label("Spec window (±%)")
+                yield Input(value="10", id="mc_spec", type="number")
+                yield Button("RUN MONTE CARLO", classes="btn-secondary", id="btn_mc_run")
 
             with Container(classes="control-group"):
                 yield Label("SIM STATS", classes="group-title")
@@ -316,7 +379,12 @@ class ElectronicsView(Container):
                 yield Label("SIMULATION", classes="group-title")
                 yield Label("Duration limit (s)")
                 yield Input(value="0", id="sim_duration", type="number")
+                yield Label("Solver [square / monostable]")
+                solvers = [("Exact (analytic)", "exact"),
+                           ("Adaptive (Rosenbrock 2/3)", "adaptive")]
+                yield Select(solvers, value="exact", id="sim_solver")
                 yield Button("RUN SIMULATION", classes="btn-primary", id="btn_sim_run")
+                yield ProgressBar(total=1, show_eta=False, id="sim_progress")
                 yield Button("EXPORT DATA", classes="btn-secondary", id="btn_export")
 
         with Container(classes="display-area"):
@@ -328,6 +396,15 @@ class ElectronicsView(Container):
 
 
 class GeneralPlotterView(Container): # plotter view, for data. 
+    can_focus = True # click the plot, then zoom/pan with the keys below
+    BINDINGS = [
+        Binding("plus,equals_sign", "app.zoom_data(0.5)", "Zoom in"),
+        Binding("minus", "app.zoom_data(2.0)", "Zoom out"),
+        Binding("left_square_bracket", "app.pan_data(-0.25)", "Pan left"),
+        Binding("right_square_bracket", "app.pan_data(0.25)", "Pan right"),
+        Binding("0", "app.zoom_data", "Reset zoom"),
+    ]
+
     def compose(self) -> ComposeResult:
         with VerticalScroll(classes="sidebar"):
             yield Label("DATA PLOTTER", classes="sidebar-header")
@@ -337,9 +414,14 @@ class GeneralPlotterView(Container): # plotter view, for data.
                 yield Label("Chart Type")
                 chart_types = [("Line", "line"), ("Bar", "bar"),
                                ("Scatter", "scatter"), ("Area", "area"),
-                               ("Pie", "pie")]
+                               ("Pie", "pie"), ("Histogram", "histogram"),
+                               ("Density (KDE)", "kde")]
                 yield Select(chart_types, value="line",
                              id="gen_type")
+                yield Label("Group by label (bar, pie)")
+                aggregates = [("Off, one per row", "none"), ("Sum", "sum"), ("Mean", "mean"),
+                              ("Count", "count"), ("Min", "min"), ("Max", "max")]
+                yield Select(aggregates, value="none", id="gen_agg")
 
             with Container(classes="control-group"):
                 yield Label("DATA SOURCE", classes="group-title")
@@ -1,20 +1,342 @@
+import contextlib
 import json
 import os
+import queue
+import struct
+import threading
+import time
+import zlib
 
-WORKSPACE_FILE = "graftui_workspace.json"
+import numpy as np
+
+import csv_cache
+import csv_importer
+import data_model
+import merge
+
+# workspace file: "GTW1" + manifest length + json manifest + compressed blocks.
+# the manifest holds the ui state and where every column block sits, so the
+# spreadsheet itself is only read when the data view needs it (LazyTable).
+# saves go to a temp file that replaces the old one, a crash mid-write keeps
+# the previous workspace. unchanged columns are not compressed again.
+WORKSPACE_FILE = "graftui_workspace.gtw"
+LEGACY_FILE = "graftui_workspace.json" # old format, still read
+MAGIC = b"GTW1"
+_HEAD = struct.Struct("<4sI")
+
+_blocks = {} # (table uid, block name, version) -> compressed bytes, from the last save
+_saved = frozenset() # keys of _blocks, swapped in whole so the ui thread can read it any time
+
+# autosave: changes go to an append-only journal (json lines) as they happen,
+# every so often the journal is folded into a full snapshot and starts over.
+# both are written by one background thread, so the ui never waits on the disk.
+JOURNAL_FILE = "graftui_workspace.journal"
+FLUSH_SECONDS = 2      # typed inputs are batched this long before they hit the journal
+COMPACT_SECONDS = 60   # snapshot at most this long after the first journal entry
+COMPACT_ENTRIES = 50   # ...or once the journal has this many entries
+
+def _read_manifest(path: str):
+    with open(path, "rb") as f:
+        magic, length = _HEAD.unpack(f.read(_HEAD.size))
+        if magic != MAGIC:
+            raise ValueError("not a workspace file")
+        return json.loads(f.read(length).decode("utf-8")), _HEAD.size + length
+
+class LazyTable:
+    """Spreadsheet of a saved workspace that has not been read yet."""
+
+    def __init__(self, path: str, meta: dict, data_start: int):
+        self.path = path
+        self.meta = meta
+        self.data_start = data_start
+        self.lock = threading.Lock() # an autosave can move the blocks while we read them
+
+    def __len__(self):
+        return self.meta["rows"]
+
+    @property
+    def names(self) -> list:
+        return self.meta["names"]
+
+    def raw_blocks(self) -> dict:
+        """Compressed bytes of every block, for saving them again untouched."""
+        out = {}
+        with open(self.path, "rb") as f:
+            for name, spec in self.meta["blocks"].items():
+                f.seek(self.data_start + spec["offset"])
+                out[name] = f.read(spec["length"])
+        return out
+
+    def load(self):
+        with self.lock:
+            raw = self.raw_blocks()
+        blocks = {name: _decode(data, self.meta["blocks"][name]) for name, data in raw.items()}
+        n = self.meta["columns"]
+        return data_model.ColumnarTable(
+            self.meta["names"], blocks["labels"],
+            [blocks[f"c{j}"] for j in range(n)], [blocks[f"v{j}"] for j in range(n)],
+            self.meta["kinds"], self.meta["categories"],
+            {int(j): expr for j, expr in self.meta.get("formulas", {}).items()})
+
+def _encode(values) -> tuple:
+    if values.dtype == object: # labels, nul separated text
+        raw = "\0".join(str(v) for v in values).encode("utf-8")
+        spec = {"dtype": "str", "count": len(values)}
+    else:
+        values = np.ascontiguousarray(values)
+        raw = values.tobytes()
+        spec = {"dtype": values.dtype.str, "count": len(values)}
+    return zlib.compress(raw, 1), spec # level 1, saving on quit must stay quick
+
+def _decode(data: bytes, spec: dict):
+    raw = zlib.decompress(data)
+    if spec["dtype"] == "str":
+        return raw.decode("utf-8").split("\0") if spec["count"] else []
+    return np.frombuffer(raw, dtype=np.dtype(spec["dtype"])).copy()
+
+def _table_blocks(table) -> tuple:
+    """(meta, {name: compressed bytes}) reusing the last save for unchanged blocks."""
+    global _blocks, _saved
+    parts = [("labels", table.labels, table.label_version)]
+    for j in range(table.n_series):
+        parts.append((f"c{j}", table.columns[j], table.versions[j]))
+        parts.append((f"v{j}", table.valid[j], table.versions[j]))
+    blocks, specs, keep = {}, {}, {}
+    for name, values, version in parts:
+        key = (table.uid, name, version, len(values))
+        if key not in _blocks:
+            _blocks[key] = _encode(values)
+        blocks[name], specs[name] = _blocks[key]
+        keep[key] = _blocks[key]
+    _blocks = keep # only the current table stays around
+    _saved = frozenset(keep)
+    meta = {"names": list(table.names), "rows": len(table), "columns": table.n_series,
+            "kinds": list(table.kinds), "categories": list(table.categories),
+            "formulas": {str(j): expr for j, expr in table.formulas.items()}, "blocks": specs}
+    return meta, blocks
+
+def snapshot(table):
+    """
+    table.snapshot() to hand to the writer thread. set_cell writes in place, so
+    every array the last save does not already hold compressed is copied, the
+    others are never read again and stay shared.
+    """
+    snap, saved = table.snapshot(), _saved
+    if (table.uid, "labels", table.label_version, len(table.labels)) not in saved:
+        snap.labels = table.labels.copy()
+    for j in range(table.n_series):
+        version, n = table.versions[j], len(table.columns[j])
+        if (table.uid, f"c{j}", version, n) not in saved or (table.uid, f"v{j}", version, n) not in saved:
+            snap.columns[j] = table.columns[j].copy()
+            snap.valid[j] = table.valid[j].copy()
+    return snap
 
 def load_workspace():
-    if not os.path.exists(WORKSPACE_FILE):
+    """State dict, data_view is a LazyTable (or the old rows dict from a json workspace)."""
+    if os.path.exists(WORKSPACE_FILE):
+        try:
+            manifest, data_start = _read_manifest(WORKSPACE_FILE)
+            state = manifest.get("state", {})
+            if manifest.get("table"):
+                state["data_view"] = LazyTable(WORKSPACE_FILE, manifest["table"], data_start)
+            return state
+        except (ValueError, KeyError, struct.error, IOError):
+            pass
+    if not os.path.exists(LEGACY_FILE):
         return None
     try:
-        with open(WORKSPACE_FILE, "r", encoding="utf-8") as f:
+        with open(LEGACY_FILE, "r", encoding="utf-8") as f:
             return json.load(f)
     except (json.JSONDecodeError, IOError):
         return None
 
-def save_workspace(state):
+def _write(state: dict, table):
+    if isinstance(table, LazyTable): # never opened this session, copy the blocks as they are
+        meta, blocks = dict(table.meta), table.raw_blocks()
+    elif table is not None:
+        meta, blocks = _table_blocks(table)
+    else:
+        meta, blocks = None, {}
+
+    offset = 0
+    if meta:
+        meta["blocks"] = {name: dict(spec) for name, spec in meta["blocks"].items()}
+        for name, data in blocks.items():
+            meta["blocks"][name].update(offset=offset, length=len(data))
+            offset += len(data)
+    manifest = json.dumps({"state": state, "table": meta}).encode("utf-8")
+
+    tmp = WORKSPACE_FILE + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEAD.pack(MAGIC, len(manifest)))
+        f.write(manifest)
+        for data in blocks.values():
+            f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, WORKSPACE_FILE)
+    if isinstance(table, LazyTable): # still unread, point it at the new file
+        table.path, table.meta = WORKSPACE_FILE, meta
+        table.data_start = _HEAD.size + len(manifest)
+
+def save_workspace(state) -> bool:
+    state = dict(state)
+    table = state.pop("data_view", None)
+    if isinstance(table, dict):
+        table = data_model.ColumnarTable.from_state(table)
     try:
-        with open(WORKSPACE_FILE, "w", encoding="utf-8") as f:
-            json.dump(state, f, indent=4)
-    except IOError as e:
+        with table.lock if isinstance(table, LazyTable) else contextlib.nullcontext():
+            _write(state, table)
+        return True
+    except (IOError, OSError) as e:
         print(f"Error saving workspace: {e}")
+        return False
+
+# journal
+def read_journal(path: str = JOURNAL_FILE) -> list:
+    """Entries appended since the last snapshot. A torn last line (crash mid-write) is dropped."""
+    entries = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+    except (IOError, OSError):
+        pass
+    return entries
+
+def replay(table, entry: dict):
+    """Applies a table entry of the journal, returns the table (a new one for import/clear)."""
+    op = entry.get("op")
+    if op == "clear":
+        return data_model.ColumnarTable(["Label"], [], [])
+    if op == "import":
+        path, digest, transposed = entry["path"], entry["digest"], entry.get("transposed", False)
+        cached = csv_cache.load(path, digest) if os.path.exists(path) else None
+        if cached and cached[1] == transposed:
+            return cached[0]
+        if os.path.exists(path) and csv_cache.quick_digest(path) == digest:
+            return csv_importer.stream_csv(path).to_table(transposed)
+        raise IOError(f"{path} changed or is gone, import not restored")
+    if op == "import_many":
+        paths = entry["paths"]
+        tables = [replay(None, {"op": "import", "path": p, "digest": d}) for p, d in zip(paths, entry["digests"])]
+        return merge.merge(tables, entry["how"], [merge.source_name(p) for p in paths])
+    if op == "cells":
+        # absolute sizes and cell texts, applying an entry twice changes nothing
+        if entry["rows"] > len(table):
+            table.add_row(count=entry["rows"] - len(table))
+        formulas = entry.get("formulas", {})
+        for name in entry["names"][len(table.names):]:
+            if name in formulas:
+                table.add_formula(name, formulas[name])
+            else:
+                table.add_series(name)
+        for row, col, text in entry["edits"]:
+            table.set_cell(row, col, text)
+        table.refresh_formulas()
+    return table
+
+def replay_all(table, entries: list) -> tuple:
+    """
+    Applies the table entries of a journal in order, returns (table, errors,
+    number of drafts still open).
+    Editor drafts only count once their "commit" follows and a "discard" drops
+    them, drafts still open at the end (a crash with the editor up) are kept.
+    """
+    errors, drafts = [], []
+    def apply(entry):
+        nonlocal table
+        try:
+            table = replay(table, entry)
+        except Exception as e:
+            errors.append(str(e))
+    for entry in entries:
+        op = entry.get("op")
+        if op == "inputs":
+            continue
+        if entry.get("draft"):
+            drafts.append(entry)
+        elif op in ("commit", "discard"):
+            for draft in drafts if op == "commit" else ():
+                apply(draft)
+            drafts = []
+        else:
+            apply(entry)
+    for draft in drafts:
+        apply(draft)
+    return table, errors, len(drafts)
+
+class Journal:
+    """Append-only change log plus snapshots, all disk work on one background thread."""
+
+    def __init__(self, path: str = JOURNAL_FILE):
+        self.path = path
+        self.pending = len(read_journal(path)) # entries since the last snapshot, left from a crash too
+        self.first_at = time.monotonic() if self.pending else None
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="graftui-autosave", daemon=True)
+        self._thread.start()
+
+    def append(self, entry: dict):
+        if self.first_at is None:
+            self.first_at = time.monotonic()
+        self.pending += 1
+        self._queue.put(("append", entry))
+
+    def due(self) -> bool:
+        """Time to fold the journal into a snapshot?"""
+        if not self.pending:
+            return False
+        return self.pending >= COMPACT_ENTRIES or time.monotonic() - self.first_at >= COMPACT_SECONDS
+
+    def compact(self, state: dict):
+        """
+        Snapshot of state, then an empty journal. Everything appended before this
+        call is part of state, everything after it stays in the journal.
+        """
+        self.pending, self.first_at = 0, None
+        self._queue.put(("snapshot", state))
+
+    def close(self, state: dict = None):
+        """Final snapshot (if given) and waits until everything is on disk."""
+        if state is not None:
+            self.compact(state)
+        self._queue.put(("stop", None))
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            op, payload = self._queue.get()
+            if op == "stop":
+                return
+            try:
+                self._handle(op, payload)
+            except Exception as e: # a dead thread would drop every later change, keep going
+                print(f"Error in autosave ({op}): {e}")
+
+    def _handle(self, op: str, payload):
+        if op == "snapshot":
+            if save_workspace(payload):
+                with contextlib.suppress(OSError):
+                    os.remove(self.path)
+            return
+        lines = [payload]
+        with contextlib.suppress(queue.Empty): # batch whatever queued up meanwhile
+            while self._queue.queue and self._queue.queue[0][0] == "append":
+                lines.append(self._queue.get_nowait()[1])
+        text = []
+        for entry in lines: # an odd value costs its own entry, not the batch
+            try:
+                text.append(json.dumps(entry) + "\n")
+            except (TypeError, ValueError) as e:
+                print(f"Error writing journal: {e}")
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("".join(text))
+                f.flush()
+                os.fsync(f.fileno())
+        except (IOError, OSError) as e:
+            print(f"Error writing journal: {e}")